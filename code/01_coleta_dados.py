@@ -1,85 +1,124 @@
 """
 Script de coleta de dados de repositórios do GitHub
 Laboratório 04 - Visualização de dados utilizando ferramenta de BI
+
+Por padrão gera um dataset simulado; com --github coleta os dados reais pela API
+(coleta_github.py), no mesmo esquema. Para testar sem rede: servidor_mock_github.py
+Com --incremental, o dataset existente em --output é atualizado: só os repositórios novos ou
+com updated_at mais recente são coletados (ou regerados, no modo simulado) e mesclados
+(incremental.py)
+Com --snapshot-dir, cada coleta também é acrescentada ao histórico particionado por data e
+linguagem (historico.py), que guarda a evolução de stars/commits entre coletas
+Importar este módulo não gera nada nem carrega numpy/pandas (adiado.py); o trabalho fica em main()
 """
 
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import random
 import json
+import os
+import argparse
+
+from adiado import ModuloAdiado
+from argumentos import inteiro_positivo
+from armazenamento import caminho_colunar, carregar_tabela, salvar_em_blocos, salvar_tabela
+from cache_http import LIMITE_PADRAO_MB as LIMITE_CACHE_HTTP_MB, PASTA_PADRAO as PASTA_CACHE_HTTP, TTL_PADRAO, CacheHTTP
+from caminhos import DATASET_REPOSITORIOS
+from coleta_github import CONCORRENCIA_PADRAO, CONSULTA_PADRAO, URL_API, coletar_repositorios, metricas_engajamento
+from geracao_paralela import gerar_em_shards
+from historico import acrescentar_coleta
+from incremental import FORMATO_INSTANTE, mesclar_atualizacoes, recalcular_derivadas
+
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+
+# Linguagens de programação mais populares
+LINGUAGENS = ['Python', 'JavaScript', 'Java', 'TypeScript', 'Go', 'Rust', 'C++', 'Ruby']
+LINGUAGENS_PESOS = [0.25, 0.20, 0.15, 0.15, 0.10, 0.05, 0.05, 0.05]
 
-# Configuração para reprodutibilidade
-random.seed(42)
-np.random.seed(42)
+# Algumas linguagens têm repositórios mais ativos
+MULTIPLICADOR_LINGUAGEM = {
+    'Python': 1.5, 'JavaScript': 1.4, 'TypeScript': 1.3,
+    'Java': 1.0, 'Go': 1.2, 'Rust': 1.1, 'C++': 0.9, 'Ruby': 0.8
+}
 
-def gerar_dataset_repositorios(n_repos=500):
+# Licenças comuns
+LICENCAS = ['MIT', 'Apache-2.0', 'GPL-3.0', 'BSD-3-Clause', 'None']
+LICENCAS_PESOS = [0.45, 0.25, 0.15, 0.10, 0.05]
+
+# Categorias de projeto
+CATEGORIAS = ['Web Development', 'Data Science', 'DevOps', 'Mobile', 'Machine Learning',
+              'System Tools', 'Libraries', 'Games']
+
+
+def gerar_dataset_repositorios(n_repos=500, vetorizado=False, seed=42, data_referencia=None):
     """
     Gera um dataset simulado de repositórios do GitHub para análise.
     Em um cenário real, estes dados seriam coletados via GitHub API.
+
+    Com vetorizado=True usa o motor NumPy (gerar_dataset_vetorizado), que
+    sorteia cada coluna de uma vez e é indicado para milhões de linhas.
+    O seed fixa o resultado nos dois modos: o laço original sorteia com um
+    random.Random e um np.random.RandomState próprios (mesma sequência que
+    random.seed(seed)/np.random.seed(seed)), sem ler nem alterar as sementes globais.
+    data_referencia: data considerada "hoje" (padrão: agora)
     """
+    if vetorizado:
+        return gerar_dataset_vetorizado(n_repos, seed=seed, data_referencia=data_referencia)
+    sorteio = random.Random(seed)
+    rs = np.random.RandomState(seed)
+    agora = datetime.now() if data_referencia is None else datetime.combine(data_referencia, datetime.min.time())
     
-    # Linguagens de programação mais populares
-    linguagens = ['Python', 'JavaScript', 'Java', 'TypeScript', 'Go', 'Rust', 'C++', 'Ruby']
-    linguagens_pesos = [0.25, 0.20, 0.15, 0.15, 0.10, 0.05, 0.05, 0.05]
-    
-    # Licenças comuns
-    licencas = ['MIT', 'Apache-2.0', 'GPL-3.0', 'BSD-3-Clause', 'None']
-    licencas_pesos = [0.45, 0.25, 0.15, 0.10, 0.05]
-    
-    # Categorias de projeto
-    categorias = ['Web Development', 'Data Science', 'DevOps', 'Mobile', 'Machine Learning', 
-                  'System Tools', 'Libraries', 'Games']
+    linguagens = LINGUAGENS
+    linguagens_pesos = LINGUAGENS_PESOS
+    licencas = LICENCAS
+    licencas_pesos = LICENCAS_PESOS
+    categorias = CATEGORIAS
     
     dados = []
     
     for i in range(n_repos):
         # Seleciona linguagem
-        linguagem = random.choices(linguagens, weights=linguagens_pesos)[0]
+        linguagem = sorteio.choices(linguagens, weights=linguagens_pesos)[0]
         
         # Define métricas baseadas na linguagem (algumas linguagens têm repos mais ativos)
-        multiplicador_linguagem = {
-            'Python': 1.5, 'JavaScript': 1.4, 'TypeScript': 1.3,
-            'Java': 1.0, 'Go': 1.2, 'Rust': 1.1, 'C++': 0.9, 'Ruby': 0.8
-        }
-        mult = multiplicador_linguagem.get(linguagem, 1.0)
+        mult = MULTIPLICADOR_LINGUAGEM.get(linguagem, 1.0)
         
         # Gera métricas do repositório
-        stars = int(np.random.lognormal(4, 2) * mult)
-        forks = int(stars * np.random.uniform(0.05, 0.30))
-        issues_abertas = int(np.random.poisson(max(10, stars * 0.02)))
-        issues_fechadas = int(issues_abertas * np.random.uniform(2, 8))
+        stars = int(rs.lognormal(4, 2) * mult)
+        forks = int(stars * rs.uniform(0.05, 0.30))
+        issues_abertas = int(rs.poisson(max(10, stars * 0.02)))
+        issues_fechadas = int(issues_abertas * rs.uniform(2, 8))
         
-        pull_requests = int(np.random.poisson(max(5, stars * 0.015)))
-        contributors = int(np.random.lognormal(1.5, 1) * mult)
-        commits = int(np.random.lognormal(5, 1.5) * mult)
+        pull_requests = int(rs.poisson(max(5, stars * 0.015)))
+        contributors = int(rs.lognormal(1.5, 1) * mult)
+        commits = int(rs.lognormal(5, 1.5) * mult)
         
         # Data de criação (últimos 5 anos)
-        dias_atras = random.randint(30, 1825)  # 30 dias a 5 anos
-        created_at = datetime.now() - timedelta(days=dias_atras)
+        dias_atras = sorteio.randint(30, 1825)  # 30 dias a 5 anos
+        created_at = agora - timedelta(days=dias_atras)
         
         # Última atualização (entre criação e agora)
-        dias_desde_update = random.randint(0, min(dias_atras, 365))
-        updated_at = datetime.now() - timedelta(days=dias_desde_update)
+        dias_desde_update = sorteio.randint(0, min(dias_atras, 365))
+        updated_at = agora - timedelta(days=dias_desde_update)
         
         # Tamanho do repositório (KB)
-        tamanho = int(np.random.lognormal(8, 2))
+        tamanho = int(rs.lognormal(8, 2))
         
         # Tem documentação?
-        tem_wiki = random.random() < 0.3
-        tem_readme = random.random() < 0.9
+        tem_wiki = sorteio.random() < 0.3
+        tem_readme = sorteio.random() < 0.9
         
         # Licença
-        licenca = random.choices(licencas, weights=licencas_pesos)[0]
+        licenca = sorteio.choices(licencas, weights=licencas_pesos)[0]
         
         # Categoria
-        categoria = random.choice(categorias)
+        categoria = sorteio.choice(categorias)
         
         # Nome do repositório
         nome = f"projeto-{linguagem.lower()}-{i+1:03d}"
         
         # Calcula idade em dias
-        idade_dias = (datetime.now() - created_at).days
+        idade_dias = (agora - created_at).days
         
         # Calcula taxa de atividade (commits por mês)
         meses_existencia = max(idade_dias / 30, 1)
@@ -116,22 +155,293 @@ def gerar_dataset_repositorios(n_repos=500):
     return pd.DataFrame(dados)
 
 
-def main():
-    """Função principal para coleta de dados"""
+def gerar_dataset_vetorizado(n_repos=500, seed=42, rng=None, inicio=0, data_referencia=None):
+    """
+    Versão vetorizada de gerar_dataset_repositorios.
+
+    Segue as mesmas distribuições do gerador original, mas sorteia cada
+    coluna como um array inteiro (np.random.Generator) e calcula
+    multiplicadores, datas, commits_por_mes e taxa_resolucao_issues como
+    expressões de array. Não reproduz as mesmas linhas do gerador original
+    (o fluxo de números aleatórios é outro), apenas as mesmas distribuições.
+
+    - rng: Generator já inicializado (tem prioridade sobre seed)
+    - inicio: deslocamento usado na numeração dos nomes (projeto-x-001...)
+    - data_referencia: data considerada "hoje" (padrão: date.today())
+    """
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    if data_referencia is None:
+        data_referencia = date.today()
+    n = int(n_repos)
+
+    # Linguagem e multiplicador por linguagem
+    idx_linguagem = rng.choice(len(LINGUAGENS), size=n, p=LINGUAGENS_PESOS)
+    linguagens = np.array(LINGUAGENS, dtype=object)
+    mult = np.array([MULTIPLICADOR_LINGUAGEM[l] for l in LINGUAGENS])[idx_linguagem]
+
+    # Métricas do repositório
+    stars = (rng.lognormal(4, 2, n) * mult).astype(np.int64)
+    forks = (stars * rng.uniform(0.05, 0.30, n)).astype(np.int64)
+    issues_abertas = rng.poisson(np.maximum(10, stars * 0.02)).astype(np.int64)
+    issues_fechadas = (issues_abertas * rng.uniform(2, 8, n)).astype(np.int64)
+
+    pull_requests = rng.poisson(np.maximum(5, stars * 0.015)).astype(np.int64)
+    contributors = (rng.lognormal(1.5, 1, n) * mult).astype(np.int64)
+    commits = (rng.lognormal(5, 1.5, n) * mult).astype(np.int64)
+
+    # Datas: criação nos últimos 5 anos, atualização entre criação e hoje (máx. 1 ano)
+    dias_atras = rng.integers(30, 1825, n, endpoint=True)
+    dias_desde_update = rng.integers(0, np.minimum(dias_atras, 365), endpoint=True)
+    hoje = np.datetime64(data_referencia, 'D')
+    created_at = (hoje - dias_atras.astype('timedelta64[D]')).astype(str)
+    updated_at = (hoje - dias_desde_update.astype('timedelta64[D]')).astype(str)
+
+    tamanho = rng.lognormal(8, 2, n).astype(np.int64)
+    tem_wiki = rng.random(n) < 0.3
+    tem_readme = rng.random(n) < 0.9
+    licenca = np.array(LICENCAS, dtype=object)[rng.choice(len(LICENCAS), size=n, p=LICENCAS_PESOS)]
+    categoria = np.array(CATEGORIAS, dtype=object)[rng.integers(0, len(CATEGORIAS), n)]
+
+    # Nome do repositório: projeto-<linguagem>-<número com 3 dígitos>
+    numeros = pd.Series(np.arange(inicio + 1, inicio + n + 1)).astype(str).str.zfill(3)
+    prefixos = pd.Series(np.array([f"projeto-{l.lower()}-" for l in LINGUAGENS], dtype=object)[idx_linguagem])
+    nomes = (prefixos + numeros).to_numpy(dtype=object)
+
+    # Idade, commits por mês e taxa de resolução de issues
+    idade_dias = dias_atras
+    meses_existencia = np.maximum(idade_dias / 30, 1)
+    commits_por_mes = np.round(commits / meses_existencia, 2)
+    total_issues = issues_abertas + issues_fechadas
+    taxa_resolucao = np.divide(issues_fechadas * 100, total_issues,
+                               out=np.zeros(n), where=total_issues > 0)
+
+    return pd.DataFrame({
+        'repositorio': nomes,
+        'linguagem': linguagens[idx_linguagem],
+        'stars': stars,
+        'forks': forks,
+        'issues_abertas': issues_abertas,
+        'issues_fechadas': issues_fechadas,
+        'total_issues': total_issues,
+        'taxa_resolucao_issues': np.round(taxa_resolucao, 2),
+        'pull_requests': pull_requests,
+        'contributors': contributors,
+        'commits': commits,
+        'commits_por_mes': commits_por_mes,
+        'tamanho_kb': tamanho,
+        'created_at': created_at,
+        'updated_at': updated_at,
+        'idade_dias': idade_dias,
+        'dias_desde_update': dias_desde_update,
+        'tem_wiki': tem_wiki,
+        'tem_readme': tem_readme,
+        'licenca': licenca,
+        'categoria': categoria
+    })
+
+
+def gerar_dataset_em_blocos(n_repos, tamanho_bloco=100_000, seed=42, data_referencia=None):
+    """
+    Gerador que produz o dataset vetorizado em blocos de até 'tamanho_bloco' linhas.
+    Um único Generator é compartilhado entre os blocos, então a sequência é
+    reprodutível para o mesmo par (seed, tamanho_bloco).
+    """
+    rng = np.random.default_rng(seed)
+    if data_referencia is None:
+        data_referencia = date.today()
+    for inicio in range(0, n_repos, tamanho_bloco):
+        n = min(tamanho_bloco, n_repos - inicio)
+        yield gerar_dataset_vetorizado(n, rng=rng, inicio=inicio, data_referencia=data_referencia)
+
+
+def _gerar_shard(seed_shard, inicio, n, data_referencia):
+    """Gera um shard com um Generator próprio (executado em um processo do pool)"""
+    return gerar_dataset_vetorizado(n, rng=np.random.default_rng(seed_shard), inicio=inicio,
+                                    data_referencia=data_referencia)
+
+
+def gerar_dataset_paralelo(n_repos, n_shards, processos=None, seed=42, data_referencia=None):
+    """
+    Gera o dataset vetorizado dividido em n_shards, em paralelo (um pool de processos).
+    Devolve os shards em ordem; o mesmo (seed, n_shards, data_referencia) sempre
+    produz exatamente as mesmas linhas, independente do número de processos.
+    """
+    if data_referencia is None:
+        data_referencia = date.today()
+    return gerar_em_shards(_gerar_shard, n_repos, n_shards, processos=processos, seed=seed,
+                           args_extras=(data_referencia,))
+
+
+def simular_atualizacoes(existente, fracao=0.01, data_referencia=None, seed=42):
+    """
+    Simula a atividade desde a última coleta: sorteia 'fracao' dos repositórios, faz crescer
+    suas contagens e marca updated_at com a data de referência. Só as linhas sorteadas são
+    geradas e têm as colunas derivadas recalculadas; o sorteio depende de (seed, data).
+    O novo updated_at é sempre posterior ao guardado (no mínimo 1 s depois), mesmo numa
+    segunda execução no mesmo dia ou com data de referência anterior à guardada: o upsert
+    (mesclar_atualizacoes) só aceita updated_at mais recente.
+    """
+    if data_referencia is None:
+        data_referencia = date.today()
+    rng = np.random.default_rng([seed, data_referencia.toordinal()])
+    n = len(existente)
+    sorteados = np.sort(rng.choice(n, size=min(n, int(round(n * fracao))), replace=False))
+    linhas = existente.iloc[sorteados].copy()
+    k = len(linhas)
+
+    stars = linhas['stars'].to_numpy()
+    linhas['stars'] = stars + rng.poisson(np.maximum(stars, 1) * 0.01)
+    linhas['forks'] = linhas['forks'].to_numpy() + rng.poisson(np.maximum(stars, 1) * 0.001)
+    linhas['issues_abertas'] = linhas['issues_abertas'].to_numpy() + rng.poisson(1, k)
+    linhas['issues_fechadas'] = linhas['issues_fechadas'].to_numpy() + rng.poisson(3, k)
+    linhas['pull_requests'] = linhas['pull_requests'].to_numpy() + rng.poisson(1, k)
+    linhas['commits'] = linhas['commits'].to_numpy() + rng.poisson(5, k)
+    linhas['contributors'] = linhas['contributors'].to_numpy() + (rng.random(k) < 0.05)
+    guardado = pd.to_datetime(linhas['updated_at'], format='ISO8601')
+    atualizado = (guardado + pd.Timedelta(seconds=1)).clip(lower=pd.Timestamp(data_referencia))
+    linhas['updated_at'] = atualizado.dt.strftime(FORMATO_INSTANTE)
+    return recalcular_derivadas(linhas, data_referencia)
+
+
+def _acumular_resumo(blocos, resumos):
+    """Repassa os blocos adiante guardando em 'resumos' um resumo pequeno de cada um"""
+    for bloco in blocos:
+        resumos.append({
+            'linhas': len(bloco),
+            'linguagens': bloco['linguagem'].value_counts(),
+            'inicio': bloco['created_at'].min(),
+            'fim': bloco['created_at'].max(),
+            'stars_soma': int(bloco['stars'].sum()),
+            'stars_min': int(bloco['stars'].min()),
+            'stars_max': int(bloco['stars'].max()),
+        })
+        yield bloco
+
+
+def main_em_blocos(blocos, caminho=DATASET_REPOSITORIOS):
+    """Grava os blocos gerados um a um, com memória limitada ao tamanho do bloco/shard"""
+    resumos = []
+    total = salvar_em_blocos(_acumular_resumo(blocos, resumos), caminho)
+    print(f"[OK] Dataset salvo: {total} repositorios coletados")
+    print(f"[OK] Arquivo: {caminho}")
+    print()
     
+    linguagens = pd.concat([r['linguagens'] for r in resumos]).groupby(level=0).sum()
+    print("Resumo do Dataset:")
+    print("-" * 70)
+    print(f"Total de repositórios: {total}")
+    print(f"Linguagens: {len(linguagens)}")
+    print(f"Período: {min(r['inicio'] for r in resumos)} a {max(r['fim'] for r in resumos)}")
+    print()
+    
+    print("Distribuição por linguagem:")
+    print(linguagens.sort_values(ascending=False))
+    print()
+    
+    print("Estatísticas de Stars:")
+    print(f"media={sum(r['stars_soma'] for r in resumos) / total:.2f} "
+          f"min={min(r['stars_min'] for r in resumos)} max={max(r['stars_max'] for r in resumos)}")
+    print()
+
+
+def main(argv=None):
+    """Função principal para coleta de dados (argv: argumentos da linha de comando; None = sys.argv)"""
+    parser = argparse.ArgumentParser(description="Gera o dataset simulado de repositórios do GitHub")
+    parser.add_argument("--rows", type=inteiro_positivo, default=500, help="número de repositórios (padrão: 500)")
+    parser.add_argument("--github", action="store_true",
+                        help="coleta os --rows repositórios mais populares pela API do GitHub (token em GITHUB_TOKEN)")
+    parser.add_argument("--api-url", default=URL_API, help=f"URL base da API com --github (padrão: {URL_API})")
+    parser.add_argument("--query", default=CONSULTA_PADRAO,
+                        help=f"consulta da busca de repositórios com --github (padrão: '{CONSULTA_PADRAO}')")
+    parser.add_argument("--concurrency", type=int, default=CONCORRENCIA_PADRAO,
+                        help=f"requisições simultâneas com --github (padrão: {CONCORRENCIA_PADRAO})")
+    parser.add_argument("--http-cache", default=PASTA_CACHE_HTTP,
+                        help=f"pasta do cache de respostas da API com --github (padrão: {PASTA_CACHE_HTTP})")
+    parser.add_argument("--no-http-cache", action="store_true", help="com --github, não usa o cache de respostas")
+    parser.add_argument("--cache-ttl", type=float, default=TTL_PADRAO,
+                        help=f"segundos em que uma resposta guardada é usada sem revalidar (padrão: {TTL_PADRAO:.0f})")
+    parser.add_argument("--cache-max-mb", type=float, default=LIMITE_CACHE_HTTP_MB,
+                        help=f"tamanho máximo do cache de respostas (padrão: {LIMITE_CACHE_HTTP_MB} MB)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="atualiza o dataset existente em --output só com os repositórios novos ou alterados")
+    parser.add_argument("--changed-fraction", type=float, default=0.01,
+                        help="com --incremental no modo simulado, fração de repositórios alterados (padrão: 0.01)")
+    parser.add_argument("--snapshot-dir", default=None,
+                        help="acrescenta a coleta ao histórico nesta pasta (partições por data e linguagem)")
+    parser.add_argument("--engagement-output", default=None,
+                        help="com --github, grava também as métricas no esquema de data/metricas_engajamento.csv")
+    parser.add_argument("--chunk-size", type=inteiro_positivo, default=None,
+                        help="gera e grava em blocos deste tamanho (modo vetorizado, memória limitada)")
+    parser.add_argument("--vectorized", action="store_true", help="usa o gerador vetorizado em memória")
+    parser.add_argument("--shards", type=inteiro_positivo, default=None,
+                        help="divide a geração em N shards executados em paralelo")
+    parser.add_argument("--workers", type=inteiro_positivo, default=None,
+                        help="número de processos usados com --shards (padrão: número de CPUs)")
+    parser.add_argument("--output", default=DATASET_REPOSITORIOS,
+                        help="arquivo de saída; a extensão define o formato (.parquet ou .csv)")
+    parser.add_argument("--reference-date", type=date.fromisoformat, default=None,
+                        help="data usada como 'hoje' na geração, na simulação incremental e com --github (AAAA-MM-DD)")
+    args = parser.parse_args(argv)
+
     print("=" * 70)
     print("LABORATÓRIO 04 - Coleta de Dados")
     print("=" * 70)
     print()
     
-    # Gera o dataset
-    print("Gerando dataset de repositórios do GitHub...")
-    df = gerar_dataset_repositorios(n_repos=500)
+    if args.shards or args.chunk_size:
+        if args.shards:
+            print(f"Gerando {args.rows} repositórios em {args.shards} shards paralelos...")
+            blocos = gerar_dataset_paralelo(args.rows, args.shards, processos=args.workers,
+                                            data_referencia=args.reference_date)
+        else:
+            print(f"Gerando {args.rows} repositórios em blocos de {args.chunk_size}...")
+            blocos = gerar_dataset_em_blocos(args.rows, args.chunk_size, data_referencia=args.reference_date)
+        main_em_blocos(blocos, args.output)
+        if args.snapshot_dir:
+            print("[WARN] --snapshot-dir não é usado com --shards/--chunk-size (o dataset não fica em memória).")
+        print("=" * 70)
+        print("Coleta concluída com sucesso!")
+        print("=" * 70)
+        return
+    
+    existente = None
+    if args.incremental:
+        if os.path.exists(args.output) or os.path.exists(caminho_colunar(args.output)):
+            existente = carregar_tabela(args.output)
+            print(f"[INFO] Incremental: dataset existente com {len(existente)} repositórios ({args.output})")
+        else:
+            print(f"[WARN] {args.output} não existe; coleta completa em vez de incremental.")
+
+    if args.github:
+        print(f"Coletando {args.rows} repositórios da API do GitHub ({args.api_url}, busca '{args.query}')...")
+        cache = None if args.no_http_cache else CacheHTTP(args.http_cache, args.cache_ttl, args.cache_max_mb)
+        df = coletar_repositorios(args.query, args.rows, args.api_url, os.environ.get("GITHUB_TOKEN"),
+                                  args.concurrency, args.reference_date, existente=existente, cache=cache)
+    elif existente is not None:
+        print(f"Simulando atualizações em {args.changed_fraction:.1%} dos repositórios...")
+        df = simular_atualizacoes(existente, args.changed_fraction, args.reference_date)
+    else:
+        # Gera o dataset
+        print("Gerando dataset de repositórios do GitHub...")
+        df = gerar_dataset_repositorios(n_repos=args.rows, vetorizado=args.vectorized,
+                                        data_referencia=args.reference_date)
+
+    if existente is not None:
+        df, estatisticas = mesclar_atualizacoes(existente, df)
+        print(f"[OK] Incremental: {estatisticas['novos']} novos, {estatisticas['atualizados']} atualizados, "
+              f"{estatisticas['sem_alteracao']} sem alteração")
+    if args.github and args.engagement_output:
+        print(f"[OK] Métricas de engajamento: {salvar_tabela(metricas_engajamento(df), args.engagement_output)}")
     
     # Salva os dados
-    df.to_csv('dados_repositorios.csv', index=False, encoding='utf-8')
+    caminho = salvar_tabela(df, args.output)
     print(f"[OK] Dataset salvo: {len(df)} repositorios coletados")
-    print(f"[OK] Arquivo: dados_repositorios.csv")
+    print(f"[OK] Arquivo: {caminho}")
+    if args.snapshot_dir:
+        arquivos, linhas = acrescentar_coleta(df, args.snapshot_dir, args.reference_date)
+        print(f"[OK] Histórico: {linhas} repositórios novos/alterados acrescentados em {args.snapshot_dir} "
+              f"({len(arquivos)} arquivos)")
     print()
     
     # Exibe estatísticas básicas
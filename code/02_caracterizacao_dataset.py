@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 """
 02_caracterizacao_dataset.py
-- Verifica se existe 'data/repositorios.csv'. Se não existir, gera um dataset simulado e salva.
+- Verifica se existe 'data/repositorios' (.parquet, ou .csv importado para Parquet). Se não existir,
+  gera um dataset simulado e salva. Lê apenas as colunas usadas na caracterização e no
+  cubo de agregados, que é compartilhado com 04 (outputs/cubo_agregado).
+  Com --rows/--chunk-size o dataset simulado é (re)gerado em blocos, com memória constante.
 - Gera estatísticas descritivas e visualizações de caracterização exigidas pela Sprint 1:
     * quantidade de repositórios por linguagem (barra)
     * distribuição de stars (histograma)
@@ -9,49 +12,63 @@
     * evolução temporal de criação (repositórios por mês)
 - Salva estatísticas em JSON (outputs/estatisticas_gerais.json)
 - Salva gráficos em outputs/
+- Cada artefato é cacheado pelo hash das colunas de que depende; --no-cache força a regeração
+- Com --approx-quantiles, medianas/quartis do resumo e do boxplot vêm de sketches KLL
+  (memória constante por linguagem) em vez de ordenar todos os valores
+- Importar o módulo não lê nem grava nada: o trabalho fica em main(), e numpy, pandas e
+  matplotlib só são carregados quando usados (adiado.py)
 """
 
 import os
 import json
-from datetime import datetime, timedelta
-import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
+import argparse
+from functools import partial
+from datetime import date, datetime, time, timedelta
+
+from adiado import ModuloAdiado
+from argumentos import inteiro_positivo
+from armazenamento import salvar_em_blocos, salvar_tabela
+from cache_artefatos import PASTA_PADRAO as PASTA_CACHE, CacheArtefatos
+from caminhos import CUBO, DATA_DIR, DATASET_REPOSITORIOS as DATASET_PATH, OUTPUT_DIR
+from cubo import colunas_do_cubo, obter_cubo
+from esquema import carregar_repositorios
+from geracao_paralela import gerar_em_shards
+from metricas import calcular_metrica
+from sketches import estatisticas_bxp
+
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+plt = ModuloAdiado("matplotlib.pyplot")
 
 # ----- Configs de paths -----
-DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
-os.makedirs(DATA_DIR, exist_ok=True)
-CSV_PATH = os.path.join(DATA_DIR, "repositorios.csv")
+CSV_PATH = os.path.splitext(DATASET_PATH)[0] + ".csv"  # importação/exportação
 
-OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "..", "outputs")
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# colunas lidas do dataset, além das do cubo (as demais nunca são carregadas)
+COLUNAS_CARACTERIZACAO = ["linguagem", "created_at", "stars", "commits", "contributors", "taxa_resolucao_issues"]
 
 # ----- Função de geração de dataset simulado (apenas fallback) -----
-def gerar_dataset_simulado(n=500, seed=42):
+def _gerar_bloco_simulado(rs, inicio, n, end):
     """
-    Gera um DataFrame simulando métricas de repositórios GitHub.
-    Colunas (úteis para análises posteriores): id, nome, linguagem, created_at,
-    stars, forks, commits, contributors, issues_abertas, issues_fechadas, tem_docs (bool), licença
+    Gera 'n' linhas simuladas (ids a partir de inicio+1) usando o RandomState 'rs'.
+    'end' é a data de referência; as datas de criação caem nos 5 anos anteriores.
     """
-    np.random.seed(seed)
     linguagens = ["Python", "JavaScript", "Java", "C++", "Go", "TypeScript", "Ruby", "C#"]
-    nomes = [f"repo_{i}" for i in range(n)]
-    linguagem = np.random.choice(linguagens, size=n, p=[0.25,0.2,0.15,0.1,0.08,0.08,0.07,0.07])
+    nomes = [f"repo_{i}" for i in range(inicio, inicio + n)]
+    linguagem = rs.choice(linguagens, size=n, p=[0.25,0.2,0.15,0.1,0.08,0.08,0.07,0.07])
     # datas nos últimos 5 anos
-    end = datetime.now()
     start = end - timedelta(days=5*365)
-    created_at = [start + timedelta(days=int(x)) for x in np.random.uniform(0, (end-start).days, size=n)]
+    created_at = [start + timedelta(days=int(x)) for x in rs.uniform(0, (end-start).days, size=n)]
     # stars: mistura de lognormal para refletir skew
-    stars = np.round(np.random.lognormal(mean=2.0, sigma=1.2, size=n)).astype(int)
-    forks = np.round(stars * np.random.uniform(0.05, 0.5, size=n)).astype(int)
-    commits = np.round(np.random.lognormal(mean=3.0, sigma=1.0, size=n)).astype(int)
-    contributors = np.clip((np.random.poisson(2, size=n) + (stars//50)), 1, None)
-    issues_abertas = np.random.poisson(5, size=n)
-    issues_fechadas = np.minimum(issues_abertas + np.random.poisson(3, size=n), issues_abertas + 10)
-    tem_docs = np.random.choice([True, False], size=n, p=[0.6, 0.4])
-    licencas = np.random.choice(["MIT", "Apache-2.0", "GPL-3.0", "None", "BSD-3-Clause"], size=n, p=[0.35,0.2,0.15,0.2,0.1])
+    stars = np.round(rs.lognormal(mean=2.0, sigma=1.2, size=n)).astype(int)
+    forks = np.round(stars * rs.uniform(0.05, 0.5, size=n)).astype(int)
+    commits = np.round(rs.lognormal(mean=3.0, sigma=1.0, size=n)).astype(int)
+    contributors = np.clip((rs.poisson(2, size=n) + (stars//50)), 1, None)
+    issues_abertas = rs.poisson(5, size=n)
+    issues_fechadas = np.minimum(issues_abertas + rs.poisson(3, size=n), issues_abertas + 10)
+    tem_docs = rs.choice([True, False], size=n, p=[0.6, 0.4])
+    licencas = rs.choice(["MIT", "Apache-2.0", "GPL-3.0", "None", "BSD-3-Clause"], size=n, p=[0.35,0.2,0.15,0.2,0.1])
     df = pd.DataFrame({
-        "id": range(1, n+1),
+        "id": range(inicio + 1, inicio + n + 1),
         "nome": nomes,
         "linguagem": linguagem,
         "created_at": pd.to_datetime(created_at),
@@ -64,98 +81,222 @@ def gerar_dataset_simulado(n=500, seed=42):
         "tem_docs": tem_docs,
         "licenca": licencas
     })
-    # taxa de resolução de issues
-    df["taxa_resolucao_issues"] = df.apply(lambda r: (r.issues_fechadas / r.issues_abertas) if r.issues_abertas > 0 else np.nan, axis=1)
+    # taxa de resolução de issues: a mesma definição do dataset de 01 (ver metricas.py)
+    df["taxa_resolucao_issues"] = calcular_metrica(df, "taxa_resolucao_issues")
     return df
 
-# ----- Ler CSV ou gerar -----
-if os.path.exists(CSV_PATH):
-    print(f"[INFO] Lendo dataset existente em: {CSV_PATH}")
-    df = pd.read_csv(CSV_PATH, parse_dates=["created_at"])
-else:
-    print(f"[WARN] Arquivo {CSV_PATH} não encontrado. Gerando dataset simulado e salvando.")
-    df = gerar_dataset_simulado(n=600)
-    df.to_csv(CSV_PATH, index=False)
-    print(f"[INFO] Dataset simulado salvo em {CSV_PATH}")
+def gerar_dataset_simulado(n=500, seed=42):
+    """
+    Gera um DataFrame simulando métricas de repositórios GitHub.
+    Colunas (úteis para análises posteriores): id, nome, linguagem, created_at,
+    stars, forks, commits, contributors, issues_abertas, issues_fechadas, tem_docs (bool), licença
+    """
+    return _gerar_bloco_simulado(np.random.RandomState(seed), 0, n, datetime.now())
+
+def gerar_dataset_simulado_em_blocos(n=500, tamanho_bloco=100_000, seed=42):
+    """
+    Gerador com o mesmo conteúdo de gerar_dataset_simulado, produzido em blocos
+    de até 'tamanho_bloco' linhas para manter o pico de memória constante.
+    """
+    rs = np.random.RandomState(seed)
+    end = datetime.now()
+    for inicio in range(0, n, tamanho_bloco):
+        yield _gerar_bloco_simulado(rs, inicio, min(tamanho_bloco, n - inicio), end)
+
+def _gerar_shard_simulado(seed_shard, inicio, n, end):
+    """Gera um shard com um RandomState próprio (executado em um processo do pool)"""
+    return _gerar_bloco_simulado(np.random.RandomState(np.random.MT19937(seed_shard)), inicio, n, end)
+
+def gerar_dataset_simulado_paralelo(n=500, n_shards=4, processos=None, seed=42):
+    """
+    Gera o dataset simulado em n_shards paralelos, devolvidos em ordem.
+    A data de referência é a meia-noite de hoje, então o mesmo (seed, n_shards)
+    produz um arquivo idêntico byte a byte em qualquer execução do dia.
+    """
+    end = datetime.combine(date.today(), time())
+    return gerar_em_shards(_gerar_shard_simulado, n, n_shards, processos=processos, seed=seed, args_extras=(end,))
 
 # ----- Estatísticas gerais -----
-estatisticas = {}
-estatisticas["num_repositorios"] = int(len(df))
-estatisticas["periodo"] = {
-    "min_created_at": str(df["created_at"].min().date()),
-    "max_created_at": str(df["created_at"].max().date())
-}
-estatisticas["linguagens_unicas"] = int(df["linguagem"].nunique())
-estatisticas["top_5_linguagens"] = df["linguagem"].value_counts().head(5).to_dict()
-estatisticas["stars_descritiva"] = df["stars"].describe().to_dict()
-estatisticas["commits_descritiva"] = df["commits"].describe().to_dict()
-
-with open(os.path.join(OUTPUT_DIR, "estatisticas_gerais.json"), "w", encoding="utf-8") as f:
-    json.dump(estatisticas, f, indent=2)
-print(f"[INFO] Estatísticas gerais salvas em outputs/estatisticas_gerais.json")
+def salvar_estatisticas_gerais(cubo):
+    por_linguagem = cubo.contagem(["linguagem"])
+    estatisticas = {}
+    estatisticas["num_repositorios"] = int(cubo.n)
+    estatisticas["periodo"] = {
+        "min_created_at": str(pd.Timestamp(cubo.metadados["created_at_min"]).date()),
+        "max_created_at": str(pd.Timestamp(cubo.metadados["created_at_max"]).date())
+    }
+    estatisticas["linguagens_unicas"] = int(len(por_linguagem))
+    estatisticas["top_5_linguagens"] = por_linguagem.sort_values(ascending=False, kind="stable").head(5).to_dict()
+    estatisticas["stars_descritiva"] = cubo.descrever("stars").to_dict()
+    estatisticas["commits_descritiva"] = cubo.descrever("commits").to_dict()
+
+    with open(os.path.join(OUTPUT_DIR, "estatisticas_gerais.json"), "w", encoding="utf-8") as f:
+        json.dump(estatisticas, f, indent=2)
+    print(f"[INFO] Estatísticas gerais salvas em outputs/estatisticas_gerais.json")
 
 # ----- Visualizações (matplotlib) -----
 # 1) Quantidade de repositórios por linguagem (barra)
-vc = df["linguagem"].value_counts()
-plt.figure(figsize=(8,5))
-vc.plot(kind="bar")
-plt.title("Quantidade de repositórios por linguagem")
-plt.xlabel("Linguagem")
-plt.ylabel("Número de repositórios")
-plt.xticks(rotation=45, ha="right")
-plt.tight_layout()
-plt.savefig(os.path.join(OUTPUT_DIR, "repos_por_linguagem_bar.png"))
-plt.close()
-print("[INFO] Gráfico 'repos_por_linguagem_bar.png' salvo.")
+def grafico_repos_por_linguagem(cubo):
+    vc = cubo.contagem(["linguagem"]).sort_values(ascending=False, kind="stable")
+    plt.figure(figsize=(8,5))
+    vc.plot(kind="bar")
+    plt.title("Quantidade de repositórios por linguagem")
+    plt.xlabel("Linguagem")
+    plt.ylabel("Número de repositórios")
+    plt.xticks(rotation=45, ha="right")
+    plt.tight_layout()
+    plt.savefig(os.path.join(OUTPUT_DIR, "repos_por_linguagem_bar.png"))
+    plt.close()
+    print("[INFO] Gráfico 'repos_por_linguagem_bar.png' salvo.")
 
 # 2) Distribuição de stars (histograma) - log scale nos eixos se necessário
-plt.figure(figsize=(8,5))
-plt.hist(df["stars"], bins=40)
-plt.title("Distribuição de Stars")
-plt.xlabel("Stars")
-plt.ylabel("Frequência")
-plt.tight_layout()
-plt.savefig(os.path.join(OUTPUT_DIR, "distribuicao_stars_hist.png"))
-plt.close()
-print("[INFO] Gráfico 'distribuicao_stars_hist.png' salvo.")
+def grafico_distribuicao_stars(df):
+    plt.figure(figsize=(8,5))
+    plt.hist(df["stars"], bins=40)
+    plt.title("Distribuição de Stars")
+    plt.xlabel("Stars")
+    plt.ylabel("Frequência")
+    plt.tight_layout()
+    plt.savefig(os.path.join(OUTPUT_DIR, "distribuicao_stars_hist.png"))
+    plt.close()
+    print("[INFO] Gráfico 'distribuicao_stars_hist.png' salvo.")
 
 # 3) Boxplot de stars por linguagem (mostra variação por linguagem)
-plt.figure(figsize=(10,6))
-# ordenar linguagens por mediana para melhor visualização
-order = df.groupby("linguagem")["stars"].median().sort_values(ascending=False).index
-df.boxplot(column="stars", by="linguagem", grid=False, rot=45, figsize=(10,6), order=list(order))
-plt.suptitle("")  # remove título automático
-plt.title("Boxplot de Stars por Linguagem")
-plt.xlabel("Linguagem")
-plt.ylabel("Stars")
-plt.tight_layout()
-plt.savefig(os.path.join(OUTPUT_DIR, "boxplot_stars_por_linguagem.png"))
-plt.close()
-print("[INFO] Gráfico 'boxplot_stars_por_linguagem.png' salvo.")
+def grafico_boxplot_stars(df):
+    # ordenar linguagens por mediana para melhor visualização
+    # (DataFrame.boxplot não aceita 'order'; a ordem vem da categoria ordenada)
+    order = df.groupby("linguagem", observed=True)["stars"].median().sort_values(ascending=False).index
+    dados = df[["linguagem", "stars"]].copy()
+    dados["linguagem"] = pd.Categorical(dados["linguagem"].astype(str), categories=list(order), ordered=True)
+    dados.boxplot(column="stars", by="linguagem", grid=False, rot=45, figsize=(10,6))
+    plt.suptitle("")  # remove título automático
+    plt.title("Boxplot de Stars por Linguagem")
+    plt.xlabel("Linguagem")
+    plt.ylabel("Stars")
+    plt.tight_layout()
+    plt.savefig(os.path.join(OUTPUT_DIR, "boxplot_stars_por_linguagem.png"))
+    plt.close()
+    print("[INFO] Gráfico 'boxplot_stars_por_linguagem.png' salvo.")
+
+def grafico_boxplot_stars_cubo(cubo):
+    # mesmo boxplot desenhado a partir dos quartis e bigodes do cubo (sem os pontos atípicos)
+    caixas = cubo.caixas("linguagem", "stars").sort_values("mediana", ascending=False, kind="stable")
+    fig, ax = plt.subplots(figsize=(10,6))
+    ax.bxp(estatisticas_bxp(caixas.to_dict("index")), showfliers=False)
+    ax.tick_params(axis="x", labelrotation=45)
+    ax.set_title("Boxplot de Stars por Linguagem (quartis aproximados)")
+    ax.set_xlabel("Linguagem")
+    ax.set_ylabel("Stars")
+    plt.tight_layout()
+    plt.savefig(os.path.join(OUTPUT_DIR, "boxplot_stars_por_linguagem.png"))
+    plt.close()
+    print("[INFO] Gráfico 'boxplot_stars_por_linguagem.png' salvo (quartis aproximados).")
 
 # 4) Evolução temporal: contagem de repositórios criados por mês
-df["created_month"] = df["created_at"].dt.to_period("M").dt.to_timestamp()
-monthly = df.groupby("created_month").size()
-plt.figure(figsize=(10,4))
-monthly.plot()
-plt.title("Repositórios criados por mês")
-plt.xlabel("Mês")
-plt.ylabel("Número de repositórios")
-plt.tight_layout()
-plt.savefig(os.path.join(OUTPUT_DIR, "repos_por_mes_line.png"))
-plt.close()
-print("[INFO] Gráfico 'repos_por_mes_line.png' salvo.")
+def grafico_repos_por_mes(cubo):
+    monthly = cubo.contagem(["mes"])
+    monthly.index = pd.PeriodIndex(monthly.index.astype(str), freq="M").to_timestamp()
+    plt.figure(figsize=(10,4))
+    monthly.plot()
+    plt.title("Repositórios criados por mês")
+    plt.xlabel("Mês")
+    plt.ylabel("Número de repositórios")
+    plt.tight_layout()
+    plt.savefig(os.path.join(OUTPUT_DIR, "repos_por_mes_line.png"))
+    plt.close()
+    print("[INFO] Gráfico 'repos_por_mes_line.png' salvo.")
 
 # 5) Tabela resumida por linguagem (média, mediana de stars, commits, contributors)
-resumo_por_linguagem = df.groupby("linguagem").agg({
-    "stars": ["count", "mean", "median", "std"],
-    "commits": ["mean", "median"],
-    "contributors": ["mean", "median"],
-    "taxa_resolucao_issues": ["mean"]
-})
-resumo_por_linguagem.columns = ["_".join(c).strip() for c in resumo_por_linguagem.columns.values]
-resumo_csv_path = os.path.join(OUTPUT_DIR, "resumo_por_linguagem.csv")
-resumo_por_linguagem.to_csv(resumo_csv_path)
-print(f"[INFO] Resumo por linguagem salvo em {resumo_csv_path}")
-
-print("\n[CONCLUÍDO] Sprint 1 - caracterização gerada. Verifique a pasta outputs/ para os gráficos e arquivos.")
+def salvar_resumo_por_linguagem(cubo):
+    resumo_por_linguagem = cubo.agregar(["linguagem"], {
+        "stars": ["count", "mean", "median", "std"],
+        "commits": ["mean", "median"],
+        "contributors": ["mean", "median"],
+        "taxa_resolucao_issues": ["mean"]
+    })
+    resumo_por_linguagem.columns = ["_".join(c).strip() for c in resumo_por_linguagem.columns.values]
+    resumo_csv_path = os.path.join(OUTPUT_DIR, "resumo_por_linguagem.csv")
+    resumo_por_linguagem.to_csv(resumo_csv_path)
+    print(f"[INFO] Resumo por linguagem salvo em {resumo_csv_path}")
+
+# etapas da caracterização: (nome, função, colunas de entrada, arquivos gerados em outputs/)
+ETAPAS = [
+    ("estatisticas_gerais", salvar_estatisticas_gerais, ["created_at", "linguagem", "stars", "commits"],
+     ["estatisticas_gerais.json"]),
+    ("repos_por_linguagem", grafico_repos_por_linguagem, ["linguagem"], ["repos_por_linguagem_bar.png"]),
+    ("distribuicao_stars", grafico_distribuicao_stars, ["stars"], ["distribuicao_stars_hist.png"]),
+    ("boxplot_stars", grafico_boxplot_stars, ["linguagem", "stars"], ["boxplot_stars_por_linguagem.png"]),
+    ("repos_por_mes", grafico_repos_por_mes, ["created_at"], ["repos_por_mes_line.png"]),
+    ("resumo_por_linguagem", salvar_resumo_por_linguagem,
+     ["linguagem", "stars", "commits", "contributors", "taxa_resolucao_issues"], ["resumo_por_linguagem.csv"]),
+]
+# etapas que recebem o cubo de agregados (cubo.py) em vez do DataFrame; as demais
+# (histograma e boxplot) precisam dos valores individuais
+ETAPAS_DO_CUBO = {"estatisticas_gerais", "repos_por_linguagem", "repos_por_mes", "resumo_por_linguagem"}
+# com --approx-quantiles o boxplot também sai do cubo (quartis e bigodes estimados por sketches)
+ETAPAS_APROXIMADAS = {"boxplot_stars": grafico_boxplot_stars_cubo}
+
+# ----- Linha de comando -----
+def criar_parser():
+    parser = argparse.ArgumentParser(description="Caracterização do dataset de repositórios (Sprint 1)")
+    parser.add_argument("--rows", type=inteiro_positivo, default=None,
+                        help="(re)gera o dataset simulado com este número de linhas antes da caracterização")
+    parser.add_argument("--chunk-size", type=inteiro_positivo, default=100_000,
+                        help="tamanho do bloco usado na geração em streaming (padrão: 100000)")
+    parser.add_argument("--generate-only", action="store_true",
+                        help="apenas gera o dataset (com --rows) e encerra, sem carregá-lo em memória")
+    parser.add_argument("--shards", type=inteiro_positivo, default=None,
+                        help="gera o dataset (com --rows) em N shards paralelos")
+    parser.add_argument("--workers", type=inteiro_positivo, default=None,
+                        help="número de processos usados com --shards (padrão: número de CPUs)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="regera todos os artefatos, ignorando o cache em outputs/.cache_artefatos")
+    parser.add_argument("--approx-quantiles", action="store_true",
+                        help="medianas e quartis estimados por sketches KLL (memória constante por grupo)")
+    return parser
+
+
+def main(argv=None):
+    args = criar_parser().parse_args(argv)
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    if args.rows:
+        if args.shards:
+            print(f"[INFO] Gerando {args.rows} linhas simuladas em {args.shards} shards paralelos em {DATASET_PATH}")
+            blocos = gerar_dataset_simulado_paralelo(n=args.rows, n_shards=args.shards, processos=args.workers)
+        else:
+            print(f"[INFO] Gerando {args.rows} linhas simuladas em blocos de {args.chunk_size} em {DATASET_PATH}")
+            blocos = gerar_dataset_simulado_em_blocos(n=args.rows, tamanho_bloco=args.chunk_size)
+        total = salvar_em_blocos(blocos, DATASET_PATH)
+        print(f"[INFO] Dataset simulado salvo em {DATASET_PATH} ({total} linhas)")
+        if args.generate_only:
+            return
+
+    # ----- Ler dataset ou gerar -----
+    if os.path.exists(DATASET_PATH) or os.path.exists(CSV_PATH):
+        print(f"[INFO] Lendo dataset existente em: {DATASET_PATH}")
+    else:
+        print(f"[WARN] Arquivo {DATASET_PATH} não encontrado. Gerando dataset simulado e salvando.")
+        salvar_tabela(gerar_dataset_simulado(n=600), DATASET_PATH)
+        print(f"[INFO] Dataset simulado salvo em {DATASET_PATH}")
+    # relido mesmo quando acabou de ser gerado, para o cubo ver os mesmos tipos que 04 vê
+    colunas = COLUNAS_CARACTERIZACAO + [c for c in colunas_do_cubo(CSV_PATH) if c not in COLUNAS_CARACTERIZACAO]
+    df = carregar_repositorios(CSV_PATH, colunas=colunas, datas=["created_at"])
+
+    # ----- Estatísticas gerais e visualizações (cacheadas por etapa) -----
+    cache = CacheArtefatos(os.path.join(OUTPUT_DIR, PASTA_CACHE), ativo=not args.no_cache)
+    cubo = obter_cubo(df, CUBO, cache, approx_quantiles=args.approx_quantiles)
+    for nome, funcao, colunas, saidas in ETAPAS:
+        entrada = cubo if nome in ETAPAS_DO_CUBO else df
+        if args.approx_quantiles and nome in ETAPAS_APROXIMADAS:
+            funcao, entrada = ETAPAS_APROXIMADAS[nome], cubo
+        cache.executar(nome, [os.path.join(OUTPUT_DIR, s) for s in saidas], partial(funcao, entrada),
+                       dados=df[colunas], funcao=funcao, parametros={"approx_quantiles": args.approx_quantiles})
+
+    print("\n[CONCLUÍDO] Sprint 1 - caracterização gerada. Verifique a pasta outputs/ para os gráficos e arquivos.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,47 +1,149 @@
 #!/usr/bin/env python3
+"""
+03_analise_rqs.py
+Análise das questões de pesquisa RQ1 (popularidade x atividade) e RQ2 (taxa de resolução
+de issues por linguagem) sobre data/metricas_engajamento.csv.
+Importar o módulo não lê nada: o trabalho fica em main(), e numpy, pandas, scipy,
+matplotlib e plotly só são carregados quando usados (adiado.py).
+"""
 import os
 import json
-import numpy as np
-import pandas as pd
-from scipy import stats
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.io as pio
+import argparse
+from functools import partial
 
-# ===== Paths =====
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_DIR = os.path.join(BASE_DIR, "..", "data")
-OUTPUT_DIR = os.path.join(BASE_DIR, "..", "outputs")
-
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+from adiado import ModuloAdiado
+from argumentos import inteiro_positivo
+from armazenamento import arquivo_de_leitura, caminho_colunar, colunas_disponiveis, ler_em_blocos
+from bootstrap import (CONFIANCA_PADRAO, REAMOSTRAGENS_PADRAO, estimar_lote, intervalos_bootstrap,
+                       postos_ponderados, preparar_dados, reamostrar)
+from cache_artefatos import PASTA_PADRAO as PASTA_CACHE, CacheArtefatos, hash_arquivo
+from caminhos import DATASET_ENGAJAMENTO, OUTPUT_DIR
+from correlacoes import MATRIZES, obter_correlacoes
+from esquema import carregar_repositorios
+from estatistica_online import MomentosBivariados, MomentosPorGrupo, p_valor_correlacao
+from metricas import METRICAS_ENGAJAMENTO, calcular_metricas, entradas_metrica
+from posthoc import CORRECOES, PostosAgrupados, ajustar_p_valores
+from sketches import K_PADRAO, SketchesPorGrupo, SketchKLL, erro_posto_kll, estatisticas_bxp, sketches_em_blocos
 
-csv_path = os.path.join(DATA_DIR, "metricas_engajamento.csv")
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+stats = ModuloAdiado("scipy.stats")
+plt = ModuloAdiado("matplotlib.pyplot")
+px = ModuloAdiado("plotly.express")
+pio = ModuloAdiado("plotly.io")
+mcolors = ModuloAdiado("matplotlib.colors")
 
-if not os.path.exists(csv_path):
-    raise FileNotFoundError(f"Arquivo {csv_path} não encontrado! Verifique se o CSV foi gerado corretamente.")
+# ===== Paths =====
+csv_path = DATASET_ENGAJAMENTO
 
 # ===== Carregar dataset =====
-df = pd.read_csv(csv_path)
-
 # renomear colunas relevantes
-df = df.rename(columns={
+RENOMEAR = {
     "language": "linguagem",
     "issue_resolution_rate": "taxa_resolucao_issues"
-})
+}
 
-# descartar repositórios sem linguagem definida
-df = df.dropna(subset=["linguagem"])
-
-print(f"[INFO] Dataset carregado com {len(df)} repositórios e {len(df.columns)} colunas.")
-print("Colunas principais:", ", ".join(df.columns[:10]), "...")
+def carregar_dataset(colunas=None):
+    """
+    Carrega o dataset (formato colunar) lendo apenas 'colunas' (nomes já traduzidos; None = todas).
+    Repositórios sem linguagem definida são descartados pelo próprio leitor.
+    Métricas de engajamento ausentes no arquivo são calculadas a partir das contagens brutas.
+    """
+    originais = {novo: antigo for antigo, novo in RENOMEAR.items()}
+    leitura = None
+    if colunas is not None:
+        colunas = [originais.get(c, c) for c in colunas]
+        existentes = set(colunas_disponiveis(csv_path))
+        leitura = [c for c in colunas if c in existentes]
+        for c in colunas:
+            if c not in existentes and c in METRICAS_ENGAJAMENTO:
+                leitura += [e for e in entradas_metrica(c) if e not in leitura]
+    df = carregar_repositorios(csv_path, colunas=leitura, nao_nulos=["language"])
+    df = calcular_metricas(df, METRICAS_ENGAJAMENTO, somente_ausentes=True)
+    if colunas is not None:
+        df = df[colunas]
+    df = df.rename(columns=RENOMEAR)
+    print(f"[INFO] Dataset carregado com {len(df)} repositórios e {len(df.columns)} colunas: {', '.join(df.columns)}")
+    return df
 
 # ===========================================================
 # RQ1: Popularidade (stars) x Atividade (commits, contributors)
 # ===========================================================
 
-def analisar_rq1(df):
+# colunas da RQ1 e gráficos de dispersão (eixo x, rótulo, arquivo, título); y = stars
+COLUNAS_RQ1 = ["stars", "commits", "contributors"]
+GRAFICOS_RQ1 = [
+    ("commits", "Commits", "rq1_stars_x_commits_scatter.png", "Stars x Commits (com tendência linear)"),
+    ("contributors", "Contributors", "rq1_stars_x_contributors_scatter.png", "Stars x Contributors (com tendência linear)"),
+]
+
+# ----- Modo densidade para N grande -----
+# Acima de LIMITE_PONTOS_DISPERSAO linhas (--max-points) os gráficos da RQ1 deixam de desenhar
+# um marcador por repositório: os pontos são contados em um histograma 2D (BINS_DENSIDADE x
+# BINS_DENSIDADE células) e o gráfico desenha só as células, com custo que não depende de N
+LIMITE_PONTOS_DISPERSAO = 100_000
+BINS_DENSIDADE = 100
+
+def bordas_densidade(maximo, n_bins=BINS_DENSIDADE):
+    """
+    Bordas de 0 a 'maximo' igualmente espaçadas em log(1 + x), para eixos symlog: contagens
+    (stars, commits, contributors) variam em ordens de grandeza e zeros continuam visíveis
+    """
+    maximo = max(float(maximo), 1.0)
+    bordas = np.expm1(np.linspace(0.0, np.log1p(maximo), n_bins + 1))
+    bordas[-1] = maximo
+    return bordas
+
+def histograma_rq1(x, stars, bordas_x, bordas_stars):
+    """Repositórios por célula (len(bordas_x)-1 x len(bordas_stars)-1); valores fora das bordas são ignorados"""
+    contagem, _, _ = np.histogram2d(np.asarray(x, dtype=np.float64), np.asarray(stars, dtype=np.float64),
+                                    bins=[bordas_x, bordas_stars])
+    return contagem
+
+def _desenhar_densidade(densidade, xs_reta, ys_reta):
+    bordas_x, bordas_stars, contagem = densidade
+    malha = plt.pcolormesh(bordas_x, bordas_stars, np.ma.masked_equal(contagem.T, 0),
+                           norm=mcolors.LogNorm(vmin=1, vmax=max(contagem.max(), 1)), cmap="viridis")
+    plt.colorbar(malha, label="Repositórios por célula")
+    plt.plot(xs_reta, np.clip(ys_reta, 0, None), linestyle="--", color="red")
+    plt.xscale("symlog", linthresh=1)
+    plt.yscale("symlog", linthresh=1)
+    plt.xlim(bordas_x[0], bordas_x[-1])
+    plt.ylim(bordas_stars[0], bordas_stars[-1])
+
+def graficos_rq1(pontos, retas, densidades=None):
+    """
+    Salva os gráficos de dispersão da RQ1 com a reta de tendência.
+    pontos: DataFrame com os pontos desenhados (todos, ou uma amostra no modo streaming)
+    retas: {coluna x: (inclinação, intercepto, x mínimo, x máximo)} calculadas sobre todos os dados
+    densidades: {coluna x: (bordas x, bordas stars, contagens)}; as colunas presentes são
+    desenhadas como densidade (histograma 2D) em vez de um ponto por repositório
+    """
+    densidades = densidades or {}
+    caminhos = []
+    for coluna, rotulo, arquivo, titulo in GRAFICOS_RQ1:
+        m, b, x_min, x_max = retas[coluna]
+        plt.figure(figsize=(7,5))
+        if coluna in densidades:
+            xs = densidades[coluna][0]
+            _desenhar_densidade(densidades[coluna], xs, m*xs + b)
+            titulo = f"{titulo}\ndensidade de {int(densidades[coluna][2].sum())} repositórios"
+        else:
+            plt.scatter(pontos[coluna], pontos["stars"], alpha=0.6)
+            xs = np.linspace(x_min, x_max, 100)
+            plt.plot(xs, m*xs + b, linestyle="--", color="red")
+        plt.xlabel(rotulo)
+        plt.ylabel("Stars")
+        plt.title(titulo)
+        plt.tight_layout()
+        caminhos.append(os.path.join(OUTPUT_DIR, arquivo))
+        plt.savefig(caminhos[-1])
+        plt.close()
+    print(f"[RQ1] Gráficos salvos: {', '.join(caminhos)}")
+
+def analisar_rq1(df, limite_pontos=LIMITE_PONTOS_DISPERSAO):
     print("\n[RQ1] Iniciando análise: Popularidade (stars) x Atividade (commits, contributors)")
-    sub = df.dropna(subset=["stars", "commits", "contributors"])
+    sub = df.dropna(subset=COLUNAS_RQ1)
 
     # correlações
     pearson_commits = stats.pearsonr(sub["stars"], sub["commits"])
@@ -54,35 +156,132 @@ def analisar_rq1(df):
     print(f"Pearson (stars x contributors): r={pearson_contrib[0]:.3f}, p={pearson_contrib[1]:.3e}")
     print(f"Spearman (stars x contributors): rho={spearman_contrib.correlation:.3f}, p={spearman_contrib.pvalue:.3e}")
 
-    # Scatter: stars x commits
-    plt.figure(figsize=(7,5))
-    plt.scatter(sub["commits"], sub["stars"], alpha=0.6)
+    # regressões lineares (stars em função de commits / contributors)
     m, b = np.polyfit(sub["commits"], sub["stars"], 1)
-    xs = np.linspace(sub["commits"].min(), sub["commits"].max(), 100)
-    plt.plot(xs, m*xs + b, linestyle="--", color="red")
-    plt.xlabel("Commits")
-    plt.ylabel("Stars")
-    plt.title("Stars x Commits (com tendência linear)")
-    plt.tight_layout()
-    path1 = os.path.join(OUTPUT_DIR, "rq1_stars_x_commits_scatter.png")
-    plt.savefig(path1)
-    plt.close()
-
-    # Scatter: stars x contributors
-    plt.figure(figsize=(7,5))
-    plt.scatter(sub["contributors"], sub["stars"], alpha=0.6)
     m2, b2 = np.polyfit(sub["contributors"], sub["stars"], 1)
-    xs2 = np.linspace(sub["contributors"].min(), sub["contributors"].max(), 100)
-    plt.plot(xs2, m2*xs2 + b2, linestyle="--", color="red")
-    plt.xlabel("Contributors")
-    plt.ylabel("Stars")
-    plt.title("Stars x Contributors (com tendência linear)")
-    plt.tight_layout()
-    path2 = os.path.join(OUTPUT_DIR, "rq1_stars_x_contributors_scatter.png")
-    plt.savefig(path2)
-    plt.close()
+    densidades = None
+    if len(sub) > limite_pontos:
+        print(f"[RQ1] {len(sub)} pontos (> {limite_pontos}): gráficos em modo densidade")
+        bordas_stars = bordas_densidade(sub["stars"].max())
+        densidades = {}
+        for coluna, _, _, _ in GRAFICOS_RQ1:
+            bordas_x = bordas_densidade(sub[coluna].max())
+            densidades[coluna] = (bordas_x, bordas_stars, histograma_rq1(sub[coluna], sub["stars"], bordas_x, bordas_stars))
+    graficos_rq1(sub, {
+        "commits": (m, b, sub["commits"].min(), sub["commits"].max()),
+        "contributors": (m2, b2, sub["contributors"].min(), sub["contributors"].max()),
+    }, densidades)
 
-    print(f"[RQ1] Gráficos salvos: {path1}, {path2}")
+    return {
+        "pearson_stars_commits": pearson_commits[0],
+        "spearman_stars_commits": spearman_commits.correlation,
+        "pearson_stars_contributors": pearson_contrib[0],
+        "spearman_stars_contributors": spearman_contrib.correlation,
+        "regression_commits": {"slope": float(m), "intercept": float(b)},
+        "regression_contributors": {"slope": float(m2), "intercept": float(b2)},
+    }
+
+def bootstrap_rq1(df, reamostragens=REAMOSTRAGENS_PADRAO, processos=None, seed=42, confianca=CONFIANCA_PADRAO):
+    """Intervalos de confiança (bootstrap percentil) de Pearson, Spearman e das retas da RQ1"""
+    print(f"\n[RQ1] Bootstrap: {reamostragens} reamostragens (seed={seed}, {processos or os.cpu_count()} processos)")
+    sub = df.dropna(subset=COLUNAS_RQ1)
+    intervalos = intervalos_bootstrap(sub, "stars", ["commits", "contributors"], reamostragens, confianca,
+                                      processos, seed)
+    for coluna in ["commits", "contributors"]:
+        for metodo in ["pearson", "spearman"]:
+            ic = intervalos[f"{metodo}_stars_{coluna}"]
+            print(f"{metodo.capitalize()} (stars x {coluna}): IC {confianca:.0%} = "
+                  f"[{ic['ic_inferior']:.3f}, {ic['ic_superior']:.3f}]")
+        ic = intervalos[f"regression_{coluna}"]["slope"]
+        print(f"Inclinação (stars ~ {coluna}): IC {confianca:.0%} = [{ic['ic_inferior']:.3f}, {ic['ic_superior']:.3f}]")
+    return {"reamostragens": reamostragens, "confianca": confianca, "seed": seed, "metodo": "percentil",
+            "intervalos": intervalos}
+
+# ----- RQ1 em streaming (dataset maior que a memória) -----
+TAMANHO_BLOCO_PADRAO = 100_000
+TAMANHO_AMOSTRA_GRAFICOS = 20_000
+
+def ler_blocos_rq1(tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Blocos com as colunas da RQ1, sem nulos e sem repositórios sem linguagem, lidos do disco"""
+    for bloco in ler_em_blocos(csv_path, colunas=COLUNAS_RQ1, nao_nulos=["language"], tamanho_bloco=tamanho_bloco):
+        yield bloco.dropna(subset=COLUNAS_RQ1)
+
+def _atualizar_amostra(amostra, bloco, tamanho, rng):
+    # amostragem uniforme sem reposição: mantém as 'tamanho' linhas com as menores chaves aleatórias
+    bloco = bloco.assign(_chave=rng.random(len(bloco)))
+    juntos = bloco if amostra is None else pd.concat([amostra, bloco], ignore_index=True)
+    return juntos.nsmallest(tamanho, "_chave")
+
+def analisar_rq1_streaming(tamanho_bloco=TAMANHO_BLOCO_PADRAO, k=K_PADRAO,
+                           tamanho_amostra=TAMANHO_AMOSTRA_GRAFICOS, seed=42, limite_pontos=LIMITE_PONTOS_DISPERSAO):
+    """
+    RQ1 lendo o dataset em blocos, com memória limitada ao bloco + sketches + amostra.
+
+    - 1ª passada: momentos (Welford/Chan) de (commits, stars) e (contributors, stars), que dão
+      Pearson e as retas de regressão exatos (a menos de arredondamento); sketches KLL de cada
+      coluna; amostra aleatória de pontos para os gráficos
+    - 2ª passada: postos médios aproximados de cada valor pelos sketches; Spearman é o Pearson
+      desses postos (empates tratados como em scipy.stats.spearmanr); acima de limite_pontos
+      linhas, também os histogramas 2D dos gráficos em modo densidade (bordas pelos máximos
+      da 1ª passada), que cobrem todas as linhas e não só a amostra
+
+    Erro do Spearman: cada posto normalizado erra no máximo ε = erro_posto_kll(k) (com alta
+    probabilidade), o que muda 12·média((u-½)(v-½)) em no máximo 12·ε·(1+ε); sem empates
+    rho = 12·média((u-½)(v-½))·n²/(n²-1), então |rho aproximado - rho| <~ 12·ε·(1+ε)
+    (k=1000: ~0,034). Na prática o erro observado é bem menor, pois os erros dos postos se compensam.
+    """
+    print(f"\n[RQ1] Iniciando análise em streaming (blocos de {tamanho_bloco} linhas, sketches KLL k={k})")
+    rng = np.random.default_rng(seed)
+    momentos = {"commits": MomentosBivariados(), "contributors": MomentosBivariados()}
+    sketches = {c: SketchKLL(k, seed=seed + i) for i, c in enumerate(COLUNAS_RQ1)}
+    amostra = None
+    for bloco in ler_blocos_rq1(tamanho_bloco):
+        for coluna, mom in momentos.items():
+            mom.atualizar(bloco[coluna].to_numpy(), bloco["stars"].to_numpy())
+        for coluna, sketch in sketches.items():
+            sketch.atualizar(bloco[coluna].to_numpy())
+        amostra = _atualizar_amostra(amostra, bloco, tamanho_amostra, rng)
+
+    n = momentos["commits"].n
+    densidades = None
+    if n > limite_pontos:
+        print(f"[RQ1] {n} pontos (> {limite_pontos}): gráficos em modo densidade")
+        bordas_stars = bordas_densidade(sketches["stars"].maximo)
+        densidades = {c: (bordas_densidade(sketches[c].maximo), bordas_stars, 0) for c in momentos}
+
+    postos = {"commits": MomentosBivariados(), "contributors": MomentosBivariados()}
+    for bloco in ler_blocos_rq1(tamanho_bloco):
+        posto_stars = sketches["stars"].posto_medio(bloco["stars"].to_numpy())
+        for coluna, mom in postos.items():
+            mom.atualizar(sketches[coluna].posto_medio(bloco[coluna].to_numpy()), posto_stars)
+        for coluna, (bordas_x, bordas_stars, contagem) in (densidades or {}).items():
+            contagem = contagem + histograma_rq1(bloco[coluna], bloco["stars"], bordas_x, bordas_stars)
+            densidades[coluna] = (bordas_x, bordas_stars, contagem)
+
+    erro_spearman = 12 * erro_posto_kll(k) * (1 + erro_posto_kll(k))
+    resultados, retas = {}, {}
+    for coluna in ["commits", "contributors"]:
+        r, rho = momentos[coluna].correlacao(), postos[coluna].correlacao()
+        print(f"Pearson (stars x {coluna}): r={r:.3f}, p={p_valor_correlacao(r, n):.3e}")
+        print(f"Spearman (stars x {coluna}): rho={rho:.3f} (aproximado, erro <= {erro_spearman:.3f}), "
+              f"p={p_valor_correlacao(rho, n):.3e}")
+        m, b = momentos[coluna].regressao()
+        retas[coluna] = (m, b, momentos[coluna].min_x, momentos[coluna].max_x)
+        resultados[f"pearson_stars_{coluna}"] = r
+        resultados[f"spearman_stars_{coluna}"] = rho
+        resultados[f"regression_{coluna}"] = {"slope": m, "intercept": b}
+
+    graficos_rq1(amostra.drop(columns="_chave"), retas, densidades)
+    resultados["streaming"] = {"n": int(n), "tamanho_bloco": tamanho_bloco, "k": k,
+                               "spearman_erro_maximo": erro_spearman,
+                               "pontos_nos_graficos": int(n if densidades else len(amostra))}
+    return resultados
+
+# colunas usadas pelo gráfico interativo da RQ1
+COLUNAS_RQ1_INTERATIVO = ["stars", "commits", "contributors", "linguagem", "full_name", "forks"]
+
+def grafico_rq1_interativo(df):
+    sub = df.dropna(subset=["stars", "commits", "contributors"])
 
     # Plotly interativo (stars x commits colorizado por linguagem)
     try:
@@ -100,42 +299,20 @@ def analisar_rq1(df):
     except Exception as e:
         print(f"[RQ1] Falha ao gerar gráfico interativo: {e}")
 
-    return {
-        "pearson_stars_commits": pearson_commits[0],
-        "spearman_stars_commits": spearman_commits.correlation,
-        "pearson_stars_contributors": pearson_contrib[0],
-        "spearman_stars_contributors": spearman_contrib.correlation,
-        "regression_commits": {"slope": float(m), "intercept": float(b)},
-        "regression_contributors": {"slope": float(m2), "intercept": float(b2)},
-    }
-
 # ===========================================================
 # RQ2: Taxa de resolução de issues por linguagem
 # ===========================================================
 
-def analisar_rq2(df):
-    print("\n[RQ2] Iniciando análise: Taxa de resolução de issues por linguagem")
+# linguagens com menos repositórios que isto ficam fora da RQ2 (estabilidade)
+MINIMO_REPOSITORIOS_RQ2 = 10
 
-    # Filtrar linguagens com número mínimo de repositórios para estabilidade (ex.: >= 10)
-    contagem = df["linguagem"].value_counts()
-    linguagens_validas = contagem[contagem >= 10].index.tolist()
-    sub = df[df["linguagem"].isin(linguagens_validas)].dropna(subset=["taxa_resolucao_issues"])
-
-    # Ordenar linguagens pela mediana da taxa de resolução
-    order = sub.groupby("linguagem")["taxa_resolucao_issues"].median().sort_values(ascending=False).index
-
-    plt.figure(figsize=(10, 6))
-    sub_sorted = sub.copy()
-    sub_sorted["linguagem"] = pd.Categorical(sub_sorted["linguagem"], categories=order, ordered=True)
-    sub_sorted = sub_sorted.sort_values("linguagem")
-
-    # Gerar o boxplot (sem o argumento 'order', que causava erro)
-    sub_sorted.boxplot(column="taxa_resolucao_issues", by="linguagem", grid=False, rot=45)
 
+def _salvar_boxplot_rq2():
+    """Títulos e gravação do boxplot da RQ2 desenhado na figura atual"""
     plt.suptitle("")
     plt.title("Taxa de resolução de issues por linguagem")
     plt.xlabel("Linguagem")
-    plt.ylabel("Taxa de resolução (issues fechadas / abertas)")
+    plt.ylabel("Taxa de resolução (issues fechadas / total de issues)")
     plt.tight_layout()
 
     # Salvar gráfico
@@ -144,34 +321,243 @@ def analisar_rq2(df):
     plt.close()
     print(f"[RQ2] Boxplot salvo em {path_box}")
 
-    # Teste estatístico: Kruskal-Wallis (não-paramétrico) entre os grupos
-    grupos = [g["taxa_resolucao_issues"].dropna().values for _, g in sub.groupby("linguagem")]
+
+def analisar_rq2(df, approx_quantiles=False, correcao="holm"):
+    """
+    RQ2. Com approx_quantiles, medianas e quartis (ordem, boxplot e resumo) vêm de um sketch
+    KLL por linguagem, alimentado pelos dados já em memória (df inteiro é necessário de todo
+    modo: os testes continuam exatos e dependem dos postos). Para memória constante, sem os
+    testes, ver analisar_rq2_streaming.
+    Kruskal-Wallis e o pós-teste de Dunn (todos os pares, p-valores corrigidos por 'correcao')
+    saem de uma única ordenação da amostra conjunta (posthoc.py)
+    """
+    print("\n[RQ2] Iniciando análise: Taxa de resolução de issues por linguagem")
+
+    # Filtrar linguagens com número mínimo de repositórios para estabilidade (ex.: >= 10)
+    contagem = df["linguagem"].value_counts()
+    linguagens_validas = contagem[contagem >= MINIMO_REPOSITORIOS_RQ2].index.tolist()
+    sub = df[df["linguagem"].isin(linguagens_validas)].dropna(subset=["taxa_resolucao_issues"])
+
+    # Ordenar linguagens pela mediana da taxa de resolução
+    if approx_quantiles:
+        sketches = sketches_em_blocos(sub["linguagem"].astype(str), sub["taxa_resolucao_issues"])
+        medianas = sketches.quantis([0.5])[0.5].sort_values(ascending=False, kind="stable")
+        order = medianas.index
+    else:
+        order = sub.groupby("linguagem", observed=True)["taxa_resolucao_issues"].median().sort_values(ascending=False).index
+
+    plt.figure(figsize=(10, 6))
+    if approx_quantiles:
+        # boxplot a partir dos quartis/bigodes estimados (sem os pontos atípicos)
+        plt.gca().bxp(estatisticas_bxp(sketches.resumos_boxplot(order)), showfliers=False)
+        plt.xticks(rotation=45)
+    else:
+        sub_sorted = sub.copy()
+        sub_sorted["linguagem"] = pd.Categorical(sub_sorted["linguagem"].astype(str), categories=list(order), ordered=True)
+        sub_sorted = sub_sorted.sort_values("linguagem")
+
+        # Gerar o boxplot (sem o argumento 'order', que causava erro)
+        sub_sorted.boxplot(column="taxa_resolucao_issues", by="linguagem", grid=False, rot=45)
+    _salvar_boxplot_rq2()
+
+    # Teste estatístico: Kruskal-Wallis (não-paramétrico) entre os grupos e pós-teste de Dunn
+    postos = PostosAgrupados(sub["taxa_resolucao_issues"].to_numpy(), sub["linguagem"].astype(str).to_numpy(),
+                             ordem_grupos=[str(l) for l in order])
     kw_stat, kw_p = None, None
-    if len(grupos) >= 2:
-        kw_stat, kw_p = stats.kruskal(*grupos)
+    if len(postos.por_grupo) >= 2:
+        kw_stat, kw_p = postos.kruskal()
         print(f"[RQ2] Kruskal-Wallis: stat={kw_stat:.3f}, p={kw_p:.3e}")
     else:
         print("[RQ2] Poucos grupos válidos para teste estatístico (menos de 2 linguagens).")
 
+    # Dunn: matriz linguagem x linguagem de p-valores ajustados + tabela longa com z e efeito r
+    pares, matriz = postos.dunn(correcao)
+    matriz_path = os.path.join(OUTPUT_DIR, "rq2_dunn_p_ajustado_por_linguagem.csv")
+    pares_path = os.path.join(OUTPUT_DIR, "rq2_dunn_pares.csv")
+    matriz.to_csv(matriz_path)
+    pares.to_csv(pares_path, index=False)
+    significativos = int((pares["p_ajustado"] < 0.05).sum())
+    print(f"[RQ2] Dunn ({correcao}): {significativos} de {len(pares)} pares com p ajustado < 0.05; "
+          f"matriz salva em {matriz_path}")
+
     # Resumo por linguagem (média, mediana, etc.)
-    resumo = sub.groupby("linguagem")["taxa_resolucao_issues"].agg(["count", "mean", "median", "std"]).sort_values("median", ascending=False)
+    if approx_quantiles:
+        resumo = sub.groupby(sub["linguagem"].astype(str))["taxa_resolucao_issues"].agg(["count", "mean", "std"])
+        resumo.insert(2, "median", medianas)
+        resumo = resumo.loc[order]
+    else:
+        resumo = sub.groupby("linguagem", observed=True)["taxa_resolucao_issues"].agg(["count", "mean", "median", "std"]).sort_values("median", ascending=False)
     resumo_path = os.path.join(OUTPUT_DIR, "rq2_resumo_taxa_resolucao_por_linguagem.csv")
     resumo.to_csv(resumo_path)
     print(f"[RQ2] Resumo salvo em {resumo_path}")
 
-    return {"kruskal_stat": kw_stat, "kruskal_p": kw_p, "resumo_csv": resumo_path}
+    return {"kruskal_stat": kw_stat, "kruskal_p": kw_p, "resumo_csv": resumo_path,
+            "dunn_correcao": correcao, "dunn_pares_significativos": significativos,
+            "dunn_matriz_csv": matriz_path, "dunn_pares_csv": pares_path}
+
+# ----- RQ2 em streaming (quantis aproximados, memória constante por linguagem) -----
+def ler_blocos_rq2(tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    Blocos (linguagem, taxa_resolucao_issues) lidos do disco, só com as colunas necessárias;
+    se o arquivo não tiver a taxa, ela é calculada bloco a bloco das contagens (metricas.py)
+    """
+    taxa = "issue_resolution_rate"
+    entradas = [taxa] if taxa in set(colunas_disponiveis(csv_path)) else entradas_metrica(taxa)
+    for bloco in ler_em_blocos(csv_path, colunas=["language", *entradas], nao_nulos=["language"],
+                               tamanho_bloco=tamanho_bloco):
+        bloco = calcular_metricas(bloco, [taxa], somente_ausentes=True)[["language", taxa]]
+        yield bloco.rename(columns=RENOMEAR).dropna(subset=["taxa_resolucao_issues"])
+
+def analisar_rq2_streaming(tamanho_bloco=TAMANHO_BLOCO_PADRAO, k=K_PADRAO):
+    """
+    RQ2 lendo o dataset em blocos: um sketch KLL e os momentos (n, média, m2; estatistica_online.py)
+    por linguagem, então a memória é a de um bloco mais O(k) por linguagem. Medianas, quartis e
+    bigodes são aproximados (erro de posto <= erro_posto_kll(k)); contagem, média e desvio são exatos.
+    Kruskal-Wallis e Dunn precisam dos postos da amostra inteira e não são calculados.
+    """
+    print(f"\n[RQ2] Iniciando análise em streaming (blocos de {tamanho_bloco} linhas, sketches KLL k={k})")
+    sketches = SketchesPorGrupo(k)
+    momentos = MomentosPorGrupo()
+    for bloco in ler_blocos_rq2(tamanho_bloco):
+        linguagens, valores = bloco["linguagem"].astype(str), bloco["taxa_resolucao_issues"]
+        sketches.atualizar(linguagens, valores)
+        momentos.atualizar(linguagens, valores)
+
+    validas = momentos.tabela.index[momentos.tabela["n"] >= MINIMO_REPOSITORIOS_RQ2]
+    if len(validas) == 0:
+        raise ValueError(f"Nenhuma linguagem com ao menos {MINIMO_REPOSITORIOS_RQ2} repositórios com taxa de "
+                         f"resolução em {csv_path}; RQ2 não calculada.")
+    medianas = sketches.quantis([0.5], validas)[0.5].sort_values(ascending=False, kind="stable")
+    order = medianas.index
+
+    plt.figure(figsize=(10, 6))
+    plt.gca().bxp(estatisticas_bxp(sketches.resumos_boxplot(order)), showfliers=False)
+    plt.xticks(rotation=45)
+    _salvar_boxplot_rq2()
+    print("[WARN] Kruskal-Wallis e Dunn indisponíveis com --streaming (precisam dos postos de todos os dados); pulados.")
+
+    n = momentos.tabela.loc[order, "n"]
+    resumo = pd.DataFrame({"count": n.astype(int), "mean": momentos.tabela.loc[order, "media"], "median": medianas,
+                           "std": np.sqrt(momentos.variancia().loc[order])})
+    resumo.index.name = "linguagem"
+    resumo_path = os.path.join(OUTPUT_DIR, "rq2_resumo_taxa_resolucao_por_linguagem.csv")
+    resumo.to_csv(resumo_path)
+    print(f"[RQ2] Resumo salvo em {resumo_path}")
+    return {"kruskal_stat": None, "kruskal_p": None, "resumo_csv": resumo_path,
+            "streaming": {"n": int(n.sum()), "tamanho_bloco": tamanho_bloco, "k": k,
+                          "erro_posto_maximo": erro_posto_kll(k)}}
 
 # ===========================================================
 # Execução principal
 # ===========================================================
 
-if __name__ == "__main__":
+def resumo_correlacoes(matrizes, caminho):
+    """Matrizes de correlação entre todas as métricas numéricas, no formato do resumo_rqs.json"""
+    print("\n[INFO] Matrizes de correlação (Pearson e Spearman) entre as métricas numéricas")
+    spearman_stars = matrizes["spearman"]["stars"].drop("stars").dropna() if "stars" in matrizes["spearman"] else None
+    if spearman_stars is not None and len(spearman_stars):
+        print(f"[OK] {len(matrizes['n'])} métricas; maior |Spearman| com stars: "
+              f"{spearman_stars.abs().idxmax()} ({spearman_stars[spearman_stars.abs().idxmax()]:.3f})")
+    resumo = {"arquivo": caminho, "colunas": list(matrizes["n"].columns)}
+    for nome in MATRIZES:
+        tabela = matrizes[nome].astype(object).where(matrizes[nome].notna(), None)
+        resumo[nome] = tabela.to_dict(orient="index")
+    return resumo
+
+def salvar_resumo(resultados, caminho):
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Análise das questões de pesquisa RQ1 e RQ2")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="regera todos os artefatos, ignorando o cache em outputs/.cache_artefatos")
+    parser.add_argument("--streaming", action="store_true",
+                        help="RQ1 (e a RQ2, com --approx-quantiles) lendo o dataset em blocos "
+                             "(para datasets maiores que a memória)")
+    parser.add_argument("--chunk-size", type=inteiro_positivo, default=TAMANHO_BLOCO_PADRAO,
+                        help=f"linhas por bloco no modo --streaming (padrão: {TAMANHO_BLOCO_PADRAO})")
+    parser.add_argument("--bootstrap", type=int, default=REAMOSTRAGENS_PADRAO,
+                        help=f"reamostragens para os intervalos de confiança da RQ1 (padrão: {REAMOSTRAGENS_PADRAO}; 0 desativa)")
+    parser.add_argument("--workers", type=inteiro_positivo, default=None,
+                        help="número de processos usados no bootstrap (padrão: número de CPUs)")
+    parser.add_argument("--posthoc-correction", choices=CORRECOES, default="holm",
+                        help="correção de comparações múltiplas do pós-teste de Dunn da RQ2 (padrão: holm)")
+    parser.add_argument("--max-points", type=int, default=LIMITE_PONTOS_DISPERSAO,
+                        help=f"acima deste número de linhas os gráficos da RQ1 mostram densidade 2D (padrão: {LIMITE_PONTOS_DISPERSAO})")
+    parser.add_argument("--approx-quantiles", action="store_true",
+                        help="RQ2 com medianas e quartis estimados por sketches KLL; com --streaming a RQ2 lê "
+                             "o dataset em blocos (memória constante por linguagem) e pula Kruskal-Wallis/Dunn")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(csv_path) and not os.path.exists(caminho_colunar(csv_path)):
+        raise FileNotFoundError(f"Arquivo {csv_path} não encontrado! Verifique se o CSV foi gerado corretamente.")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # cada etapa só é refeita se as colunas de entrada ou o código mudarem
+    cache = CacheArtefatos(os.path.join(OUTPUT_DIR, PASTA_CACHE), ativo=not args.no_cache)
+    saidas = lambda *nomes: [os.path.join(OUTPUT_DIR, n) for n in nomes]
+
     resultados = {}
-    resultados["rq1"] = analisar_rq1(df)
-    resultados["rq2"] = analisar_rq2(df)
+    # cada análise lê apenas as colunas de que precisa
+    saidas_rq1 = saidas(*[arquivo for _, _, arquivo, _ in GRAFICOS_RQ1])
+    if args.streaming:
+        # sem carregar o dataset: a chave do cache é o conteúdo do arquivo lido
+        resultados["rq1"] = cache.executar(
+            "rq1_streaming", saidas_rq1, partial(analisar_rq1_streaming, args.chunk_size, limite_pontos=args.max_points),
+            funcao=[analisar_rq1_streaming, ler_blocos_rq1, graficos_rq1, bordas_densidade, histograma_rq1,
+                    _desenhar_densidade],
+            parametros={"arquivo": hash_arquivo(arquivo_de_leitura(csv_path)), "tamanho_bloco": args.chunk_size,
+                        "limite_pontos": args.max_points, "bins_densidade": BINS_DENSIDADE})
+        if args.bootstrap:
+            print("[WARN] Bootstrap da RQ1 indisponível com --streaming (precisa dos dados em memória); pulado.")
+    else:
+        df_rq1 = carregar_dataset(COLUNAS_RQ1)
+        resultados["rq1"] = cache.executar(
+            "rq1", saidas_rq1, partial(analisar_rq1, df_rq1, args.max_points), dados=df_rq1,
+            funcao=[analisar_rq1, graficos_rq1, bordas_densidade, histograma_rq1, _desenhar_densidade],
+            parametros={"limite_pontos": args.max_points, "bins_densidade": BINS_DENSIDADE})
+        if args.bootstrap:
+            # o número de processos não muda o resultado (cada lote tem sua própria seed)
+            intervalos = cache.executar(
+                "rq1_bootstrap", [], partial(bootstrap_rq1, df_rq1, args.bootstrap, args.workers), dados=df_rq1,
+                funcao=[bootstrap_rq1, intervalos_bootstrap, reamostrar, estimar_lote, postos_ponderados, preparar_dados],
+                parametros={"reamostragens": args.bootstrap})
+            resultados["rq1"] = {**resultados["rq1"], "bootstrap": intervalos}
+    df_interativo = carregar_dataset(COLUNAS_RQ1_INTERATIVO)
+    cache.executar("rq1_interativo", saidas("rq1_stars_x_commits_interactive.html"),
+                   partial(grafico_rq1_interativo, df_interativo), dados=df_interativo, funcao=grafico_rq1_interativo)
+    if args.streaming and args.approx_quantiles:
+        resultados["rq2"] = cache.executar(
+            "rq2_streaming", saidas("rq2_taxa_resolucao_boxplot.png", "rq2_resumo_taxa_resolucao_por_linguagem.csv"),
+            partial(analisar_rq2_streaming, args.chunk_size),
+            funcao=[analisar_rq2_streaming, ler_blocos_rq2, _salvar_boxplot_rq2, SketchesPorGrupo, MomentosPorGrupo,
+                    estatisticas_bxp],
+            parametros={"arquivo": hash_arquivo(arquivo_de_leitura(csv_path)), "tamanho_bloco": args.chunk_size})
+    else:
+        df_rq2 = carregar_dataset(["linguagem", "taxa_resolucao_issues"])
+        resultados["rq2"] = cache.executar(
+            "rq2", saidas("rq2_taxa_resolucao_boxplot.png", "rq2_resumo_taxa_resolucao_por_linguagem.csv",
+                          "rq2_dunn_p_ajustado_por_linguagem.csv", "rq2_dunn_pares.csv"),
+            partial(analisar_rq2, df_rq2, args.approx_quantiles, args.posthoc_correction), dados=df_rq2,
+            funcao=[analisar_rq2, _salvar_boxplot_rq2, PostosAgrupados, ajustar_p_valores, sketches_em_blocos,
+                    estatisticas_bxp],
+            parametros={"approx_quantiles": args.approx_quantiles, "correcao": args.posthoc_correction})
+
+    # RQ1.3: correlações entre todas as métricas numéricas (as mesmas do heatmap do dashboard)
+    if args.streaming:
+        print("[WARN] Matrizes de correlação indisponíveis com --streaming (precisam dos dados em memória); puladas.")
+    else:
+        correlacoes_path = os.path.join(OUTPUT_DIR, "correlacoes_metricas.json")
+        matrizes = obter_correlacoes(carregar_dataset(), correlacoes_path, cache)
+        resultados["correlacoes"] = resumo_correlacoes(matrizes, correlacoes_path)
 
     resumo_json_path = os.path.join(OUTPUT_DIR, "resumo_rqs.json")
-    with open(resumo_json_path, "w", encoding="utf-8") as f:
-        json.dump(resultados, f, indent=2)
+    cache.executar("resumo_rqs", [resumo_json_path], partial(salvar_resumo, resultados, resumo_json_path),
+                   funcao=salvar_resumo, parametros=resultados)
     print(f"\n[CONCLUÍDO] RQ1 e RQ2 processadas. Resumo salvo em {resumo_json_path}")
     print("Arquivos gerados estão em 'outputs/'. Use-os no dashboard e no artigo (Seção 4: Resultados).")
+
+
+if __name__ == "__main__":
+    main()
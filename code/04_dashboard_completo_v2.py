@@ -1,27 +1,113 @@
 """
 Dashboard Completo V2 - Sem iframes
 Incorpora os gráficos diretamente no HTML para evitar problemas de CORS
+Importar o módulo não gera nada: o trabalho fica em main(), e pandas, numpy, scipy e plotly
+só são carregados quando usados (adiado.py)
 """
 
-import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import json
+import os
+import argparse
+from functools import partial
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import plotly.express as px
-from scipy import stats
-import numpy as np
 
+from adiado import ModuloAdiado
+from argumentos import inteiro_positivo
+from cache_artefatos import PASTA_PADRAO as PASTA_CACHE, CacheArtefatos
+from caminhos import CUBO, DASHBOARD, DATASET_REPOSITORIOS, OUTPUT_DIR
+from cubo import CuboAgregado, construir_cubo, obter_cubo
+from esquema import carregar_repositorios
+from geracao_paralela import contexto_processos
+from html_compacto import PLOTLY_CDN, TabelaDados, gravar_gzip, scripts_cabecalho, trecho_grafico
+from memoria_compartilhada import anexar_dataframe, publicar_dataframe
 
-def criar_todos_graficos(df):
-    """Cria todos os gráficos e retorna como HTML"""
-    
-    graficos = {}
-    
-    # ========== CARACTERIZAÇÃO ==========
-    
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+stats = ModuloAdiado("scipy.stats")
+go = ModuloAdiado("plotly.graph_objects")
+px = ModuloAdiado("plotly.express")
+subplots = ModuloAdiado("plotly.subplots")
+
+# colunas do dataset usadas pelo dashboard (as demais não são lidas)
+COLUNAS_DASHBOARD = ['repositorio', 'linguagem', 'stars', 'forks', 'commits', 'contributors',
+                     'pull_requests', 'taxa_resolucao_issues', 'idade_dias', 'created_at',
+                     'tem_readme', 'tem_wiki', 'licenca', 'categoria']
+
+# ----- Modo para N grande -----
+# Os scatters do plotly express já usam WebGL (scattergl) acima de 1000 pontos; acima de
+# limite_pontos (--max-points) os gráficos que desenham um ponto por repositório passam a
+# mostrar densidade 2D (scatters) ou apenas o resumo da distribuição (violin de RQ2.2),
+# para que o HTML e o navegador continuem leves com centenas de milhares de linhas
+LIMITE_PONTOS = 100_000
+BINS_DENSIDADE = 80
+
+
+def _bordas(valores, n_bins, log):
+    minimo, maximo = valores.min(), valores.max()
+    if log:
+        maximo = max(maximo, minimo * 10)
+        return np.geomspace(minimo, maximo, n_bins + 1)
+    maximo = max(maximo, minimo + 1)
+    return np.linspace(minimo, maximo, n_bins + 1)
+
+
+def _centros(bordas, log):
+    return np.sqrt(bordas[:-1] * bordas[1:]) if log else (bordas[:-1] + bordas[1:]) / 2
+
+
+def fig_densidade(df, x, y, titulo, log_x=False, log_y=False, n_bins=BINS_DENSIDADE):
+    """
+    Histograma 2D (repositórios por célula) no lugar de um scatter com um ponto por linha.
+    Em eixos log os bins são geométricos; valores <= 0 ficam de fora, como no scatter em log.
+    A cor usa log10 da contagem para que regiões esparsas continuem visíveis.
+    """
+    vx = df[x].to_numpy(dtype=np.float64, na_value=np.nan)
+    vy = df[y].to_numpy(dtype=np.float64, na_value=np.nan)
+    validos = np.isfinite(vx) & np.isfinite(vy)
+    if log_x:
+        validos &= vx > 0
+    if log_y:
+        validos &= vy > 0
+    vx, vy = vx[validos], vy[validos]
+
+    fig = go.Figure()
+    if len(vx):
+        bordas_x, bordas_y = _bordas(vx, n_bins, log_x), _bordas(vy, n_bins, log_y)
+        contagem, _, _ = np.histogram2d(vx, vy, bins=[bordas_x, bordas_y])
+        contagem = contagem.T  # linhas = y, colunas = x
+        with np.errstate(divide='ignore'):
+            z = np.where(contagem > 0, np.log10(contagem), np.nan)
+        maximo = int(np.ceil(np.nanmax(z)))
+        fig.add_trace(go.Heatmap(
+            x=_centros(bordas_x, log_x), y=_centros(bordas_y, log_y), z=z,
+            customdata=contagem.astype(np.int64), colorscale='Viridis',
+            colorbar=dict(title='Repositórios', tickvals=list(range(maximo + 1)),
+                          ticktext=[f'{10 ** i:,}' for i in range(maximo + 1)]),
+            hovertemplate=f'{x}: %{{x:,.0f}}<br>{y}: %{{y:,.0f}}<br>repositórios: %{{customdata:,}}<extra></extra>'))
+    fig.update_xaxes(title=x, type='log' if log_x else 'linear')
+    fig.update_yaxes(title=y, type='log' if log_y else 'linear')
+    fig.update_layout(title=f'{titulo} (densidade de {len(vx):,} repositórios)', height=600)
+    return fig
+
+
+def _amostra_por_grupo(df, coluna, limite_pontos, seed=42):
+    """Amostra de no máximo limite_pontos linhas, proporcional ao tamanho de cada grupo de 'coluna'"""
+    fracao = min(1.0, limite_pontos / max(len(df), 1))
+    return df.groupby(coluna, observed=True, group_keys=False).sample(frac=fracao, random_state=seed)
+
+
+# ========== CARACTERIZAÇÃO ==========
+
+def _contagem_decrescente(cubo, dimensao):
+    # mesma ordem de df[dimensao].value_counts()
+    return cubo.contagem([dimensao]).sort_values(ascending=False, kind='stable').reset_index()
+
+
+def fig_distribuicao_linguagens(cubo):
     # 1. Distribuição de linguagens
-    lang_counts = df['linguagem'].value_counts().reset_index()
+    lang_counts = _contagem_decrescente(cubo, 'linguagem')
     lang_counts.columns = ['Linguagem', 'Quantidade']
     fig = px.bar(lang_counts, x='Linguagem', y='Quantidade',
                  title='Distribuição de Repositórios por Linguagem de Programação',
@@ -29,172 +115,409 @@ def criar_todos_graficos(df):
     fig.update_traces(texttemplate='%{text}', textposition='outside')
     fig.update_layout(xaxis_title='Linguagem de Programação', yaxis_title='Número de Repositórios',
                      showlegend=False, height=500)
-    graficos['viz1'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_popularidade_por_linguagem(cubo):
     # 2. Métricas de popularidade
-    metricas = df.groupby('linguagem').agg({'stars': 'median', 'forks': 'median', 'contributors': 'median'}).reset_index()
+    metricas = cubo.agregar(['linguagem'], {'stars': 'median', 'forks': 'median', 'contributors': 'median'}).reset_index()
     fig = go.Figure()
     fig.add_trace(go.Bar(name='Stars', x=metricas['linguagem'], y=metricas['stars'], marker_color='gold'))
     fig.add_trace(go.Bar(name='Forks', x=metricas['linguagem'], y=metricas['forks'], marker_color='lightblue'))
     fig.add_trace(go.Bar(name='Contributors', x=metricas['linguagem'], y=metricas['contributors'], marker_color='lightgreen'))
     fig.update_layout(title='Métricas de Popularidade por Linguagem (Mediana)', barmode='group', height=500)
-    graficos['viz2'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_stars_por_linguagem(df):
     # 3. Distribuição de stars
     fig = px.box(df, x='linguagem', y='stars', title='Distribuição de Stars por Linguagem',
                 color='linguagem', log_y=True)
     fig.update_layout(showlegend=False, height=500)
-    graficos['viz3'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_timeline(cubo):
     # 4. Timeline
-    df_temp = df.copy()
-    df_temp['ano_mes'] = pd.to_datetime(df['created_at']).dt.to_period('M')
-    timeline = df_temp.groupby(['ano_mes', 'linguagem']).size().reset_index(name='quantidade')
+    timeline = cubo.contagem(['mes', 'linguagem']).reset_index(name='quantidade')
+    timeline = timeline.rename(columns={'mes': 'ano_mes'})
     timeline['ano_mes'] = timeline['ano_mes'].astype(str)
     fig = px.line(timeline, x='ano_mes', y='quantidade', color='linguagem',
                  title='Timeline de Criação de Repositórios por Linguagem', markers=True)
     fig.update_layout(height=500, xaxis={'tickangle': -45})
-    graficos['viz4'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_atividade(df, limite_pontos=LIMITE_PONTOS):
     # 5. Atividade
+    titulo = 'Atividade dos Repositórios: Commits vs Idade'
+    if len(df) > limite_pontos:
+        return fig_densidade(df, 'idade_dias', 'commits', titulo, log_y=True)
     fig = px.scatter(df, x='idade_dias', y='commits', color='linguagem', size='contributors',
-                    hover_data=['repositorio', 'stars'], title='Atividade dos Repositórios: Commits vs Idade',
+                    hover_data=['repositorio', 'stars'], title=titulo,
                     log_y=True)
     fig.update_layout(height=600)
-    graficos['viz5'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_licencas(cubo):
     # 6. Licenças
-    licencas = df['licenca'].value_counts().reset_index()
+    licencas = _contagem_decrescente(cubo, 'licenca')
     licencas.columns = ['Licença', 'Quantidade']
     fig = px.pie(licencas, values='Quantidade', names='Licença',
                 title='Distribuição de Licenças nos Repositórios', hole=0.3)
     fig.update_traces(textposition='inside', textinfo='percent+label')
     fig.update_layout(height=500)
-    graficos['viz6'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_categorias(cubo):
     # 7. Categorias
-    categorias = df['categoria'].value_counts().reset_index()
+    categorias = _contagem_decrescente(cubo, 'categoria')
     categorias.columns = ['Categoria', 'Quantidade']
     fig = px.bar(categorias, x='Quantidade', y='Categoria', orientation='h',
                 title='Distribuição de Repositórios por Categoria', color='Quantidade',
                 color_continuous_scale='Blues', text='Quantidade')
     fig.update_traces(texttemplate='%{text}', textposition='outside')
     fig.update_layout(showlegend=False, height=500)
-    graficos['viz7'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
-    # ========== RQs ==========
-    
+    return fig
+
+
+# ========== RQs ==========
+
+def fig_stars_vs_commits(df, limite_pontos=LIMITE_PONTOS):
     # RQ1.1: Stars vs Commits
+    titulo = 'RQ1.1: Relação entre Stars e Commits'
+    if len(df) > limite_pontos:
+        return fig_densidade(df, 'commits', 'stars', titulo, log_x=True, log_y=True)
     fig = px.scatter(df, x='commits', y='stars', color='linguagem', size='contributors',
-                    hover_data=['repositorio'], title='RQ1.1: Relação entre Stars e Commits',
+                    hover_data=['repositorio'], title=titulo,
                     log_x=True, log_y=True)
     fig.update_layout(height=600)
-    graficos['rq1'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_stars_vs_contributors(df, limite_pontos=LIMITE_PONTOS):
     # RQ1.2: Stars vs Contributors
+    titulo = 'RQ1.2: Relação entre Stars e Contributors'
+    if len(df) > limite_pontos:
+        return fig_densidade(df, 'contributors', 'stars', titulo, log_x=True, log_y=True)
     fig = px.scatter(df, x='contributors', y='stars', color='linguagem', size='commits',
-                    hover_data=['repositorio'], title='RQ1.2: Relação entre Stars e Contributors',
+                    hover_data=['repositorio'], title=titulo,
                     log_x=True, log_y=True)
     fig.update_layout(height=600)
-    graficos['rq2'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
-    # RQ1.3: Matriz de correlação
+    return fig
+
+
+def fig_caixas_do_cubo(cubo, dimensao, metrica, titulo, altura, log_y=False, cores=None):
+    """Boxplot por grupo desenhado a partir dos quartis e bigodes do cubo (sem pontos atípicos)"""
+    caixas = cubo.caixas(dimensao, metrica)
+    fig = go.Figure()
+    for grupo, caixa in caixas.iterrows():
+        fig.add_trace(go.Box(name=str(grupo), x=[str(grupo)], q1=[caixa['q1']], median=[caixa['mediana']],
+                             q3=[caixa['q3']], lowerfence=[caixa['bigode_inferior']],
+                             upperfence=[caixa['bigode_superior']],
+                             marker_color=cores.get(str(grupo)) if cores else None))
+    fig.update_layout(title=f'{titulo} (quartis aproximados)', showlegend=False, height=altura,
+                      xaxis_title=dimensao, yaxis_title=metrica)
+    if log_y:
+        fig.update_yaxes(type='log')
+    return fig
+
+
+def fig_matriz_correlacao(cubo):
+    # RQ1.3: Matriz de correlação (Pearson e Spearman, com p-valores, calculadas no cubo)
+
     metricas_correlacao = ['stars', 'forks', 'commits', 'contributors', 'pull_requests']
-    corr_matrix = df[metricas_correlacao].corr()
-    fig = go.Figure(data=go.Heatmap(z=corr_matrix.values, x=metricas_correlacao, y=metricas_correlacao,
-                                    colorscale='RdBu', zmid=0, text=corr_matrix.values.round(2),
-                                    texttemplate='%{text}', textfont={"size": 12}))
-    fig.update_layout(title='RQ1.3: Matriz de Correlação', height=600, width=700)
-    graficos['rq3'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    fig = subplots.make_subplots(rows=1, cols=2, subplot_titles=['Pearson', 'Spearman'], horizontal_spacing=0.15)
+    for coluna, metodo in enumerate(['pearson', 'spearman'], start=1):
+        corr_matrix = cubo.correlacoes[metodo].loc[metricas_correlacao, metricas_correlacao]
+        p_valores = cubo.correlacoes[f'{metodo}_p'].loc[metricas_correlacao, metricas_correlacao]
+        fig.add_trace(go.Heatmap(z=corr_matrix.values, x=metricas_correlacao, y=metricas_correlacao,
+                                 colorscale='RdBu', zmid=0, zmin=-1, zmax=1, text=corr_matrix.values.round(2),
+                                 texttemplate='%{text}', textfont={"size": 12}, customdata=p_valores.values,
+                                 hovertemplate='%{y} x %{x}<br>r = %{z:.3f}<br>p = %{customdata:.2e}<extra></extra>',
+                                 showscale=coluna == 2),
+                      row=1, col=coluna)
+    fig.update_layout(title='RQ1.3: Matriz de Correlação', height=600, width=1200)
+    return fig
+
+
+def fig_resolucao_box(df):
     # RQ2.1: Taxa de resolução (box)
     fig = px.box(df, x='linguagem', y='taxa_resolucao_issues', color='linguagem',
                 title='RQ2.1: Taxa de Resolução de Issues por Linguagem', points='outliers')
     fig.update_layout(showlegend=False, height=600)
-    graficos['rq4'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_resolucao_violin(df, limite_pontos=LIMITE_PONTOS):
     # RQ2.2: Taxa de resolução (violin)
+    titulo = 'RQ2.2: Distribuição da Taxa de Resolução de Issues'
+    pontos = 'all'
+    if len(df) > limite_pontos:
+        # só o resumo (violin + box) estimado de uma amostra estratificada por linguagem
+        df = _amostra_por_grupo(df, 'linguagem', limite_pontos)
+        titulo += f' (amostra de {len(df):,} repositórios)'
+        pontos = False
     fig = px.violin(df, x='linguagem', y='taxa_resolucao_issues', color='linguagem', box=True,
-                   title='RQ2.2: Distribuição da Taxa de Resolução de Issues', points='all')
+                   title=titulo, points=pontos)
     fig.update_layout(showlegend=False, height=600)
-    graficos['rq5'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_resolucao_media(cubo):
     # RQ2.3: Taxa média
-    media = df.groupby('linguagem')['taxa_resolucao_issues'].agg(['mean', 'std']).reset_index()
+    media = cubo.agregar(['linguagem'], {'taxa_resolucao_issues': ['mean', 'std']})
+    media.columns = ['mean', 'std']
+    media = media.reset_index()
     fig = go.Figure()
     fig.add_trace(go.Bar(x=media['linguagem'], y=media['mean'],
                         error_y=dict(type='data', array=media['std']),
                         marker_color='steelblue', text=media['mean'].round(1),
                         texttemplate='%{text}%', textposition='outside'))
     fig.update_layout(title='RQ2.3: Taxa Média de Resolução de Issues', height=600)
-    graficos['rq6'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
-    # RQ3
+    return fig
+
+
+# RQ3
+CORES_DOCUMENTACAO = {'Nenhuma': 'red', 'README': 'orange', 'README + Wiki': 'green'}
+
+
+def _com_nivel_documentacao(df):
     df_temp = df.copy()
     df_temp['nivel_documentacao'] = 'Nenhuma'
     df_temp.loc[df_temp['tem_readme'] == True, 'nivel_documentacao'] = 'README'
     df_temp.loc[(df_temp['tem_readme'] == True) & (df_temp['tem_wiki'] == True), 'nivel_documentacao'] = 'README + Wiki'
-    
+    return df_temp
+
+
+def fig_documentacao_metricas(cubo):
     # RQ3.1: Comparação de métricas
-    fig = make_subplots(rows=2, cols=2, subplot_titles=('Stars', 'Forks', 'Contributors', 'Pull Requests'))
-    colors = {'Nenhuma': 'red', 'README': 'orange', 'README + Wiki': 'green'}
+
+    fig = subplots.make_subplots(rows=2, cols=2, subplot_titles=('Stars', 'Forks', 'Contributors', 'Pull Requests'))
+    colors = CORES_DOCUMENTACAO
     metricas = ['stars', 'forks', 'contributors', 'pull_requests']
     for idx, metrica in enumerate(metricas):
         row = idx // 2 + 1
         col = idx % 2 + 1
-        dados = df_temp.groupby('nivel_documentacao')[metrica].median().reset_index()
+        dados = cubo.quantil('nivel_documentacao', metrica, 'median').reset_index()
         fig.add_trace(go.Bar(x=dados['nivel_documentacao'], y=dados[metrica],
                             marker_color=[colors[x] for x in dados['nivel_documentacao']],
                             showlegend=False), row=row, col=col)
     fig.update_layout(title_text='RQ3.1: Métricas de Engajamento por Nível de Documentação', height=800)
-    graficos['rq7'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_documentacao_stars(df):
     # RQ3.2: Box plot
+    df_temp = _com_nivel_documentacao(df)
     fig = px.box(df_temp, x='nivel_documentacao', y='stars', color='nivel_documentacao',
                 title='RQ3.2: Distribuição de Stars por Nível de Documentação', log_y=True,
-                color_discrete_map=colors)
+                color_discrete_map=CORES_DOCUMENTACAO)
     fig.update_layout(showlegend=False, height=600)
-    graficos['rq8'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_metricas_por_licenca(cubo):
     # RQ4.1: Métricas por licença
-    medianas = df.groupby('licenca').agg({'stars': 'median', 'forks': 'median', 'contributors': 'median'}).reset_index()
+    medianas = cubo.agregar(['licenca'], {'stars': 'median', 'forks': 'median', 'contributors': 'median'}).reset_index()
     fig = go.Figure()
     fig.add_trace(go.Bar(name='Stars', x=medianas['licenca'], y=medianas['stars'], marker_color='gold'))
     fig.add_trace(go.Bar(name='Forks', x=medianas['licenca'], y=medianas['forks'], marker_color='lightblue'))
     fig.add_trace(go.Bar(name='Contributors', x=medianas['licenca'], y=medianas['contributors'], marker_color='lightgreen'))
     fig.update_layout(title='RQ4.1: Métricas por Tipo de Licença (Mediana)', barmode='group', height=600)
-    graficos['rq9'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_stars_por_licenca(df):
     # RQ4.2: Violin plot
     fig = px.violin(df, x='licenca', y='stars', color='licenca', box=True,
                    title='RQ4.2: Distribuição de Stars por Tipo de Licença', log_y=True, points='outliers')
     fig.update_layout(showlegend=False, height=600)
-    graficos['rq10'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
+    return fig
+
+
+def fig_popularidade_vs_contribuicao(df, limite_pontos=LIMITE_PONTOS):
     # RQ4.3: Scatter
+    titulo = 'RQ4.3: Popularidade vs Contribuição por Tipo de Licença'
+    if len(df) > limite_pontos:
+        return fig_densidade(df, 'stars', 'contributors', titulo, log_x=True, log_y=True)
     fig = px.scatter(df, x='stars', y='contributors', color='licenca', size='forks',
-                    hover_data=['repositorio'], title='RQ4.3: Popularidade vs Contribuição por Tipo de Licença',
+                    hover_data=['repositorio'], title=titulo,
                     log_x=True, log_y=True)
     fig.update_layout(height=600)
-    graficos['rq11'] = fig.to_html(full_html=False, include_plotlyjs=False)
-    
-    return graficos
+    return fig
 
 
-def gerar_dashboard_sem_iframes(df):
-    """Gera dashboard completo sem usar iframes"""
-    
-    print("\n[INFO] Gerando dashboard sem iframes (solucao para problemas de CORS)...")
-    
-    graficos = criar_todos_graficos(df)
-    
-    html = f"""<!DOCTYPE html>
+# chave no dashboard -> função que constrói a figura (na ordem em que aparecem na página)
+GRAFICOS = {
+    'viz1': fig_distribuicao_linguagens,
+    'viz2': fig_popularidade_por_linguagem,
+    'viz3': fig_stars_por_linguagem,
+    'viz4': fig_timeline,
+    'viz5': fig_atividade,
+    'viz6': fig_licencas,
+    'viz7': fig_categorias,
+    'rq1': fig_stars_vs_commits,
+    'rq2': fig_stars_vs_contributors,
+    'rq3': fig_matriz_correlacao,
+    'rq4': fig_resolucao_box,
+    'rq5': fig_resolucao_violin,
+    'rq6': fig_resolucao_media,
+    'rq7': fig_documentacao_metricas,
+    'rq8': fig_documentacao_stars,
+    'rq9': fig_metricas_por_licenca,
+    'rq10': fig_stars_por_licenca,
+    'rq11': fig_popularidade_vs_contribuicao,
+}
+
+
+# gráficos com um ponto por repositório, que mudam de forma acima de limite_pontos
+GRAFICOS_POR_PONTO = {'viz5', 'rq1', 'rq2', 'rq5', 'rq11'}
+# gráficos de contagens, médias, medianas e correlações, lidos do cubo de agregados (cubo.py)
+GRAFICOS_DO_CUBO = {'viz1', 'viz2', 'viz4', 'viz6', 'viz7', 'rq3', 'rq6', 'rq7', 'rq9'}
+# boxplots que, com approx_quantiles (--approx-quantiles), são desenhados a partir dos
+# quartis e bigodes do cubo (estimados por sketches KLL) em vez de ordenar todos os valores
+BOXPLOTS_DO_CUBO = {
+    'viz3': partial(fig_caixas_do_cubo, dimensao='linguagem', metrica='stars',
+                    titulo='Distribuição de Stars por Linguagem', altura=500, log_y=True),
+    'rq4': partial(fig_caixas_do_cubo, dimensao='linguagem', metrica='taxa_resolucao_issues',
+                   titulo='RQ2.1: Taxa de Resolução de Issues por Linguagem', altura=600),
+    'rq8': partial(fig_caixas_do_cubo, dimensao='nivel_documentacao', metrica='stars',
+                   titulo='RQ3.2: Distribuição de Stars por Nível de Documentação', altura=600, log_y=True,
+                   cores=CORES_DOCUMENTACAO),
+}
+
+
+def construir_figura(chave, df, limite_pontos=LIMITE_PONTOS, cubo=None, approx_quantiles=False):
+    """
+    Constrói a figura 'chave' de GRAFICOS (a partir do cubo, para GRAFICOS_DO_CUBO e, com
+    approx_quantiles, para BOXPLOTS_DO_CUBO)
+    """
+    if approx_quantiles and chave in BOXPLOTS_DO_CUBO:
+        return BOXPLOTS_DO_CUBO[chave](cubo if cubo is not None else construir_cubo(df, approx_quantiles=True))
+    if chave in GRAFICOS_DO_CUBO:
+        return GRAFICOS[chave](cubo if cubo is not None else construir_cubo(df))
+    if chave in GRAFICOS_POR_PONTO:
+        return GRAFICOS[chave](df, limite_pontos=limite_pontos)
+    return GRAFICOS[chave](df)
+
+
+def serializar_grafico(chave, df, limite_pontos=LIMITE_PONTOS, formato='html', cubo=None, approx_quantiles=False):
+    """
+    Constrói a figura 'chave' e a serializa: 'html' = trecho HTML (div com id fixo, sem
+    plotly.js); 'json' = fig.to_json(), usado pelo modo compacto (html_compacto.py)
+    """
+    fig = construir_figura(chave, df, limite_pontos, cubo, approx_quantiles)
+    if formato == 'json':
+        return fig.to_json()
+    return fig.to_html(full_html=False, include_plotlyjs=False, div_id=f'grafico-{chave}')
+
+
+# ----- Construção em paralelo (DataFrame em memória compartilhada) -----
+_DF_WORKER = None
+_SHM_WORKER = None
+_CUBO_WORKER = None
+
+
+def _iniciar_worker(descritor, cubo):
+    global _DF_WORKER, _SHM_WORKER, _CUBO_WORKER
+    _SHM_WORKER, _DF_WORKER = anexar_dataframe(descritor)
+    _CUBO_WORKER = cubo
+
+
+def _construir_no_worker(chave, limite_pontos, formato, approx_quantiles):
+    return chave, serializar_grafico(chave, _DF_WORKER, limite_pontos, formato, _CUBO_WORKER, approx_quantiles)
+
+
+def iterar_graficos(df, paralelo=False, processos=None, limite_pontos=LIMITE_PONTOS, formato='html', cubo=None,
+                    approx_quantiles=False):
+    """
+    Gerador de (chave, gráfico serializado) na ordem de GRAFICOS, um por vez, para que o
+    dashboard possa ser gravado sem manter todas as figuras em memória.
+
+    Com paralelo=True as figuras são construídas e serializadas em um pool de processos;
+    o DataFrame é publicado uma única vez em memória compartilhada e cada worker o
+    reconstrói ao iniciar, em vez de recebê-lo serializado a cada tarefa. No máximo
+    2 x processos gráficos ficam prontos aguardando gravação. O resultado é idêntico ao
+    do modo sequencial.
+
+    Com mais de limite_pontos linhas, os gráficos de GRAFICOS_POR_PONTO usam densidade 2D
+    ou resumo em vez de um ponto por repositório. Os de GRAFICOS_DO_CUBO leem 'cubo'
+    (construído aqui a partir de df se não for informado; é pequeno e vai por cópia aos workers).
+    Com approx_quantiles, os boxplots de BOXPLOTS_DO_CUBO também saem do cubo.
+    """
+    cubo = cubo if cubo is not None else construir_cubo(df, approx_quantiles=approx_quantiles)
+    if not paralelo:
+        for chave in GRAFICOS:
+            yield chave, serializar_grafico(chave, df, limite_pontos, formato, cubo, approx_quantiles)
+        return
+
+    processos = processos or os.cpu_count() or 1
+    shm, descritor = publicar_dataframe(df)
+    try:
+        with ProcessPoolExecutor(max_workers=processos, mp_context=contexto_processos(),
+                                 initializer=_iniciar_worker, initargs=(descritor, cubo)) as executor:
+            pendentes = deque()
+            for chave in GRAFICOS:
+                pendentes.append(executor.submit(_construir_no_worker, chave, limite_pontos, formato,
+                                                 approx_quantiles))
+                if len(pendentes) >= 2 * processos:
+                    yield pendentes.popleft().result()
+            while pendentes:
+                yield pendentes.popleft().result()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def criar_todos_graficos(df, paralelo=False, processos=None, limite_pontos=LIMITE_PONTOS, formato='html',
+                         cubo=None, approx_quantiles=False):
+    """
+    Cria todos os gráficos e retorna como HTML ({chave: trecho HTML}), ou como JSON de
+    figura com formato='json' (ver iterar_graficos)
+    """
+    return dict(iterar_graficos(df, paralelo=paralelo, processos=processos,
+                                limite_pontos=limite_pontos, formato=formato, cubo=cubo,
+                                approx_quantiles=approx_quantiles))
+
+
+# título de cada gráfico na página (a ordem da página é a de GRAFICOS)
+TITULOS_GRAFICOS = {
+    'viz1': '1. Distribuição de Repositórios por Linguagem',
+    'viz2': '2. Métricas de Popularidade por Linguagem',
+    'viz3': '3. Distribuição de Stars por Linguagem',
+    'viz4': '4. Timeline de Criação de Repositórios',
+    'viz5': '5. Atividade dos Repositórios',
+    'viz6': '6. Distribuição de Licenças',
+    'viz7': '7. Distribuição por Categoria',
+    'rq1': 'RQ1.1: Stars vs Commits',
+    'rq2': 'RQ1.2: Stars vs Contributors',
+    'rq3': 'RQ1.3: Matriz de Correlação',
+    'rq4': 'RQ2.1: Taxa de Resolução (Box Plot)',
+    'rq5': 'RQ2.2: Taxa de Resolução (Violin)',
+    'rq6': 'RQ2.3: Taxa Média de Resolução',
+    'rq7': 'RQ3.1: Documentação e Engajamento',
+    'rq8': 'RQ3.2: Documentação vs Stars',
+    'rq9': 'RQ4.1: Métricas por Licença',
+    'rq10': 'RQ4.2: Distribuição Stars por Licença',
+    'rq11': 'RQ4.3: Popularidade vs Contribuição',
+}
+# a seção das questões de pesquisa começa antes deste gráfico
+PRIMEIRO_GRAFICO_RQS = 'rq1'
+
+
+def _html_inicio(cubo, scripts):
+    """Cabeçalho da página até a seção de caracterização (inclusive), com os números do cubo"""
+    n_linguagens = len(cubo.contagem(['linguagem']))
+    return f"""<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Dashboard Lab 04 - Análise de Repositórios GitHub</title>
-    <script src="https://cdn.plot.ly/plotly-2.27.0.min.js" charset="utf-8"></script>
+    {scripts}
     <style>
         body {{
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -277,7 +600,7 @@ def gerar_dashboard_sem_iframes(df):
         <div class="header">
             <h1>📊 Dashboard de Análise de Repositórios GitHub</h1>
             <p style="font-size: 1.2em; margin: 10px 0;">Laboratório 04 - Visualização de Dados com Business Intelligence</p>
-            <p>Análise de {len(df)} repositórios | {df['linguagem'].nunique()} linguagens | Período: {df['created_at'].min()} a {df['created_at'].max()}</p>
+            <p>Análise de {cubo.n} repositórios | {n_linguagens} linguagens | Período: {cubo.metadados['created_at_min']} a {cubo.metadados['created_at_max']}</p>
         </div>
 
         <div class="section-title">
@@ -285,33 +608,28 @@ def gerar_dashboard_sem_iframes(df):
             <p>Esta seção apresenta as características principais do dataset utilizado.</p>
             <div class="stats-grid">
                 <div class="stat-card">
-                    <div class="stat-value">{len(df)}</div>
+                    <div class="stat-value">{cubo.n}</div>
                     <div>Repositórios</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-value">{df['linguagem'].nunique()}</div>
+                    <div class="stat-value">{n_linguagens}</div>
                     <div>Linguagens</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-value">{df['stars'].median():.0f}</div>
+                    <div class="stat-value">{cubo.quantil(None, 'stars'):.0f}</div>
                     <div>Stars (mediana)</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-value">{df['contributors'].median():.0f}</div>
+                    <div class="stat-value">{cubo.quantil(None, 'contributors'):.0f}</div>
                     <div>Contributors (mediana)</div>
                 </div>
             </div>
         </div>
 
-        <div class="visualization"><h3>1. Distribuição de Repositórios por Linguagem</h3>{graficos['viz1']}</div>
-        <div class="visualization"><h3>2. Métricas de Popularidade por Linguagem</h3>{graficos['viz2']}</div>
-        <div class="visualization"><h3>3. Distribuição de Stars por Linguagem</h3>{graficos['viz3']}</div>
-        <div class="visualization"><h3>4. Timeline de Criação de Repositórios</h3>{graficos['viz4']}</div>
-        <div class="visualization"><h3>5. Atividade dos Repositórios</h3>{graficos['viz5']}</div>
-        <div class="visualization"><h3>6. Distribuição de Licenças</h3>{graficos['viz6']}</div>
-        <div class="visualization"><h3>7. Distribuição por Categoria</h3>{graficos['viz7']}</div>
+"""
+
 
-        <div class="section-title">
+HTML_SECAO_RQS = """        <div class="section-title">
             <h2>🔬 Parte 2: Questões de Pesquisa</h2>
             <div class="rq-box">
                 <h3>RQ1</h3>
@@ -331,40 +649,120 @@ def gerar_dashboard_sem_iframes(df):
             </div>
         </div>
 
-        <div class="visualization"><h3>RQ1.1: Stars vs Commits</h3>{graficos['rq1']}</div>
-        <div class="visualization"><h3>RQ1.2: Stars vs Contributors</h3>{graficos['rq2']}</div>
-        <div class="visualization"><h3>RQ1.3: Matriz de Correlação</h3>{graficos['rq3']}</div>
-        <div class="visualization"><h3>RQ2.1: Taxa de Resolução (Box Plot)</h3>{graficos['rq4']}</div>
-        <div class="visualization"><h3>RQ2.2: Taxa de Resolução (Violin)</h3>{graficos['rq5']}</div>
-        <div class="visualization"><h3>RQ2.3: Taxa Média de Resolução</h3>{graficos['rq6']}</div>
-        <div class="visualization"><h3>RQ3.1: Documentação e Engajamento</h3>{graficos['rq7']}</div>
-        <div class="visualization"><h3>RQ3.2: Documentação vs Stars</h3>{graficos['rq8']}</div>
-        <div class="visualization"><h3>RQ4.1: Métricas por Licença</h3>{graficos['rq9']}</div>
-        <div class="visualization"><h3>RQ4.2: Distribuição Stars por Licença</h3>{graficos['rq10']}</div>
-        <div class="visualization"><h3>RQ4.3: Popularidade vs Contribuição</h3>{graficos['rq11']}</div>
-
-        <div style="background: #f8f9fa; padding: 20px; border-radius: 10px; text-align: center; margin-top: 30px; color: #666;">
+"""
+
+
+def _html_fim():
+    return f"""        <div style="background: #f8f9fa; padding: 20px; border-radius: 10px; text-align: center; margin-top: 30px; color: #666;">
             <p>Dashboard gerado em {datetime.now().strftime("%d/%m/%Y %H:%M")}</p>
             <p style="font-size: 0.9em;">Laboratório de Experimentação em Engenharia de Software - PUC</p>
         </div>
     </div>
 </body>
 </html>"""
+
+
+def _trechos_json(figuras, tabela, sob_demanda):
+    """(chave, trecho HTML) para figuras em JSON, precedido das entradas novas da tabela de dados"""
+    for chave, texto in figuras:
+        figura = tabela.internar(texto)
+        yield chave, tabela.bloco_novas_entradas() + trecho_grafico(f'grafico-{chave}', figura, sob_demanda)
+
+
+def gerar_dashboard_sem_iframes(df, paralelo=False, processos=None, limite_pontos=LIMITE_PONTOS,
+                                compacto=False, sob_demanda=False, comprimir=False, cubo=None,
+                                approx_quantiles=False, caminho=DASHBOARD):
+    """
+    Gera dashboard completo sem usar iframes, gravado em 'caminho'.
+
+    A página é gravada em disco seção a seção, à medida que cada gráfico fica pronto
+    (iterar_graficos), então só um gráfico por vez fica em memória.
+    - compacto=True: dados compartilhados entre as figuras em uma tabela única e plotly.js
+      embutido (ver html_compacto.py)
+    - sob_demanda=True: cada gráfico só é desenhado quando entra na tela (IntersectionObserver),
+      então a página abre sem esperar os 18 gráficos
+    - comprimir=True: grava também um .html.gz
+    Cabeçalho e gráficos de contagens/medianas vêm de 'cubo' (cubo.py); sem ele, o cubo é
+    construído a partir de df.
+    - approx_quantiles=True: boxplots de stars e taxa de resolução pelos quartis do cubo
+    """
+    print("\n[INFO] Gerando dashboard sem iframes (solucao para problemas de CORS)...")
     
-    with open('dashboard_completo_sem_iframes.html', 'w', encoding='utf-8') as f:
-        f.write(html)
+    cubo = cubo if cubo is not None else construir_cubo(df, approx_quantiles=approx_quantiles)
+    if compacto or sob_demanda:
+        # figuras em JSON, lidas e desenhadas no navegador pelo runtime de html_compacto.py
+        tabela = TabelaDados() if compacto else TabelaDados(minimo=None)
+        figuras = iterar_graficos(df, paralelo=paralelo, processos=processos,
+                                  limite_pontos=limite_pontos, formato='json', cubo=cubo,
+                                  approx_quantiles=approx_quantiles)
+        graficos = _trechos_json(figuras, tabela, sob_demanda)
+        scripts = scripts_cabecalho(embutir_plotly=compacto, sob_demanda=sob_demanda)
+    else:
+        graficos = iterar_graficos(df, paralelo=paralelo, processos=processos, limite_pontos=limite_pontos,
+                                   cubo=cubo, approx_quantiles=approx_quantiles)
+        scripts = PLOTLY_CDN
+
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write(_html_inicio(cubo, scripts))
+        for chave, trecho in graficos:
+            if chave == PRIMEIRO_GRAFICO_RQS:
+                f.write("\n" + HTML_SECAO_RQS)
+            f.write(f'        <div class="visualization"><h3>{TITULOS_GRAFICOS[chave]}</h3>{trecho}</div>\n')
+        f.write("\n" + _html_fim())
     
-    print("[OK] Dashboard sem iframes gerado: dashboard_completo_sem_iframes.html")
+    print(f"[OK] Dashboard sem iframes gerado: {caminho} "
+          f"({os.path.getsize(caminho) / 1024 ** 2:.1f} MB)")
+    if comprimir:
+        destino = gravar_gzip(caminho)
+        print(f"[OK] Cópia comprimida: {destino} ({os.path.getsize(destino) / 1024 ** 2:.1f} MB)")
     print("\n[INFO] Este dashboard incorpora todos os graficos diretamente no HTML")
     print("[INFO] Nao ha problemas de CORS - funciona perfeitamente ao abrir localmente!")
 
 
-def main():
-    """Função principal"""
-    df = pd.read_csv('dados_repositorios.csv')
-    df['created_at'] = pd.to_datetime(df['created_at'])
-    df['updated_at'] = pd.to_datetime(df['updated_at'])
-    gerar_dashboard_sem_iframes(df)
+def main(argv=None):
+    """Função principal (argv: argumentos da linha de comando; None = sys.argv)"""
+    parser = argparse.ArgumentParser(description="Gera o dashboard completo (HTML sem iframes)")
+    parser.add_argument("--input", default=DATASET_REPOSITORIOS,
+                        help=f"dataset de repositórios gravado por 01_coleta_dados.py (padrão: {DATASET_REPOSITORIOS})")
+    parser.add_argument("--output", default=DASHBOARD,
+                        help=f"arquivo HTML do dashboard (padrão: {DASHBOARD})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="regera o dashboard mesmo que os dados e o código não tenham mudado")
+    parser.add_argument("--parallel", action="store_true",
+                        help="constrói os gráficos em paralelo (pool de processos)")
+    parser.add_argument("--workers", type=inteiro_positivo, default=None,
+                        help="número de processos usados com --parallel (padrão: número de CPUs)")
+    parser.add_argument("--max-points", type=int, default=LIMITE_PONTOS,
+                        help=f"acima deste número de repositórios os scatters viram densidade 2D e o "
+                             f"violin de RQ2.2 mostra só o resumo (padrão: {LIMITE_PONTOS})")
+    parser.add_argument("--compact", action="store_true",
+                        help="tabela de dados única compartilhada pelos gráficos e plotly.js embutido (sem CDN)")
+    parser.add_argument("--lazy", action="store_true",
+                        help="desenha cada gráfico só quando ele entra na tela (IntersectionObserver)")
+    parser.add_argument("--gzip", action="store_true",
+                        help="grava também uma cópia .html.gz do dashboard")
+    parser.add_argument("--approx-quantiles", action="store_true",
+                        help="boxplots e medianas a partir de sketches KLL (memória constante por grupo)")
+    args = parser.parse_args(argv)
+
+    df = carregar_repositorios(args.input, colunas=COLUNAS_DASHBOARD, datas=['created_at'])
+    # o dashboard só é refeito se os dados ou o código dos gráficos mudarem
+    cache = CacheArtefatos(os.path.join(OUTPUT_DIR, PASTA_CACHE), ativo=not args.no_cache)
+    cubo = obter_cubo(df, CUBO, cache, approx_quantiles=args.approx_quantiles)
+    gerar = partial(gerar_dashboard_sem_iframes, df, paralelo=args.parallel, processos=args.workers,
+                    limite_pontos=args.max_points, compacto=args.compact, sob_demanda=args.lazy,
+                    comprimir=args.gzip, cubo=cubo, approx_quantiles=args.approx_quantiles, caminho=args.output)
+    saidas = [args.output] + ([args.output + '.gz'] if args.gzip else [])
+    cache.executar('dashboard', saidas, gerar,
+                   dados=df, funcao=[construir_figura, serializar_grafico, *GRAFICOS.values(), fig_densidade,
+                                     _contagem_decrescente, CuboAgregado, fig_caixas_do_cubo,
+                                     _amostra_por_grupo, _html_inicio, _html_fim, _trechos_json,
+                                     gerar_dashboard_sem_iframes, TabelaDados, trecho_grafico, scripts_cabecalho],
+                   parametros={'limite_pontos': args.max_points, 'bins_densidade': BINS_DENSIDADE,
+                               'titulos': TITULOS_GRAFICOS, 'secao_rqs': HTML_SECAO_RQS,
+                               'compacto': args.compact, 'sob_demanda': args.lazy, 'gzip': args.gzip,
+                               'approx_quantiles': args.approx_quantiles})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+"""
+adiado.py
+Importação adiada das bibliotecas pesadas (numpy, pandas, scipy, matplotlib, plotly, pyarrow).
+- `np = ModuloAdiado("numpy")` no topo do módulo não importa nada; o numpy só é carregado
+  no primeiro acesso a um atributo (np.array, ...), ou seja, dentro da função que o usa
+- Importar um script 01-04 (ou pedir --help) deixa de pagar centenas de milissegundos por
+  bibliotecas que aquele caminho nem usa
+- Cada atributo lido é guardado na instância: do segundo acesso em diante o custo é o de
+  um atributo comum
+- É o único mecanismo de adiamento do projeto: os módulos de code/ ligam as bibliotecas
+  pesadas assim (inclusive submódulos, ex.: `mcolors = ModuloAdiado("matplotlib.colors")`)
+  e por isso são importados normalmente no topo dos scripts, sem imports dentro de funções
+"""
+
+import importlib
+
+
+class ModuloAdiado:
+    """Substituto de um módulo que só o importa no primeiro acesso a um atributo"""
+
+    def __init__(self, nome):
+        self._nome = nome
+
+    def __getattr__(self, atributo):
+        valor = getattr(importlib.import_module(self._nome), atributo)
+        setattr(self, atributo, valor)
+        return valor
+
+    def __repr__(self):
+        return f"<módulo adiado '{self._nome}'>"
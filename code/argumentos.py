@@ -0,0 +1,16 @@
+"""
+argumentos.py
+Tipos de argumento do argparse compartilhados pelos scripts 01-04.
+- inteiro_positivo: --rows, --chunk-size, --shards e --workers; valores < 1 são recusados
+  já na linha de comando, em vez de virarem um range() inválido ou um dataset vazio
+"""
+
+import argparse
+
+
+def inteiro_positivo(texto):
+    """Tipo do argparse para contagens e tamanhos: inteiro >= 1"""
+    valor = int(texto)
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"deve ser um inteiro >= 1 (recebido: {texto})")
+    return valor
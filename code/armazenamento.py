@@ -0,0 +1,183 @@
+"""
+armazenamento.py
+Funções de leitura/escrita de datasets compartilhadas pelos scripts 01-04.
+- Formato principal: Parquet (colunar, comprimido com zstd), com leitura apenas das
+  colunas pedidas (projeção) e filtro de nulos aplicado pelo próprio leitor
+- CSV continua sendo caminho de importação/exportação: ao pedir 'dados.csv', lê-se
+  'dados.parquet' quando ele existe e está atualizado; senão o CSV é importado e
+  convertido uma única vez
+- salvar_em_blocos: grava um iterável de DataFrames no arquivo de saída, bloco a bloco,
+  sem nunca manter o dataset inteiro em memória; um iterável vazio é recusado com
+  ValueError sem tocar no arquivo anterior, que não pode passar por saída nova
+- ler_em_blocos: o caminho inverso, para análises que não carregam o dataset inteiro
+"""
+
+import itertools
+import os
+
+from adiado import ModuloAdiado
+
+pd = ModuloAdiado("pandas")
+pa = ModuloAdiado("pyarrow")
+pc = ModuloAdiado("pyarrow.compute")
+pq = ModuloAdiado("pyarrow.parquet")
+
+COMPRESSAO = "zstd"
+
+
+def caminho_colunar(caminho):
+    """Caminho .parquet correspondente a 'caminho' (que pode ser .csv ou já .parquet)"""
+    return os.path.splitext(caminho)[0] + ".parquet"
+
+
+def _criar_pasta(caminho):
+    pasta = os.path.dirname(caminho)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+
+
+def salvar_tabela(df, caminho):
+    """
+    Salva df em 'caminho'. O formato segue a extensão: .csv grava CSV (exportação),
+    qualquer outra grava o formato colunar (.parquet). Retorna o caminho gravado.
+    """
+    _criar_pasta(caminho)
+    if caminho.endswith(".csv"):
+        df.to_csv(caminho, index=False, encoding="utf-8")
+        return caminho
+    destino = caminho_colunar(caminho)
+    df.to_parquet(destino, index=False, compression=COMPRESSAO)
+    return destino
+
+
+def importar_csv(caminho_csv):
+    """Converte um CSV para o formato colunar ao lado dele e retorna o caminho .parquet"""
+    return salvar_tabela(pd.read_csv(caminho_csv), caminho_colunar(caminho_csv))
+
+
+def exportar_csv(caminho, destino_csv=None):
+    """Exporta a tabela colunar de 'caminho' para CSV (por padrão, mesmo nome com .csv)"""
+    origem = caminho_colunar(caminho)
+    destino_csv = destino_csv or os.path.splitext(caminho)[0] + ".csv"
+    pd.read_parquet(origem).to_csv(destino_csv, index=False, encoding="utf-8")
+    # mantém o .parquet mais novo que o CSV exportado, para não reimportá-lo na próxima leitura
+    os.utime(origem)
+    return destino_csv
+
+
+def _colunar_atualizado(caminho):
+    """Garante que existe um .parquet tão recente quanto o CSV de origem e retorna seu caminho"""
+    destino = caminho_colunar(caminho)
+    origem_csv = os.path.splitext(caminho)[0] + ".csv"
+    if os.path.exists(origem_csv) and (not os.path.exists(destino)
+                                       or os.path.getmtime(origem_csv) > os.path.getmtime(destino)):
+        print(f"[INFO] Importando {origem_csv} para o formato colunar ({destino})")
+        importar_csv(origem_csv)
+    if not os.path.exists(destino):
+        raise FileNotFoundError(f"Arquivo {caminho} não encontrado (nem CSV nem Parquet).")
+    return destino
+
+
+def colunas_disponiveis(caminho):
+    """Nomes das colunas da tabela de 'caminho', lidos apenas do esquema do arquivo colunar"""
+    return pq.read_schema(_colunar_atualizado(caminho)).names
+
+
+def carregar_tabela(caminho, colunas=None, nao_nulos=None, datas=None):
+    """
+    Carrega a tabela de 'caminho' a partir do formato colunar.
+
+    - colunas: lê apenas estas colunas (None = todas)
+    - nao_nulos: descarta linhas com nulos nestas colunas; o filtro é aplicado pelo
+      leitor Parquet, então as colunas não precisam estar em 'colunas'
+    - datas: colunas convertidas para datetime (útil para dados importados de CSV)
+    """
+    filtro = None
+    for coluna in nao_nulos or []:
+        condicao = pc.field(coluna).is_valid()
+        filtro = condicao if filtro is None else filtro & condicao
+
+    df = pq.read_table(_colunar_atualizado(caminho), columns=colunas, filters=filtro).to_pandas()
+    for coluna in datas or []:
+        if coluna in df.columns:
+            df[coluna] = pd.to_datetime(df[coluna], format="ISO8601")
+    return df
+
+
+def salvar_em_blocos(blocos, caminho):
+    """
+    Grava os DataFrames de 'blocos' (qualquer iterável/gerador) em 'caminho'.
+    Em .parquet cada bloco vira um row group; em .csv o cabeçalho é escrito apenas
+    no primeiro bloco e os seguintes são anexados. Em ambos os casos o pico de
+    memória fica limitado ao tamanho de um bloco.
+    Retorna o número total de linhas gravadas; sem nenhum bloco levanta ValueError
+    antes de abrir 'caminho', que fica como estava.
+    """
+    blocos = iter(blocos)
+    primeiro = next(blocos, None)
+    if primeiro is None:
+        raise ValueError(f"Nenhum bloco gerado; {caminho} não foi gravado.")
+    blocos = itertools.chain([primeiro], blocos)
+    _criar_pasta(caminho)
+
+    total = 0
+    if caminho.endswith(".parquet"):
+        escritor = None
+        try:
+            for bloco in blocos:
+                tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(caminho, tabela.schema, compression=COMPRESSAO)
+                escritor.write_table(tabela.cast(escritor.schema))
+                total += len(bloco)
+        finally:
+            if escritor is not None:
+                escritor.close()
+        return total
+
+    with open(caminho, "w", encoding="utf-8", newline="") as f:
+        for i, bloco in enumerate(blocos):
+            bloco.to_csv(f, index=False, header=(i == 0))
+            total += len(bloco)
+    return total
+
+
+def arquivo_de_leitura(caminho):
+    """
+    Arquivo que ler_em_blocos lê para 'caminho': o .parquet, se existir e não for mais
+    antigo que o CSV de origem; senão o próprio CSV (sem convertê-lo, o que exigiria
+    carregá-lo inteiro)
+    """
+    destino = caminho_colunar(caminho)
+    origem_csv = os.path.splitext(caminho)[0] + ".csv"
+    if os.path.exists(destino) and not (os.path.exists(origem_csv)
+                                        and os.path.getmtime(origem_csv) > os.path.getmtime(destino)):
+        return destino
+    if os.path.exists(origem_csv):
+        return origem_csv
+    raise FileNotFoundError(f"Arquivo {caminho} não encontrado (nem CSV nem Parquet).")
+
+
+def ler_em_blocos(caminho, colunas=None, nao_nulos=None, tamanho_bloco=100_000):
+    """
+    Gerador de DataFrames com até tamanho_bloco linhas cada, lidos de 'caminho'
+    (ver arquivo_de_leitura). Mesmos parâmetros de carregar_tabela: apenas 'colunas'
+    são devolvidas e linhas com nulos em 'nao_nulos' são descartadas. O pico de memória
+    fica limitado ao tamanho de um bloco.
+    """
+    arquivo = arquivo_de_leitura(caminho)
+    nao_nulos = list(nao_nulos or [])
+    leitura = None if colunas is None else list(dict.fromkeys(list(colunas) + nao_nulos))
+
+    if arquivo.endswith(".csv"):
+        blocos = pd.read_csv(arquivo, usecols=leitura, chunksize=tamanho_bloco)
+    else:
+        lotes = pq.ParquetFile(arquivo).iter_batches(batch_size=tamanho_bloco, columns=leitura)
+        blocos = (lote.to_pandas() for lote in lotes)
+
+    for bloco in blocos:
+        if nao_nulos:
+            bloco = bloco.dropna(subset=nao_nulos)
+        if colunas is not None:
+            bloco = bloco[list(colunas)]
+        yield bloco
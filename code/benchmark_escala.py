@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+benchmark_escala.py
+Escalabilidade das etapas principais com o número de linhas (padrão: 1k, 10k, 100k e 1M).
+- Etapas: gerar_dataset_repositorios (01, motor vetorizado), gerar_dataset_simulado (02),
+  analisar_rq1 e analisar_rq2 (03) e criar_todos_graficos (04)
+- Cada medida roda em um processo Python novo: o dataset de entrada (gerado com seed e data de
+  referência fixas) é preparado antes e fica fora da medida; a etapa é medida sozinha
+- Registra tempo de parede, pico de memória (VmHWM do processo, zerado antes da etapa via
+  /proc/self/clear_refs; sem isso, ru_maxrss) e tamanho da saída (bytes do DataFrame gerado, dos
+  arquivos gravados pela análise ou do HTML dos gráficos) em outputs/benchmark_escala.json
+- Compara com uma base gravada (--save-baseline) e sai com código 1 se alguma etapa ficar mais
+  lenta, mais pesada ou maior que os limites de regressão
+- Tudo local: nenhum acesso à rede (os gráficos só referenciam o plotly.js da CDN)
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+from caminhos import OUTPUT_DIR
+
+PASTA_CODIGO = os.path.dirname(os.path.abspath(__file__))
+RESULTADO_PADRAO = os.path.join(OUTPUT_DIR, "benchmark_escala.json")
+BASE_PADRAO = os.path.join(OUTPUT_DIR, "benchmark_escala_base.json")
+TAMANHOS_PADRAO = [1_000, 10_000, 100_000, 1_000_000]
+EXECUCOES_PADRAO = 3
+SEED = 42
+# "hoje" do dataset de entrada: idades e datas não mudam de um dia para o outro
+DATA_REFERENCIA = date(2025, 1, 1)
+# limites de regressão (fração acima da base) e folgas absolutas abaixo das quais a diferença é ruído
+LIMITE_TEMPO = 0.25
+LIMITE_MEMORIA = 0.25
+LIMITE_TAMANHO = 0.10
+FOLGA_TEMPO_S = 0.05
+FOLGA_MEMORIA_MB = 10.0
+ETAPAS = ["gerar_dataset_repositorios", "gerar_dataset_simulado", "analisar_rq1", "analisar_rq2",
+          "criar_todos_graficos"]
+
+
+def _entrada(linhas):
+    """Dataset de repositórios usado pelas análises e pelo dashboard (colunas no formato do 01)"""
+    import pandas as pd
+
+    coleta = importlib.import_module("01_coleta_dados")
+    df = coleta.gerar_dataset_vetorizado(linhas, seed=SEED, data_referencia=DATA_REFERENCIA)
+    return df.assign(created_at=pd.to_datetime(df["created_at"]))
+
+
+def _bytes_pasta(pasta):
+    return sum(os.path.getsize(os.path.join(raiz, arquivo))
+               for raiz, _, arquivos in os.walk(pasta) for arquivo in arquivos)
+
+
+def _preparar(etapa, linhas, pasta):
+    """Função sem argumentos que executa a etapa e devolve o tamanho da saída em bytes"""
+    if etapa == "gerar_dataset_repositorios":
+        coleta = importlib.import_module("01_coleta_dados")
+        return lambda: int(coleta.gerar_dataset_repositorios(linhas, vetorizado=True, seed=SEED)
+                           .memory_usage(deep=True).sum())
+    if etapa == "gerar_dataset_simulado":
+        caracterizacao = importlib.import_module("02_caracterizacao_dataset")
+        return lambda: int(caracterizacao.gerar_dataset_simulado(linhas, seed=SEED).memory_usage(deep=True).sum())
+    if etapa in ("analisar_rq1", "analisar_rq2"):
+        analise = importlib.import_module("03_analise_rqs")
+        # os gráficos e tabelas da análise vão para uma pasta temporária, não para outputs/
+        analise.OUTPUT_DIR = pasta
+        df = _entrada(linhas)
+        if etapa == "analisar_rq1":
+            df, analisar = df[analise.COLUNAS_RQ1], analise.analisar_rq1
+        else:
+            df, analisar = df[["linguagem", "taxa_resolucao_issues"]], analise.analisar_rq2
+
+        def executar():
+            analisar(df)
+            return _bytes_pasta(pasta)
+        return executar
+    if etapa == "criar_todos_graficos":
+        dashboard = importlib.import_module("04_dashboard_completo_v2")
+        df = _entrada(linhas)[dashboard.COLUNAS_DASHBOARD]
+        return lambda: sum(len(html.encode("utf-8")) for html in dashboard.criar_todos_graficos(df).values())
+    raise ValueError(f"Etapa desconhecida: {etapa}")
+
+
+def _memoria_kb(campo):
+    """Campo de /proc/self/status em KB (VmRSS, VmHWM); None fora do Linux"""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for linha in f:
+                if linha.startswith(campo + ":"):
+                    return int(linha.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _zerar_pico():
+    """Zera o pico de memória residente do processo (Linux >= 4.0); False se não for possível"""
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def medir_etapa(etapa, linhas):
+    """Executa a etapa uma vez neste processo e devolve tempo, memória e tamanho da saída"""
+    with tempfile.TemporaryDirectory() as pasta:
+        executar = _preparar(etapa, linhas, pasta)
+        # a saída das etapas ([INFO], [RQ1] ...) não interessa aqui
+        with contextlib.redirect_stdout(io.StringIO()):
+            zerado = _zerar_pico()
+            rss_inicio = _memoria_kb("VmRSS")
+            inicio = time.perf_counter()
+            tamanho = executar()
+            tempo = time.perf_counter() - inicio
+    pico = _memoria_kb("VmHWM") if zerado else None
+    if pico is None:
+        # ru_maxrss (KB no Linux) inclui a preparação da entrada
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {"tempo_s": tempo, "pico_rss_mb": pico / 1024,
+            "pico_acima_inicio_mb": (pico - rss_inicio) / 1024 if zerado and rss_inicio is not None else None,
+            "tamanho_saida_bytes": int(tamanho)}
+
+
+def medir(etapa, linhas, execucoes):
+    """Mediana de 'execucoes' medidas da etapa, cada uma em um processo novo"""
+    ambiente = {**os.environ, "MPLBACKEND": "Agg"}
+    medidas = []
+    for _ in range(execucoes):
+        processo = subprocess.run([sys.executable, os.path.basename(__file__), "--medir", etapa, str(linhas)],
+                                  cwd=PASTA_CODIGO, capture_output=True, text=True, env=ambiente)
+        if processo.returncode != 0:
+            raise RuntimeError(f"{etapa} com {linhas} linhas falhou:\n{processo.stderr}")
+        medidas.append(json.loads(processo.stdout.strip().splitlines()[-1]))
+    mediana = lambda campo: (None if medidas[0][campo] is None
+                             else statistics.median(m[campo] for m in medidas))
+    return {"etapa": etapa, "linhas": linhas, "tempo_s": mediana("tempo_s"),
+            "tempos_s": [m["tempo_s"] for m in medidas], "pico_rss_mb": mediana("pico_rss_mb"),
+            "pico_acima_inicio_mb": mediana("pico_acima_inicio_mb"),
+            "tamanho_saida_bytes": int(mediana("tamanho_saida_bytes"))}
+
+
+def comparar(resultados, base, limite_tempo=LIMITE_TEMPO, limite_memoria=LIMITE_MEMORIA,
+             limite_tamanho=LIMITE_TAMANHO):
+    """
+    Regressões em relação à base: lista de (etapa, linhas, métrica, valor da base, valor atual).
+    Só conta quando a razão passa do limite E a diferença absoluta passa da folga (tempo e memória).
+    """
+    anteriores = {(r["etapa"], r["linhas"]): r for r in base["resultados"]}
+    regressoes = []
+    for atual in resultados:
+        anterior = anteriores.get((atual["etapa"], atual["linhas"]))
+        if anterior is None:
+            continue
+        for metrica, limite, folga in [("tempo_s", limite_tempo, FOLGA_TEMPO_S),
+                                       ("pico_rss_mb", limite_memoria, FOLGA_MEMORIA_MB),
+                                       ("tamanho_saida_bytes", limite_tamanho, 0)]:
+            antes, agora = anterior.get(metrica), atual.get(metrica)
+            if antes is None or agora is None:
+                continue
+            if agora > antes * (1 + limite) and agora - antes > folga:
+                regressoes.append((atual["etapa"], atual["linhas"], metrica, antes, agora))
+    return regressoes
+
+
+def _tamanho_legivel(n_bytes):
+    for unidade in ["B", "KB", "MB"]:
+        if n_bytes < 1024:
+            return f"{n_bytes:.0f} {unidade}" if unidade == "B" else f"{n_bytes:.1f} {unidade}"
+        n_bytes /= 1024
+    return f"{n_bytes:.1f} GB"
+
+
+def relatorio(resultados, base=None):
+    anteriores = {(r["etapa"], r["linhas"]): r for r in base["resultados"]} if base else {}
+    print(f"{'etapa':<28}{'linhas':>10}{'tempo (s)':>11}{'pico (MB)':>11}{'saída':>11}  vs. base (tempo)")
+    print("-" * 90)
+    for r in resultados:
+        anterior = anteriores.get((r["etapa"], r["linhas"]))
+        variacao = f"{r['tempo_s'] / anterior['tempo_s'] - 1:+.0%}" if anterior and anterior["tempo_s"] else "-"
+        print(f"{r['etapa']:<28}{r['linhas']:>10,}{r['tempo_s']:>11.3f}{r['pico_rss_mb']:>11.1f}"
+              f"{_tamanho_legivel(r['tamanho_saida_bytes']):>11}  {variacao}")
+    print("-" * 90)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Escalabilidade das etapas 01-04 com o número de linhas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=TAMANHOS_PADRAO,
+                        help="números de linhas medidos (padrão: 1000 10000 100000 1000000)")
+    parser.add_argument("--stages", nargs="+", choices=ETAPAS, default=ETAPAS,
+                        help="etapas medidas (padrão: todas)")
+    parser.add_argument("--runs", type=int, default=EXECUCOES_PADRAO,
+                        help=f"execuções por medida; reporta a mediana (padrão: {EXECUCOES_PADRAO})")
+    parser.add_argument("--output", default=RESULTADO_PADRAO,
+                        help=f"JSON com os resultados (padrão: {RESULTADO_PADRAO})")
+    parser.add_argument("--baseline", default=BASE_PADRAO,
+                        help=f"JSON de referência para a comparação (padrão: {BASE_PADRAO})")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="grava os resultados também como nova base (sem comparar)")
+    parser.add_argument("--time-threshold", type=float, default=LIMITE_TEMPO,
+                        help=f"regressão se o tempo passar da base por mais que esta fração (padrão: {LIMITE_TEMPO})")
+    parser.add_argument("--memory-threshold", type=float, default=LIMITE_MEMORIA,
+                        help=f"idem para o pico de memória (padrão: {LIMITE_MEMORIA})")
+    parser.add_argument("--size-threshold", type=float, default=LIMITE_TAMANHO,
+                        help=f"idem para o tamanho da saída (padrão: {LIMITE_TAMANHO})")
+    # uso interno: uma medida, executada no processo filho
+    parser.add_argument("--medir", nargs=2, metavar=("ETAPA", "LINHAS"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.medir:
+        etapa, linhas = args.medir
+        print(json.dumps(medir_etapa(etapa, int(linhas))))
+        return
+
+    print(f"[INFO] {len(args.stages)} etapas x {len(args.sizes)} tamanhos, mediana de {args.runs} execuções")
+    resultados = []
+    for linhas in sorted(args.sizes):
+        for etapa in args.stages:
+            resultados.append(medir(etapa, linhas, args.runs))
+            r = resultados[-1]
+            print(f"[OK] {etapa} ({linhas:,} linhas): {r['tempo_s']:.3f}s, pico {r['pico_rss_mb']:.1f} MB")
+
+    saida = {"gerado_em": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+             "plataforma": platform.platform(), "cpus": os.cpu_count(), "execucoes": args.runs,
+             "seed": SEED, "data_referencia": DATA_REFERENCIA.isoformat(), "resultados": resultados}
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(saida, f, indent=2)
+    print(f"[OK] Resultados salvos em {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(saida, f, indent=2)
+        print(f"[OK] Base salva em {args.baseline}")
+        relatorio(resultados)
+        return
+    if not os.path.exists(args.baseline):
+        print(f"[WARN] Base {args.baseline} não encontrada; grave uma com --save-baseline.")
+        relatorio(resultados)
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)
+    relatorio(resultados, base)
+    regressoes = comparar(resultados, base, args.time_threshold, args.memory_threshold, args.size_threshold)
+    if regressoes:
+        for etapa, linhas, metrica, antes, agora in regressoes:
+            print(f"[WARN] Regressão em {etapa} ({linhas:,} linhas), {metrica}: {antes:.3f} -> {agora:.3f}")
+        raise SystemExit(1)
+    print(f"[OK] Nenhuma regressão em relação à base ({base.get('gerado_em', '?')})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+benchmark_inicio.py
+Tempo de inicialização dos pontos de entrada (scripts 01-04, pipeline.py e lab.py).
+- Mede `import <módulo>` e `<script> --help`, cada um em um processo Python novo, e
+  reporta a mediana de --runs execuções ao lado do piso do interpretador (`python -c pass`)
+- Para cada import, lista quais bibliotecas pesadas (numpy, pandas, ...) ficaram carregadas:
+  o esperado é nenhuma (ver adiado.py)
+- Sai com código 1 se alguma medida passar de --limit-ms
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PASTA_CODIGO = os.path.dirname(os.path.abspath(__file__))
+LIMITE_PADRAO_MS = 100.0
+EXECUCOES_PADRAO = 10
+PESADOS = ["numpy", "pandas", "scipy", "matplotlib", "plotly", "pyarrow"]
+# (rótulo, módulo importado, argumentos do --help)
+PONTOS_DE_ENTRADA = [
+    ("01 coleta", "01_coleta_dados", ["01_coleta_dados.py", "--help"]),
+    ("02 caracterização", "02_caracterizacao_dataset", ["02_caracterizacao_dataset.py", "--help"]),
+    ("03 análise", "03_analise_rqs", ["03_analise_rqs.py", "--help"]),
+    ("04 dashboard", "04_dashboard_completo_v2", ["04_dashboard_completo_v2.py", "--help"]),
+    ("pipeline", "pipeline", ["pipeline.py", "--help"]),
+    ("lab", "lab", ["lab.py", "--help"]),
+    ("lab analise", None, ["lab.py", "analise", "--help"]),
+    ("lab dashboard", None, ["lab.py", "dashboard", "--help"]),
+]
+CODIGO_IMPORT = ("import importlib, json, sys; importlib.import_module({modulo!r}); "
+                 "print(json.dumps([m for m in {pesados!r} if m in sys.modules]))")
+
+
+def medir(argumentos, execucoes):
+    """Mediana (ms) do tempo de parede de `python <argumentos>` e a saída da última execução"""
+    tempos = []
+    for _ in range(execucoes):
+        inicio = time.perf_counter()
+        processo = subprocess.run([sys.executable, *argumentos], cwd=PASTA_CODIGO, capture_output=True, text=True)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+        if processo.returncode != 0:
+            raise RuntimeError(f"'python {' '.join(argumentos)}' falhou:\n{processo.stderr}")
+    return statistics.median(tempos), processo.stdout
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de import e de --help de cada ponto de entrada")
+    parser.add_argument("--runs", type=int, default=EXECUCOES_PADRAO,
+                        help=f"execuções por medida; reporta a mediana (padrão: {EXECUCOES_PADRAO})")
+    parser.add_argument("--limit-ms", type=float, default=LIMITE_PADRAO_MS,
+                        help=f"tempo máximo aceito por medida, em ms (padrão: {LIMITE_PADRAO_MS:.0f})")
+    args = parser.parse_args(argv)
+
+    piso, _ = medir(["-c", "pass"], args.runs)
+    print(f"[INFO] Mediana de {args.runs} execuções; piso do interpretador (python -c pass): {piso:.1f} ms")
+    print(f"{'ponto de entrada':<20}{'import (ms)':>12}{'--help (ms)':>13}  bibliotecas pesadas após o import")
+    print("-" * 78)
+    excedidos = []
+    for rotulo, modulo, ajuda in PONTOS_DE_ENTRADA:
+        tempo_import, carregados = None, "-"
+        if modulo is not None:
+            tempo_import, saida = medir(["-c", CODIGO_IMPORT.format(modulo=modulo, pesados=PESADOS)], args.runs)
+            carregados = ", ".join(json.loads(saida)) or "nenhuma"
+        tempo_ajuda, _ = medir(ajuda, args.runs)
+        excedidos += [(rotulo, t) for t in (tempo_import, tempo_ajuda) if t is not None and t > args.limit_ms]
+        coluna_import = f"{tempo_import:>12.1f}" if tempo_import is not None else f"{'-':>12}"
+        print(f"{rotulo:<20}{coluna_import}{tempo_ajuda:>13.1f}  {carregados}")
+    print("-" * 78)
+    if excedidos:
+        for rotulo, tempo in excedidos:
+            print(f"[WARN] {rotulo}: {tempo:.1f} ms (limite {args.limit_ms:.0f} ms)")
+        raise SystemExit(1)
+    print(f"[OK] Todos os imports e --help abaixo de {args.limit_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+bootstrap.py
+Intervalos de confiança por bootstrap para as associações da RQ1 (Pearson, Spearman e a
+reta de mínimos quadrados de y em função de cada x).
+- Cada lote sorteia uma matriz (reamostragens x n) de índices; cada linha vira um vetor de
+  multiplicidades (quantas vezes cada repositório entrou na reamostragem)
+- Com as multiplicidades como pesos, somas, quadrados e produtos cruzados de todas as
+  reamostragens do lote saem de um único produto de matrizes, o que dá Pearson, inclinação
+  e intercepto vetorizados
+- Spearman usa os postos médios dentro de cada reamostragem: os valores distintos de cada
+  coluna são ordenados uma vez; por reamostragem basta somar as multiplicidades de cada
+  valor distinto (bincount) e acumular, sem reordenar os dados
+- O tamanho do lote limita a memória (ELEMENTOS_POR_LOTE) e cada lote recebe seu próprio
+  fluxo aleatório (SeedSequence.spawn): o resultado depende só de (seed, reamostragens), não
+  do número de processos. Os lotes rodam em um pool, com os dados em memória compartilhada
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from adiado import ModuloAdiado
+from geracao_paralela import contexto_processos
+from memoria_compartilhada import anexar_dataframe, publicar_dataframe
+
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+
+REAMOSTRAGENS_PADRAO = 1000
+CONFIANCA_PADRAO = 0.95
+# reamostragens x linhas por lote (cada matriz do lote ocupa ~8 bytes por elemento)
+ELEMENTOS_POR_LOTE = 1_000_000
+
+
+def nomes_estimadores(y, colunas_x):
+    """Nomes dos estimadores, na ordem das colunas devolvidas por cada lote"""
+    nomes = []
+    for x in colunas_x:
+        nomes += [f"pearson_{y}_{x}", f"spearman_{y}_{x}", f"regression_{x}.slope", f"regression_{x}.intercept"]
+    return nomes
+
+
+def preparar_dados(df, y, colunas_x):
+    """
+    Tabela publicada para os lotes: colunas centradas, seus quadrados e produtos por y (para o
+    produto de matrizes) e o código do valor distinto de cada coluna (para os postos).
+    Retorna (tabela, metadados).
+    """
+    colunas = [y, *colunas_x]
+    tabela, n_distintos, medias = {}, {}, {}
+    for c in colunas:
+        valores = df[c].to_numpy(dtype=np.float64)
+        medias[c] = float(valores.mean())
+        distintos, codigos = np.unique(valores, return_inverse=True)
+        tabela[f"codigo_{c}"] = codigos.astype(np.int32)
+        n_distintos[c] = len(distintos)
+        tabela[c] = valores - medias[c]
+    for c in colunas:
+        tabela[f"{c}^2"] = tabela[c] * tabela[c]
+    for x in colunas_x:
+        tabela[f"{y}*{x}"] = tabela[y] * tabela[x]
+    metadados = {"y": y, "colunas_x": list(colunas_x), "medias": medias, "n_distintos": n_distintos}
+    return pd.DataFrame(tabela), metadados
+
+
+def postos_ponderados(pesos, codigos, n_distintos):
+    """
+    Postos médios (empates = média dos postos, como scipy.stats.rankdata) de cada linha em cada
+    reamostragem. pesos: (reamostragens x n) multiplicidades; codigos: posição do valor de cada
+    linha entre os valores distintos ordenados.
+    """
+    reamostragens = pesos.shape[0]
+    deslocados = codigos[None, :] + (np.arange(reamostragens) * n_distintos)[:, None]
+    contagem = np.bincount(deslocados.ravel(), weights=pesos.ravel(),
+                           minlength=reamostragens * n_distintos).reshape(reamostragens, n_distintos)
+    abaixo = np.cumsum(contagem, axis=1) - contagem
+    return (abaixo + (contagem + 1) / 2)[:, codigos]
+
+
+def _nomes_momentos(y, colunas_x):
+    colunas = [y, *colunas_x]
+    return colunas + [f"{c}^2" for c in colunas] + [f"{y}*{x}" for x in colunas_x]
+
+
+def arrays_do_lote(tabela, metadados):
+    """Arrays usados por estimar_lote, montados uma vez por processo: matriz de momentos e códigos"""
+    y, colunas_x = metadados["y"], metadados["colunas_x"]
+    arrays = {f"codigo_{c}": tabela[f"codigo_{c}"].to_numpy() for c in [y, *colunas_x]}
+    arrays["momentos"] = tabela[_nomes_momentos(y, colunas_x)].to_numpy(dtype=np.float64)
+    return arrays
+
+
+def estimar_lote(arrays, metadados, seed, reamostragens):
+    """Estimadores (reamostragens x len(nomes_estimadores)) de um lote de reamostragens"""
+    y, colunas_x, medias = metadados["y"], metadados["colunas_x"], metadados["medias"]
+    n = arrays["momentos"].shape[0]
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, n, size=(reamostragens, n))
+    indices += (np.arange(reamostragens) * n)[:, None]
+    pesos = np.bincount(indices.ravel(), minlength=reamostragens * n).reshape(reamostragens, n).astype(np.float64)
+    del indices
+
+    # somas ponderadas de todas as colunas de momentos: um produto de matrizes
+    colunas = [y, *colunas_x]
+    soma = dict(zip(_nomes_momentos(y, colunas_x), (pesos @ arrays["momentos"]).T))
+
+    # postos médios centrados (a média dos postos é sempre (n+1)/2)
+    centro = (n + 1) / 2
+    postos = {c: postos_ponderados(pesos, arrays[f"codigo_{c}"], metadados["n_distintos"][c]) - centro
+              for c in colunas}
+    pesos_postos_y = pesos * postos[y]
+    var_posto_y = np.einsum("rn,rn->r", pesos_postos_y, postos[y])
+
+    var_y = soma[f"{y}^2"] - soma[y] ** 2 / n
+    estimativas = []
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for x in colunas_x:
+            var_x = soma[f"{x}^2"] - soma[x] ** 2 / n
+            cov = soma[f"{y}*{x}"] - soma[x] * soma[y] / n
+            inclinacao = cov / var_x
+            # intercepto na escala original (as colunas foram centradas pela média da amostra)
+            intercepto = medias[y] + soma[y] / n - inclinacao * (medias[x] + soma[x] / n)
+            cov_postos = np.einsum("rn,rn->r", pesos_postos_y, postos[x])
+            var_posto_x = np.einsum("rn,rn->r", pesos * postos[x], postos[x])
+            estimativas += [cov / np.sqrt(var_x * var_y), cov_postos / np.sqrt(var_posto_x * var_posto_y),
+                            inclinacao, intercepto]
+    return np.column_stack(estimativas)
+
+
+# ----- Lotes em paralelo (tabela em memória compartilhada) -----
+_ARRAYS_WORKER = None
+_SHM_WORKER = None
+_METADADOS_WORKER = None
+
+
+def _iniciar_worker(descritor, metadados):
+    global _ARRAYS_WORKER, _SHM_WORKER, _METADADOS_WORKER
+    _SHM_WORKER, tabela = anexar_dataframe(descritor)
+    _ARRAYS_WORKER = arrays_do_lote(tabela, metadados)
+    _METADADOS_WORKER = metadados
+
+
+def _lote_no_worker(seed, reamostragens):
+    return estimar_lote(_ARRAYS_WORKER, _METADADOS_WORKER, seed, reamostragens)
+
+
+def _lotes(reamostragens, n, seed):
+    """[(seed do lote, reamostragens do lote)]: a divisão depende só de (reamostragens, n, seed)"""
+    por_lote = max(1, ELEMENTOS_POR_LOTE // max(n, 1))
+    tamanhos = [min(por_lote, reamostragens - inicio) for inicio in range(0, reamostragens, por_lote)]
+    return list(zip(np.random.SeedSequence(seed).spawn(len(tamanhos)), tamanhos))
+
+
+def reamostrar(df, y, colunas_x, reamostragens=REAMOSTRAGENS_PADRAO, processos=None, seed=42):
+    """Matriz (reamostragens x estimadores) com Pearson, Spearman, inclinação e intercepto por reamostragem"""
+    tabela, metadados = preparar_dados(df, y, colunas_x)
+    lotes = _lotes(reamostragens, len(tabela), seed)
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(lotes) == 1:
+        arrays = arrays_do_lote(tabela, metadados)
+        return np.vstack([estimar_lote(arrays, metadados, s, r) for s, r in lotes])
+
+    shm, descritor = publicar_dataframe(tabela)
+    del tabela
+    resultados = []
+    try:
+        with ProcessPoolExecutor(max_workers=processos, mp_context=contexto_processos(),
+                                 initializer=_iniciar_worker, initargs=(descritor, metadados)) as executor:
+            pendentes = deque()
+            for seed_lote, tamanho in lotes:
+                pendentes.append(executor.submit(_lote_no_worker, seed_lote, tamanho))
+                if len(pendentes) >= 2 * processos:
+                    resultados.append(pendentes.popleft().result())
+            while pendentes:
+                resultados.append(pendentes.popleft().result())
+    finally:
+        shm.close()
+        shm.unlink()
+    return np.vstack(resultados)
+
+
+def intervalos_bootstrap(df, y, colunas_x, reamostragens=REAMOSTRAGENS_PADRAO, confianca=CONFIANCA_PADRAO,
+                         processos=None, seed=42):
+    """
+    Intervalos de confiança percentis de cada estimador de nomes_estimadores(y, colunas_x).
+    Retorna {estimador: {"ic_inferior", "ic_superior", "erro_padrao"}}; os da reta ficam em
+    {"regression_<x>": {"slope": {...}, "intercept": {...}}}, como no resultado da RQ1.
+    """
+    amostras = reamostrar(df, y, colunas_x, reamostragens, processos, seed)
+    alfa = 1 - confianca
+    inferior, superior = np.nanquantile(amostras, [alfa / 2, 1 - alfa / 2], axis=0)
+    erro_padrao = np.nanstd(amostras, axis=0, ddof=1)
+    intervalos = {}
+    for i, nome in enumerate(nomes_estimadores(y, colunas_x)):
+        intervalo = {"ic_inferior": float(inferior[i]), "ic_superior": float(superior[i]),
+                     "erro_padrao": float(erro_padrao[i])}
+        if "." in nome:
+            reta, parametro = nome.split(".")
+            intervalos.setdefault(reta, {})[parametro] = intervalo
+        else:
+            intervalos[nome] = intervalo
+    return intervalos
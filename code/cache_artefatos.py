@@ -0,0 +1,273 @@
+"""
+cache_artefatos.py
+Cache de artefatos (gráficos, JSON, CSV de resumo) endereçado por conteúdo.
+- A chave de cada artefato é o hash das colunas de entrada de que ele depende, do código
+  que o produz e dos parâmetros usados
+- O código inclui, além das funções/classes passadas, todas as funções e classes dos
+  módulos de code/ que elas chamam, direta ou indiretamente (dependencias_codigo): editar
+  um auxiliar (ex.: posthoc.ajustar_p_valores) invalida os artefatos que dependem dele
+- Se a chave já foi vista e os arquivos de saída estão intactos, a etapa é pulada;
+  se os arquivos sumiram/mudaram, são restaurados da cópia guardada no cache
+- As cópias ficam em <pasta>/objetos/<sha256> (um arquivo por conteúdo distinto) e o
+  índice em <pasta>/manifesto.json; acima de 'limite_mb' as entradas usadas há mais
+  tempo são removidas
+- Vários processos podem usar a mesma pasta ao mesmo tempo (etapas do pipeline.py em
+  paralelo): ao salvar, com uma trava exclusiva em <pasta>/manifesto.lock, o manifesto em
+  disco é relido, as entradas dos outros são mantidas e só então o arquivo é substituído
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import time
+import types
+from contextlib import contextmanager
+
+from adiado import ModuloAdiado
+
+pd = ModuloAdiado("pandas")
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PASTA_PADRAO = ".cache_artefatos"
+LIMITE_PADRAO_MB = 512
+# módulos desta pasta (code/) entram no hash de código; bibliotecas instaladas não
+PASTA_CODIGO = os.path.dirname(os.path.abspath(__file__))
+
+
+def hash_arquivo(caminho):
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for parte in iter(lambda: f.read(1 << 20), b""):
+            h.update(parte)
+    return h.hexdigest()
+
+
+@contextmanager
+def _trava(caminho):
+    """Trava exclusiva (entre processos) sobre o arquivo 'caminho', liberada ao sair do bloco"""
+    with open(caminho, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _hash_dados(h, dados):
+    if isinstance(dados, pd.Series):
+        dados = dados.to_frame()
+    h.update(json.dumps([[str(c), str(t)] for c, t in dados.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(dados, index=False).to_numpy().tobytes())
+
+
+def _modulo_local(nome):
+    """Módulo de code/ chamado 'nome' (importado se preciso), ou None"""
+    if not isinstance(nome, str) or not os.path.exists(os.path.join(PASTA_CODIGO, nome + ".py")):
+        return None
+    return sys.modules.get(nome) or importlib.import_module(nome)
+
+
+def _eh_local(objeto):
+    modulo = sys.modules.get(getattr(objeto, "__module__", None) or "")
+    arquivo = getattr(modulo, "__file__", None)
+    return arquivo is not None and os.path.dirname(os.path.abspath(arquivo)) == PASTA_CODIGO
+
+
+def _nomes_usados(codigo):
+    """Nomes globais/atributos lidos pelo código, incluindo funções internas, lambdas e compreensões"""
+    nomes = set(codigo.co_names)
+    for constante in codigo.co_consts:
+        if isinstance(constante, types.CodeType):
+            nomes |= _nomes_usados(constante)
+    return nomes
+
+
+def _codigos(objeto):
+    """(objetos de código, namespace global) de uma função ou dos métodos de uma classe"""
+    if inspect.isclass(objeto):
+        funcoes = []
+        for membro in vars(objeto).values():
+            membro = getattr(membro, "__func__", None) or getattr(membro, "fget", None) or membro
+            if inspect.isfunction(membro):
+                funcoes.append(membro)
+        return [f.__code__ for f in funcoes], vars(sys.modules[objeto.__module__])
+    return [objeto.__code__], objeto.__globals__
+
+
+def dependencias_codigo(funcoes):
+    """
+    As funções/classes dadas e todas as funções/classes de módulos de code/ alcançáveis a partir
+    delas pelos nomes que o código usa: globais do módulo (também dentro de dicts/listas, como
+    GRAFICOS), métodos de classes e imports locais (`from posthoc import ...` dentro da função).
+    Ordenadas por (módulo, nome qualificado), para o hash não depender da ordem da visita.
+    """
+    raizes = [funcoes] if not isinstance(funcoes, (list, tuple)) else list(funcoes)
+    vistos, pendentes = {}, [inspect.unwrap(f) for f in raizes]
+    while pendentes:
+        objeto = pendentes.pop()
+        if not (inspect.isfunction(objeto) or inspect.isclass(objeto)):
+            continue
+        identificador = (objeto.__module__, objeto.__qualname__)
+        if identificador in vistos:
+            continue
+        vistos[identificador] = objeto
+        codigos, escopo = _codigos(objeto)
+        for codigo in codigos:
+            nomes = _nomes_usados(codigo)
+            modulos = [m for m in (_modulo_local(n) for n in nomes) if m is not None]
+            for nome in nomes:
+                valor = escopo.get(nome)
+                candidatos = list(valor.values()) if isinstance(valor, dict) else \
+                    list(valor) if isinstance(valor, (list, tuple)) else [valor]
+                # nomes importados dentro da função (não estão no escopo global)
+                candidatos += [getattr(m, nome, None) for m in modulos]
+                pendentes += [c for c in candidatos if (inspect.isfunction(c) or inspect.isclass(c)) and _eh_local(c)]
+    return [vistos[i] for i in sorted(vistos)]
+
+
+def _hash_codigo(h, funcao):
+    for f in dependencias_codigo(funcao):
+        try:
+            h.update(inspect.getsource(f).encode())
+        except (OSError, TypeError):
+            h.update(f.__code__.co_code)
+
+
+class CacheArtefatos:
+    """Cache persistente de artefatos em disco; com ativo=False apenas executa as etapas"""
+
+    def __init__(self, pasta=PASTA_PADRAO, limite_mb=LIMITE_PADRAO_MB, ativo=True):
+        self.pasta = pasta
+        self.limite_bytes = int(limite_mb * 1024 ** 2)
+        self.ativo = ativo
+        self.caminho_manifesto = os.path.join(pasta, "manifesto.json")
+        self.caminho_trava = os.path.join(pasta, "manifesto.lock")
+        self.manifesto = {}
+        self._removidas = set()
+        if ativo:
+            os.makedirs(os.path.join(pasta, "objetos"), exist_ok=True)
+            if os.path.exists(self.caminho_manifesto):
+                with open(self.caminho_manifesto, encoding="utf-8") as f:
+                    self.manifesto = json.load(f)
+
+    def chave(self, nome, dados=None, funcao=None, parametros=None):
+        """Hash de (nome, colunas de entrada, código, parâmetros) que identifica um artefato"""
+        h = hashlib.sha256(nome.encode())
+        if dados is not None:
+            _hash_dados(h, dados)
+        if funcao is not None:
+            _hash_codigo(h, funcao)
+        h.update(json.dumps(parametros, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def executar(self, nome, saidas, produzir, dados=None, funcao=None, parametros=None):
+        """
+        Executa produzir() (que grava os arquivos 'saidas' e retorna um valor serializável
+        em JSON, ou None) apenas se não houver entrada válida no cache para a chave.
+        Retorna o valor de produzir(), guardado no manifesto quando vem do cache.
+        """
+        if not self.ativo:
+            return produzir()
+
+        chave = self.chave(nome, dados=dados, funcao=funcao, parametros=parametros)
+        entrada = self.manifesto.get(chave)
+        if entrada is not None and self._restaurar(entrada):
+            entrada["ultimo_acesso"] = time.time()
+            self._salvar_manifesto()
+            print(f"[CACHE] '{nome}' sem alterações; etapa pulada.")
+            return entrada["resultado"]
+
+        resultado = produzir()
+        self.manifesto[chave] = {
+            "nome": nome,
+            "saidas": [self._guardar(caminho) for caminho in saidas],
+            "resultado": resultado,
+            "ultimo_acesso": time.time(),
+        }
+        self._salvar_manifesto(limpar=True)
+        return resultado
+
+    # ----- internos -----
+    def _objeto(self, sha):
+        return os.path.join(self.pasta, "objetos", sha)
+
+    def _guardar(self, caminho):
+        sha = hash_arquivo(caminho)
+        if not os.path.exists(self._objeto(sha)):
+            shutil.copyfile(caminho, self._objeto(sha))
+        estado = os.stat(caminho)
+        return {"caminho": os.path.abspath(caminho), "sha256": sha,
+                "tamanho": estado.st_size, "mtime_ns": estado.st_mtime_ns}
+
+    def _restaurar(self, entrada):
+        """Garante que as saídas da entrada existem com o conteúdo guardado; False se impossível"""
+        for saida in entrada["saidas"]:
+            if not os.path.exists(self._objeto(saida["sha256"])):
+                return False
+        for saida in entrada["saidas"]:
+            caminho = saida["caminho"]
+            if os.path.exists(caminho):
+                estado = os.stat(caminho)
+                if estado.st_size == saida["tamanho"] and estado.st_mtime_ns == saida["mtime_ns"]:
+                    continue
+            os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+            shutil.copyfile(self._objeto(saida["sha256"]), caminho)
+            saida["mtime_ns"] = os.stat(caminho).st_mtime_ns
+        return True
+
+    def _remover_excedente(self):
+        """Remove as entradas usadas há mais tempo até o total de objetos caber no limite"""
+        def objetos_em_uso():
+            return {s["sha256"] for e in self.manifesto.values() for s in e["saidas"]}
+
+        def tamanho_total(shas):
+            return sum(os.path.getsize(self._objeto(s)) for s in shas if os.path.exists(self._objeto(s)))
+
+        em_uso = objetos_em_uso()
+        total = tamanho_total(em_uso)
+        for chave in sorted(self.manifesto, key=lambda c: self.manifesto[c]["ultimo_acesso"]):
+            if total <= self.limite_bytes or len(self.manifesto) <= 1:
+                break
+            del self.manifesto[chave]
+            self._removidas.add(chave)
+            restantes = objetos_em_uso()
+            for sha in em_uso - restantes:
+                if os.path.exists(self._objeto(sha)):
+                    total -= os.path.getsize(self._objeto(sha))
+                    os.remove(self._objeto(sha))
+            em_uso = restantes
+
+    def _salvar_manifesto(self, limpar=False):
+        """Mescla com o manifesto em disco e o substitui (com limpar=True, aplica o limite de tamanho)"""
+        # sob a trava: outro processo não grava entre a leitura e a substituição
+        with _trava(self.caminho_trava):
+            # entradas gravadas por outro processo desde a leitura do manifesto
+            if os.path.exists(self.caminho_manifesto):
+                with open(self.caminho_manifesto, encoding="utf-8") as f:
+                    for chave, entrada in json.load(f).items():
+                        if chave not in self._removidas:
+                            self.manifesto.setdefault(chave, entrada)
+            if limpar:
+                # depois da mescla: um objeto só é apagado se nenhuma entrada (de nenhum processo) o usa
+                self._remover_excedente()
+            temporario = f"{self.caminho_manifesto}.{os.getpid()}.tmp"
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(self.manifesto, f, indent=1, default=float)
+            os.replace(temporario, self.caminho_manifesto)
@@ -0,0 +1,173 @@
+"""
+cache_http.py
+Cache persistente em disco das respostas HTTP da coleta (coleta_github.py).
+- Cada resposta 200 guarda o corpo em <pasta>/respostas/<sha256 da URL> e, no índice
+  <pasta>/manifesto.json, os validadores (ETag, Last-Modified), os cabeçalhos usados pela
+  coleta (ex.: Link) e o horário em que foi obtida/revalidada
+- Dentro do TTL a resposta guardada é usada sem ir à rede; depois dele a requisição vai com
+  If-None-Match/If-Modified-Since e um 304 reaproveita o corpo guardado (no GitHub, 304 não
+  consome a cota de requisições); se o corpo saiu do cache enquanto a requisição estava em
+  andamento, a resposta guardada é None e a coleta refaz o GET sem validadores
+- Acima de 'limite_mb' as entradas usadas há mais tempo (LRU) são removidas; o índice é um
+  dict na ordem de uso, salvo uma vez ao fim da coleta (salvar)
+- Ao abrir, o índice é conferido com os arquivos de respostas/: corpos sem entrada (coleta
+  interrompida antes de salvar) e temporários são apagados, entradas sem corpo descartadas
+  e os tamanhos relidos do disco, então uma queda nunca deixa órfãos nem desconta o limite
+- Contadores de acertos, revalidações, downloads e remoções para o relatório da coleta
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from cliente_http import RespostaHTTP
+
+PASTA_PADRAO = ".cache_http"
+TTL_PADRAO = 3600.0
+LIMITE_PADRAO_MB = 256
+# cabeçalhos da resposta guardados com o corpo (os de limite de taxa vêm sempre da rede)
+CABECALHOS_GUARDADOS = ["content-type", "link", "etag", "last-modified"]
+
+
+class CacheHTTP:
+    """Respostas GET por URL em disco, com validadores, TTL e remoção LRU"""
+
+    def __init__(self, pasta=PASTA_PADRAO, ttl=TTL_PADRAO, limite_mb=LIMITE_PADRAO_MB):
+        self.pasta = pasta
+        self.ttl = ttl
+        self.limite_bytes = int(limite_mb * 1024 ** 2)
+        self.caminho_manifesto = os.path.join(pasta, "manifesto.json")
+        os.makedirs(os.path.join(pasta, "respostas"), exist_ok=True)
+        self.manifesto = {}
+        if os.path.exists(self.caminho_manifesto):
+            with open(self.caminho_manifesto, encoding="utf-8") as f:
+                self.manifesto = json.load(f)
+        self.acertos = 0
+        self.revalidadas = 0
+        self.baixadas = 0
+        self.removidas = 0
+        self.orfaos = 0
+        self._conferir_disco()
+        # o limite pode ter diminuído desde a última coleta
+        self._remover_excedente()
+
+    def _conferir_disco(self):
+        """Alinha o índice com os arquivos de respostas/ (ver docstring do módulo)"""
+        no_disco = {nome: os.path.getsize(os.path.join(self.pasta, "respostas", nome))
+                    for nome in os.listdir(os.path.join(self.pasta, "respostas"))}
+        self.manifesto = {chave: {**entrada, "tamanho": no_disco[chave]}
+                          for chave, entrada in self.manifesto.items() if chave in no_disco}
+        for nome in no_disco.keys() - self.manifesto.keys():
+            os.remove(os.path.join(self.pasta, "respostas", nome))
+            self.orfaos += 1
+        self.total_bytes = sum(e["tamanho"] for e in self.manifesto.values())
+
+    @staticmethod
+    def chave(url):
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _arquivo(self, chave):
+        return os.path.join(self.pasta, "respostas", chave)
+
+    def consultar(self, url):
+        """Entrada guardada para a URL (None se não houver); conta como uso para o LRU"""
+        chave = self.chave(url)
+        entrada = self.manifesto.pop(chave, None)
+        if entrada is None or not os.path.exists(self._arquivo(chave)):
+            if entrada is not None:
+                self.total_bytes -= entrada["tamanho"]
+            return None
+        # reinserida no fim: a ordem do dict é a ordem de uso
+        self.manifesto[chave] = entrada
+        return entrada
+
+    def fresca(self, entrada):
+        return entrada is not None and time.time() - entrada["validada_em"] < self.ttl
+
+    def validadores(self, entrada):
+        """Cabeçalhos de requisição condicional para revalidar a entrada"""
+        if entrada is None:
+            return {}
+        cabecalhos = {}
+        if "etag" in entrada["cabecalhos"]:
+            cabecalhos["If-None-Match"] = entrada["cabecalhos"]["etag"]
+        if "last-modified" in entrada["cabecalhos"]:
+            cabecalhos["If-Modified-Since"] = entrada["cabecalhos"]["last-modified"]
+        return cabecalhos
+
+    def resposta(self, entrada, cabecalhos_rede=None):
+        """
+        RespostaHTTP com o corpo guardado (acerto dentro do TTL ou revalidação por 304); None
+        se o corpo não está mais em disco (removido pelo LRU depois de consultar)
+        """
+        try:
+            with open(self._arquivo(self.chave(entrada["url"])), "rb") as f:
+                corpo = f.read()
+        except FileNotFoundError:
+            self._esquecer(entrada)
+            return None
+        return RespostaHTTP(entrada["status"], {**entrada["cabecalhos"], **(cabecalhos_rede or {})}, corpo)
+
+    def _esquecer(self, entrada):
+        chave = self.chave(entrada["url"])
+        if self.manifesto.get(chave) is entrada:
+            self.total_bytes -= self.manifesto.pop(chave)["tamanho"]
+
+    def acerto(self, entrada):
+        """Resposta guardada dentro do TTL (None se o corpo sumiu: ver resposta)"""
+        resposta = self.resposta(entrada)
+        if resposta is not None:
+            self.acertos += 1
+        return resposta
+
+    def revalidar(self, entrada, resposta_304):
+        """
+        Renova a entrada após um 304 e devolve a resposta guardada (com os cabeçalhos de cota do
+        304); None se o corpo foi removido nesse meio tempo, e aí o GET precisa ser refeito completo
+        """
+        cota = {k: v for k, v in resposta_304.cabecalhos.items() if k.startswith("x-ratelimit-")}
+        resposta = self.resposta(entrada, cota)
+        if resposta is not None:
+            self.revalidadas += 1
+            entrada["validada_em"] = time.time()
+        return resposta
+
+    def guardar(self, url, resposta):
+        """Guarda uma resposta 200 baixada da rede"""
+        self.baixadas += 1
+        chave = self.chave(url)
+        anterior = self.manifesto.pop(chave, None)
+        if anterior is not None:
+            self.total_bytes -= anterior["tamanho"]
+        temporario = self._arquivo(chave) + ".tmp"
+        with open(temporario, "wb") as f:
+            f.write(resposta.corpo)
+        os.replace(temporario, self._arquivo(chave))
+        self.manifesto[chave] = {
+            "url": url, "status": resposta.status, "tamanho": len(resposta.corpo), "validada_em": time.time(),
+            "cabecalhos": {k: resposta.cabecalhos[k] for k in CABECALHOS_GUARDADOS if k in resposta.cabecalhos},
+        }
+        self.total_bytes += len(resposta.corpo)
+        self._remover_excedente()
+
+    def _remover_excedente(self):
+        """Remove as entradas usadas há mais tempo (início do dict) até caber no limite"""
+        while self.total_bytes > self.limite_bytes and len(self.manifesto) > 1:
+            chave = next(iter(self.manifesto))
+            self.total_bytes -= self.manifesto.pop(chave)["tamanho"]
+            if os.path.exists(self._arquivo(chave)):
+                os.remove(self._arquivo(chave))
+            self.removidas += 1
+
+    def salvar(self):
+        temporario = self.caminho_manifesto + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump(self.manifesto, f)
+        os.replace(temporario, self.caminho_manifesto)
+
+    def relatorio(self):
+        orfaos = f", {self.orfaos} órfãs apagadas" if self.orfaos else ""
+        return (f"[CACHE] HTTP: {self.acertos} acertos (TTL), {self.revalidadas} revalidadas (304), "
+                f"{self.baixadas} baixadas, {self.removidas} removidas (LRU){orfaos}; "
+                f"{len(self.manifesto)} entradas, {self.total_bytes / 1024 ** 2:.1f} MB em {self.pasta}")
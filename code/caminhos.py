@@ -0,0 +1,20 @@
+"""
+caminhos.py
+Caminhos canônicos dos dados e saídas compartilhados pelos scripts 01-04 e pelo pipeline
+(pipeline.py), relativos à raiz do repositório e não à pasta de onde o script é chamado.
+- data/repositorios.parquet: dataset de repositórios (gravado por 01, lido por 02 e 04)
+- data/metricas_engajamento.csv: métricas de engajamento (lidas por 03)
+- outputs/: gráficos, resumos e o dashboard
+- outputs/cubo_agregado: cubo de agregados (gravado por 02 ou 04, o primeiro que rodar; lido por ambos)
+"""
+
+import os
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DATA_DIR = os.path.join(RAIZ, "data")
+OUTPUT_DIR = os.path.join(RAIZ, "outputs")
+
+DATASET_REPOSITORIOS = os.path.join(DATA_DIR, "repositorios.parquet")
+DATASET_ENGAJAMENTO = os.path.join(DATA_DIR, "metricas_engajamento.csv")
+DASHBOARD = os.path.join(OUTPUT_DIR, "dashboard_completo_sem_iframes.html")
+CUBO = os.path.join(OUTPUT_DIR, "cubo_agregado")
@@ -0,0 +1,152 @@
+"""
+cliente_http.py
+Cliente HTTP/1.1 assíncrono (asyncio) mínimo, só com a biblioteca padrão, usado pela coleta
+de dados da API do GitHub (coleta_github.py).
+- Pool de conexões keep-alive: no máximo 'conexoes' requisições em andamento (e conexões
+  abertas); cada requisição reaproveita uma conexão ociosa ou abre uma nova e a devolve ao pool
+- Corpo lido por Content-Length ou chunked; sem compressão (Accept-Encoding: identity) e sem
+  seguir redirecionamentos
+- Uma conexão reaproveitada que o servidor já fechou é descartada e a requisição é repetida
+  uma vez em uma conexão nova; demais falhas sobem para quem chamou (que decide se repete)
+- asyncio e ssl só são importados quando o cliente é usado (adiado.py), não por quem só
+  precisa de RespostaHTTP (cache_http.py)
+"""
+
+import json
+from urllib.parse import urlencode, urlsplit
+
+from adiado import ModuloAdiado
+
+asyncio = ModuloAdiado("asyncio")
+ssl = ModuloAdiado("ssl")
+
+CONEXOES_PADRAO = 16
+TIMEOUT_PADRAO = 30.0
+# respostas sem corpo mesmo quando não há Content-Length
+STATUS_SEM_CORPO = {204, 304}
+
+
+class RespostaHTTP:
+    """Status, cabeçalhos (nomes em minúsculas) e corpo de uma resposta"""
+
+    def __init__(self, status, cabecalhos, corpo):
+        self.status = status
+        self.cabecalhos = cabecalhos
+        self.corpo = corpo
+
+    def json(self):
+        return json.loads(self.corpo)
+
+
+class ClienteHTTP:
+    """Requisições GET a um único host (url_base), com pool de conexões keep-alive"""
+
+    def __init__(self, url_base, conexoes=CONEXOES_PADRAO, cabecalhos=None, timeout=TIMEOUT_PADRAO):
+        partes = urlsplit(url_base)
+        self.url_base = url_base.rstrip("/")
+        self.https = partes.scheme == "https"
+        self.host = partes.hostname
+        self.porta = partes.port or (443 if self.https else 80)
+        self.prefixo = partes.path.rstrip("/")
+        self.cabecalhos = {"Host": partes.netloc, "User-Agent": "lab-medicao-coleta",
+                           "Accept-Encoding": "identity", "Connection": "keep-alive", **(cabecalhos or {})}
+        self.timeout = timeout
+        self._vagas = asyncio.Semaphore(conexoes)
+        self._ociosas = []
+        # contadores para o relatório da coleta
+        self.requisicoes = 0
+        self.conexoes_abertas = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *excecao):
+        self.fechar()
+
+    async def _abrir(self):
+        contexto = ssl.create_default_context() if self.https else None
+        conexao = await asyncio.open_connection(self.host, self.porta, ssl=contexto)
+        self.conexoes_abertas += 1
+        return conexao
+
+    @staticmethod
+    def _descartar(conexao):
+        conexao[1].close()
+
+    def fechar(self):
+        """Fecha as conexões ociosas do pool"""
+        while self._ociosas:
+            self._descartar(self._ociosas.pop())
+
+    def url(self, caminho, params=None):
+        """URL completa de uma requisição (chave do cache de respostas)"""
+        return self.url_base + caminho + ("?" + urlencode(params) if params else "")
+
+    async def get(self, caminho, params=None, cabecalhos=None):
+        """GET em url_base + caminho (+ params na query string); retorna RespostaHTTP"""
+        alvo = self.prefixo + caminho + ("?" + urlencode(params) if params else "")
+        async with self._vagas:
+            for tentativa in range(2):
+                reaproveitada = bool(self._ociosas)
+                conexao = self._ociosas.pop() if reaproveitada else await self._abrir()
+                try:
+                    resposta, manter = await asyncio.wait_for(self._trocar(conexao, alvo, cabecalhos), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    self._descartar(conexao)
+                    # o servidor pode fechar uma conexão ociosa a qualquer momento
+                    if reaproveitada and tentativa == 0:
+                        continue
+                    raise
+                except BaseException:
+                    self._descartar(conexao)
+                    raise
+                if manter:
+                    self._ociosas.append(conexao)
+                else:
+                    self._descartar(conexao)
+                self.requisicoes += 1
+                return resposta
+
+    async def _trocar(self, conexao, alvo, cabecalhos):
+        """Envia a requisição e lê a resposta; retorna (RespostaHTTP, conexão pode ser reaproveitada)"""
+        leitor, escritor = conexao
+        linhas = [f"GET {alvo} HTTP/1.1"]
+        linhas += [f"{nome}: {valor}" for nome, valor in {**self.cabecalhos, **(cabecalhos or {})}.items()]
+        escritor.write(("\r\n".join(linhas) + "\r\n\r\n").encode("latin-1"))
+        await escritor.drain()
+
+        linha_status = await leitor.readline()
+        if not linha_status:
+            raise ConnectionResetError("conexão fechada pelo servidor")
+        status = int(linha_status.split()[1])
+        recebidos = {}
+        while True:
+            linha = await leitor.readline()
+            if linha in (b"\r\n", b"\n", b""):
+                break
+            nome, _, valor = linha.decode("latin-1").partition(":")
+            nome = nome.strip().lower()
+            recebidos[nome] = f"{recebidos[nome]}, {valor.strip()}" if nome in recebidos else valor.strip()
+
+        manter = recebidos.get("connection", "").lower() != "close"
+        if recebidos.get("transfer-encoding", "").lower() == "chunked":
+            partes = []
+            while True:
+                tamanho = int((await leitor.readline()).split(b";")[0], 16)
+                if tamanho == 0:
+                    # trailers (ignorados) até a linha em branco
+                    while (await leitor.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                partes.append(await leitor.readexactly(tamanho))
+                await leitor.readexactly(2)
+            corpo = b"".join(partes)
+        elif "content-length" in recebidos:
+            corpo = await leitor.readexactly(int(recebidos["content-length"]))
+        elif status in STATUS_SEM_CORPO or status < 200:
+            corpo = b""
+        else:
+            # sem tamanho declarado: o corpo vai até o servidor fechar a conexão
+            corpo = await leitor.read()
+            manter = False
+        return RespostaHTTP(status, recebidos, corpo), manter
@@ -0,0 +1,290 @@
+"""
+coleta_github.py
+Coleta assíncrona de métricas de repositórios pela API REST do GitHub, gravadas no mesmo
+esquema do dataset simulado de 01_coleta_dados.py (e, opcionalmente, no de
+data/metricas_engajamento.csv).
+- 1ª fase: páginas da busca de repositórios (/search/repositories); a primeira informa o
+  total e as demais são pedidas ao mesmo tempo
+- 2ª fase: por repositório, as contagens que a busca não traz (contributors, commits, pull
+  requests, issues abertas e fechadas, README), todas as requisições concorrentes
+- Contagens de listas usam per_page=1 e o número da página rel="last" do cabeçalho Link:
+  uma requisição por contagem, sem paginar as listas
+- Conexões keep-alive reaproveitadas (ClienteHTTP) e no máximo 'concorrencia' requisições
+  em andamento (semáforo)
+- Incremental (existente=dataset já coletado): a busca continua completa, mas as contagens
+  só são pedidas para repositórios novos ou com updated_at mais recente que o guardado
+  (incremental.py); o resultado traz só essas linhas, para o upsert
+- Com um CacheHTTP (cache_http.py), respostas dentro do TTL não vão à rede e as demais são
+  revalidadas com requisições condicionais (304 reaproveita o corpo guardado)
+- Limite de taxa: 403/429 com X-RateLimit-Remaining: 0 ou Retry-After suspendem todas as
+  requisições até o horário indicado pelo servidor (o mesmo quando a cota chega a zero numa
+  resposta de sucesso); 5xx e falhas de conexão são repetidos com backoff exponencial e jitter
+"""
+
+import math
+import random
+import re
+import time
+
+from adiado import ModuloAdiado
+from cliente_http import ClienteHTTP
+from incremental import FORMATO_INSTANTE, instantes, linhas_alteradas, recalcular_derivadas
+from metricas import METRICAS_ENGAJAMENTO, calcular_metricas
+
+asyncio = ModuloAdiado("asyncio")
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+
+URL_API = "https://api.github.com"
+CONSULTA_PADRAO = "stars:>1000"
+CONCORRENCIA_PADRAO = 16
+TENTATIVAS_PADRAO = 5
+BACKOFF_PADRAO = 1.0
+# a busca do GitHub devolve no máximo 1000 resultados, em páginas de até 100
+MAXIMO_BUSCA = 1000
+POR_PAGINA_BUSCA = 100
+
+# colunas do dataset, na ordem de 01_coleta_dados.py
+COLUNAS_DATASET = ["repositorio", "linguagem", "stars", "forks", "issues_abertas", "issues_fechadas",
+                   "total_issues", "taxa_resolucao_issues", "pull_requests", "contributors", "commits",
+                   "commits_por_mes", "tamanho_kb", "created_at", "updated_at", "idade_dias",
+                   "dias_desde_update", "tem_wiki", "tem_readme", "licenca", "categoria"]
+
+# colunas preenchidas pela 2ª fase (ColetorGitHub.detalhar)
+COLUNAS_DETALHES = ["contributors", "commits", "pull_requests", "issues_abertas", "issues_fechadas", "tem_readme"]
+
+# categoria (mesmos nomes de 01_coleta_dados.py) pelo primeiro tópico reconhecido do repositório
+TOPICOS_CATEGORIA = {
+    "Machine Learning": {"machine-learning", "deep-learning", "ai", "llm", "pytorch", "tensorflow", "nlp"},
+    "Data Science": {"data-science", "data-analysis", "pandas", "jupyter", "data-visualization", "statistics"},
+    "Web Development": {"web", "frontend", "react", "vue", "angular", "nextjs", "css", "html", "backend"},
+    "Mobile": {"android", "ios", "mobile", "flutter", "react-native", "swiftui"},
+    "DevOps": {"devops", "kubernetes", "docker", "ci", "infrastructure", "terraform", "monitoring"},
+    "Games": {"game", "gamedev", "game-engine", "games"},
+    "System Tools": {"cli", "terminal", "shell", "linux", "command-line", "tool", "database"},
+    "Libraries": {"library", "framework", "sdk", "api"},
+}
+CATEGORIA_PADRAO = "Outros"
+
+_LINK_ULTIMA = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+
+def ultima_pagina(link):
+    """Número da página rel="last" de um cabeçalho Link (None se não houver)"""
+    encontrado = _LINK_ULTIMA.search(link or "")
+    return int(encontrado.group(1)) if encontrado else None
+
+
+def categoria_por_topicos(topicos):
+    topicos = set(topicos or [])
+    for categoria, chaves in TOPICOS_CATEGORIA.items():
+        if topicos & chaves:
+            return categoria
+    return CATEGORIA_PADRAO
+
+
+class ColetorGitHub:
+    """Requisições à API com repetições, espera pelo limite de taxa e contadores para o relatório"""
+
+    def __init__(self, url_api=URL_API, token=None, concorrencia=CONCORRENCIA_PADRAO,
+                 tentativas=TENTATIVAS_PADRAO, backoff=BACKOFF_PADRAO, cache=None):
+        self.url_api = url_api
+        self.token = token
+        self.concorrencia = concorrencia
+        self.tentativas = tentativas
+        self.backoff = backoff
+        self.cache = cache
+        self.cliente = None
+        self._vagas = None
+        # horário (time.time) até o qual nenhuma requisição é enviada
+        self._liberado_em = 0.0
+        self.repeticoes = 0
+        self.esperas_limite = 0
+
+    async def __aenter__(self):
+        cabecalhos = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+        if self.token:
+            cabecalhos["Authorization"] = f"Bearer {self.token}"
+        self.cliente = ClienteHTTP(self.url_api, conexoes=self.concorrencia, cabecalhos=cabecalhos)
+        self._vagas = asyncio.Semaphore(self.concorrencia)
+        return self
+
+    async def __aexit__(self, *excecao):
+        self.cliente.fechar()
+        if self.cache is not None:
+            self.cache.salvar()
+
+    def _suspender_ate(self, horario):
+        self._liberado_em = max(self._liberado_em, horario)
+
+    def _espera_limite(self, resposta):
+        """Horário para tentar de novo se a resposta é de limite de taxa; None caso contrário"""
+        cabecalhos = resposta.cabecalhos
+        if resposta.status not in (403, 429):
+            return None
+        if "retry-after" in cabecalhos:
+            return time.time() + float(cabecalhos["retry-after"])
+        if cabecalhos.get("x-ratelimit-remaining") == "0" and "x-ratelimit-reset" in cabecalhos:
+            return float(cabecalhos["x-ratelimit-reset"]) + 1
+        return None
+
+    async def get(self, caminho, params=None, aceitos=(200,)):
+        """GET com repetições; retorna a resposta quando o status está em 'aceitos'"""
+        url, entrada, condicionais = None, None, None
+        if self.cache is not None:
+            url = self.cliente.url(caminho, params)
+            entrada = self.cache.consultar(url)
+            if self.cache.fresca(entrada):
+                resposta = self.cache.acerto(entrada)
+                if resposta is not None:
+                    return resposta
+                entrada = None
+            condicionais = self.cache.validadores(entrada)
+        falhas = 0
+        while True:
+            try:
+                async with self._vagas:
+                    # a suspensão é conferida já com a vaga: quem estava na fila não passa direto
+                    while time.time() < self._liberado_em:
+                        await asyncio.sleep(self._liberado_em - time.time())
+                    resposta = await self.cliente.get(caminho, params, condicionais)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as erro:
+                motivo = f"{type(erro).__name__}: {erro}"
+            else:
+                if resposta.status == 304 and entrada is not None:
+                    resposta = self.cache.revalidar(entrada, resposta)
+                    if resposta is None:
+                        # o corpo saiu do cache (LRU) durante a requisição: GET completo, sem validadores
+                        entrada, condicionais = None, None
+                        continue
+                elif resposta.status == 200 and self.cache is not None:
+                    self.cache.guardar(url, resposta)
+                # limite de taxa antes de 'aceitos': um 403 aceito (lista grande demais) não é esse caso
+                horario = self._espera_limite(resposta)
+                if horario is not None:
+                    self.esperas_limite += 1
+                    self._suspender_ate(horario)
+                    continue
+                if resposta.status in aceitos:
+                    if resposta.cabecalhos.get("x-ratelimit-remaining") == "0":
+                        # cota esgotada: as próximas requisições esperam o reset
+                        self._suspender_ate(float(resposta.cabecalhos.get("x-ratelimit-reset", 0)) + 1)
+                    return resposta
+                if resposta.status < 500:
+                    raise RuntimeError(f"GET {caminho} respondeu HTTP {resposta.status}: {resposta.corpo[:200]!r}")
+                motivo = f"HTTP {resposta.status}"
+            falhas += 1
+            if falhas > self.tentativas:
+                raise RuntimeError(f"GET {caminho} falhou após {falhas} tentativas ({motivo})")
+            self.repeticoes += 1
+            await asyncio.sleep(self.backoff * 2 ** (falhas - 1) * (0.5 + random.random()))
+
+    # ----- 1ª fase: busca -----
+    async def buscar(self, consulta=CONSULTA_PADRAO, limite=MAXIMO_BUSCA):
+        """Itens da busca de repositórios (ordem decrescente de stars), até 'limite'"""
+        limite = min(limite, MAXIMO_BUSCA)
+        por_pagina = min(POR_PAGINA_BUSCA, limite)
+        params = lambda pagina: {"q": consulta, "sort": "stars", "order": "desc",
+                                 "per_page": por_pagina, "page": pagina}
+        primeira = (await self.get("/search/repositories", params(1))).json()
+        paginas = math.ceil(min(primeira["total_count"], limite) / por_pagina)
+        restantes = await asyncio.gather(*(self.get("/search/repositories", params(p))
+                                           for p in range(2, paginas + 1)))
+        itens = primeira["items"] + [item for resposta in restantes for item in resposta.json()["items"]]
+        return itens[:limite]
+
+    # ----- 2ª fase: contagens por repositório -----
+    async def contar(self, caminho, **params):
+        """Tamanho de uma lista paginada (per_page=1: número da última página)"""
+        resposta = await self.get(caminho, {**params, "per_page": 1}, aceitos=(200, 204, 403, 409))
+        if resposta.status == 403:
+            # lista grande demais para a API (ex.: contributors de repositórios enormes)
+            return np.nan
+        if resposta.status != 200:
+            # 204: lista vazia; 409: repositório sem commits
+            return 0
+        ultima = ultima_pagina(resposta.cabecalhos.get("link"))
+        return ultima if ultima is not None else len(resposta.json())
+
+    async def total_busca_issues(self, consulta):
+        resposta = await self.get("/search/issues", {"q": consulta, "per_page": 1})
+        return resposta.json()["total_count"]
+
+    async def detalhar(self, item):
+        """Contagens de um repositório (item da busca)"""
+        nome = item["full_name"]
+        repo = f"/repos/{nome}"
+        contagens = await asyncio.gather(
+            self.contar(f"{repo}/contributors", anon="true"),
+            self.contar(f"{repo}/commits"),
+            self.contar(f"{repo}/pulls", state="all"),
+            self.total_busca_issues(f"repo:{nome} type:issue state:open"),
+            self.total_busca_issues(f"repo:{nome} type:issue state:closed"),
+            self.get(f"{repo}/readme", aceitos=(200, 404)),
+        )
+        contributors, commits, pull_requests, abertas, fechadas, readme = contagens
+        return {"contributors": contributors, "commits": commits, "pull_requests": pull_requests,
+                "issues_abertas": abertas, "issues_fechadas": fechadas, "tem_readme": readme.status == 200}
+
+    async def coletar(self, consulta=CONSULTA_PADRAO, limite=MAXIMO_BUSCA, data_referencia=None, existente=None):
+        inicio = time.perf_counter()
+        itens = await self.buscar(consulta, limite)
+        if existente is not None:
+            # updated_at com resolução de segundo, como é guardado (montar_dataset)
+            candidatos = pd.DataFrame({"repositorio": [item["full_name"] for item in itens],
+                                       "updated_at": instantes([item["updated_at"] for item in itens])
+                                       .strftime(FORMATO_INSTANTE)})
+            alterados = linhas_alteradas(existente, candidatos)
+            print(f"[INFO] Incremental: {int(alterados.sum())} de {len(itens)} repositórios novos ou atualizados")
+            itens = [item for item, alterado in zip(itens, alterados) if alterado]
+        print(f"[INFO] Busca: {len(itens)} repositórios; coletando contagens por repositório...")
+        detalhes = await asyncio.gather(*(self.detalhar(item) for item in itens))
+        df = montar_dataset(itens, detalhes, data_referencia)
+        duracao = time.perf_counter() - inicio
+        requisicoes = self.cliente.requisicoes
+        print(f"[OK] {len(df)} repositórios, {requisicoes} requisições em {duracao:.1f}s "
+              f"({requisicoes / max(duracao, 1e-9):.0f} req/s, {self.cliente.conexoes_abertas} conexões abertas, "
+              f"{self.repeticoes} repetições, {self.esperas_limite} esperas por limite de taxa)")
+        if self.cache is not None:
+            print(self.cache.relatorio())
+        return df
+
+
+def montar_dataset(itens, detalhes, data_referencia=None):
+    """DataFrame no esquema de COLUNAS_DATASET a partir dos itens da busca e das contagens"""
+    df = pd.DataFrame({
+        "repositorio": [item["full_name"] for item in itens],
+        "linguagem": [item.get("language") for item in itens],
+        "stars": [item["stargazers_count"] for item in itens],
+        "forks": [item["forks_count"] for item in itens],
+        "tamanho_kb": [item.get("size", 0) for item in itens],
+        "created_at": pd.to_datetime([item["created_at"] for item in itens], utc=True).tz_localize(None),
+        "updated_at": pd.to_datetime([item["updated_at"] for item in itens], utc=True).tz_localize(None),
+        "tem_wiki": [bool(item.get("has_wiki")) for item in itens],
+        "licenca": [(item.get("license") or {}).get("spdx_id") or "None" for item in itens],
+        "categoria": [categoria_por_topicos(item.get("topics")) for item in itens],
+    })
+    df = pd.concat([df, pd.DataFrame(detalhes, index=df.index, columns=COLUNAS_DETALHES)], axis=1)
+    df["created_at"] = df["created_at"].dt.strftime("%Y-%m-%d")
+    # updated_at com a hora: uma alteração no mesmo dia da coleta anterior não se perde no incremental
+    df["updated_at"] = df["updated_at"].dt.strftime(FORMATO_INSTANTE)
+    df = recalcular_derivadas(df, data_referencia)
+    # a busca pagina sobre um ranking que muda durante a coleta: um repositório pode aparecer duas vezes
+    return df[COLUNAS_DATASET].drop_duplicates("repositorio", ignore_index=True)
+
+
+def metricas_engajamento(df):
+    """Dataset coletado no esquema de data/metricas_engajamento.csv (lido por 03_analise_rqs.py)"""
+    engajamento = calcular_metricas(df, METRICAS_ENGAJAMENTO)
+    engajamento = engajamento.rename(columns={"repositorio": "full_name", "linguagem": "language"})
+    return engajamento[["full_name", "language", "stars", "forks", "contributors", "commits", *METRICAS_ENGAJAMENTO]]
+
+
+def coletar_repositorios(consulta=CONSULTA_PADRAO, limite=MAXIMO_BUSCA, url_api=URL_API, token=None,
+                         concorrencia=CONCORRENCIA_PADRAO, data_referencia=None, existente=None, **opcoes):
+    """Executa a coleta (ColetorGitHub.coletar) em um loop asyncio próprio e retorna o DataFrame"""
+    async def executar():
+        async with ColetorGitHub(url_api, token, concorrencia, **opcoes) as coletor:
+            return await coletor.coletar(consulta, limite, data_referencia, existente)
+
+    return asyncio.run(executar())
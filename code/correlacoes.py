@@ -0,0 +1,179 @@
+"""
+correlacoes.py
+Matrizes de correlação (Pearson e Spearman) e de p-valores entre todas as métricas numéricas.
+- Colunas sem valores ausentes: os dados são copiados uma vez para uma matriz (n x p),
+  padronizados no lugar e a matriz de Pearson sai de um único produto Zᵀ·Z; depois cada
+  coluna é trocada pelos seus postos (uma ordenação por coluna) e Spearman sai de outro
+  produto. Memória: um buffer n x p, sem cópias por par
+- Pares com alguma coluna incompleta usam só as linhas observadas nas duas (como
+  DataFrame.corr), calculados par a par; cada coluna é convertida e ordenada uma única vez
+  (_ordenar_coluna) e os postos de cada par saem dessa ordenação e da máscara de linhas
+  comuns em O(n), sem reordenar por par
+- p-valores vetorizados: t com n-2 g.l. por par (como scipy.stats.pearsonr/spearmanr)
+- salvar_correlacoes/carregar_correlacoes usam JSON; obter_correlacoes usa o CacheArtefatos
+  para só recalcular quando os dados mudam
+"""
+
+import json
+import os
+
+from adiado import ModuloAdiado
+
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+stats = ModuloAdiado("scipy.stats")
+
+MATRIZES = ["n", "pearson", "pearson_p", "spearman", "spearman_p"]
+
+
+def p_valores_correlacao(r, n):
+    """p-valores bilaterais de H0: correlação = 0 para arrays de r e n (t com n-2 g.l.)"""
+    r = np.clip(np.asarray(r, dtype=np.float64), -1.0, 1.0)
+    n = np.broadcast_to(np.asarray(n, dtype=np.float64), r.shape)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = r * np.sqrt((n - 2) / (1.0 - r * r))
+        p = 2 * stats.t.sf(np.abs(t), n - 2)
+    p = np.where(np.abs(r) == 1.0, 0.0, p)
+    return np.where(n > 2, p, np.nan)
+
+
+def _padronizar(matriz):
+    """Centra e divide cada coluna pela norma, no lugar (colunas constantes viram NaN)"""
+    matriz -= matriz.mean(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        matriz /= np.sqrt(np.einsum("ij,ij->j", matriz, matriz))
+
+
+def _produto_correlacao(matriz):
+    correlacao = matriz.T @ matriz
+    np.fill_diagonal(correlacao, np.where(np.isnan(np.diag(correlacao)), np.nan, 1.0))
+    return np.clip(correlacao, -1.0, 1.0)
+
+
+def _ordenar_coluna(x):
+    """
+    (observados, ordem, bloco) de uma coluna com NaN: máscara das linhas observadas, essas
+    linhas em ordem crescente de valor e, para cada posição dessa ordem, o índice do seu
+    grupo de empates
+    """
+    observados = ~np.isnan(x)
+    linhas = np.flatnonzero(observados)
+    ordem = linhas[np.argsort(x[linhas], kind="stable")]
+    ordenados = x[ordem]
+    bloco = np.zeros(len(ordem), dtype=np.int64)
+    np.cumsum(ordenados[1:] != ordenados[:-1], out=bloco[1:])
+    return observados, ordem, bloco
+
+
+def _postos_em(ordenacao, linhas):
+    """Postos médios (como stats.rankdata) da coluna restrita às linhas marcadas, na ordem das linhas"""
+    _, ordem, bloco = ordenacao
+    marcadas = linhas[ordem]
+    # por grupo de empates: quantas linhas marcadas ele tem e quantas vêm antes dele
+    por_bloco = np.bincount(bloco[marcadas], minlength=bloco[-1] + 1 if len(bloco) else 0)
+    posto_bloco = np.cumsum(por_bloco) - (por_bloco - 1) / 2
+    postos = np.empty(len(linhas))
+    postos[ordem[marcadas]] = posto_bloco[bloco[marcadas]]
+    return postos[linhas]
+
+
+def _par_incompleto(x, y, ordenacao_x, ordenacao_y):
+    """
+    (n, pearson, spearman) de um par usando apenas as linhas observadas nas duas colunas;
+    ordenacao_x/ordenacao_y vêm de _ordenar_coluna
+    """
+    validos = ordenacao_x[0] & ordenacao_y[0]
+    n = int(validos.sum())
+    if n < 2:
+        return n, np.nan, np.nan
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pearson = np.corrcoef(x[validos], y[validos])[0, 1]
+        spearman = np.corrcoef(_postos_em(ordenacao_x, validos), _postos_em(ordenacao_y, validos))[0, 1]
+    return n, pearson, spearman
+
+
+def matrizes_correlacao(df, colunas=None):
+    """
+    {"n", "pearson", "pearson_p", "spearman", "spearman_p"}: DataFrames coluna x coluna com o
+    número de pares observados, as correlações e os p-valores. colunas=None usa todas as
+    colunas numéricas (bool não entra).
+    """
+    if colunas is None:
+        colunas = [c for c in df.columns
+                   if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c])]
+    colunas = list(colunas)
+    p = len(colunas)
+    completas = [i for i, c in enumerate(colunas) if not df[c].isna().any()]
+    n_pares = np.full((p, p), len(df), dtype=np.float64)
+    pearson = np.full((p, p), np.nan)
+    spearman = np.full((p, p), np.nan)
+
+    # colunas completas: um buffer, dois produtos de matrizes
+    if completas:
+        buffer = np.empty((len(df), len(completas)), dtype=np.float64, order="F")
+        for j, i in enumerate(completas):
+            buffer[:, j] = df[colunas[i]].to_numpy(dtype=np.float64)
+        indice = np.ix_(completas, completas)
+        _padronizar(buffer)
+        pearson[indice] = _produto_correlacao(buffer)
+        for j in range(len(completas)):
+            # a padronização preserva a ordem, então os postos são os dos valores originais
+            buffer[:, j] = stats.rankdata(buffer[:, j])
+        _padronizar(buffer)
+        spearman[indice] = _produto_correlacao(buffer)
+        del buffer
+
+    # pares com alguma coluna incompleta: cada coluna é convertida e ordenada uma vez
+    incompletas = set(range(p)) - set(completas)
+    valores, ordenacoes = {}, {}
+    if incompletas:
+        for k in range(p):
+            valores[k] = df[colunas[k]].to_numpy(dtype=np.float64, na_value=np.nan)
+            ordenacoes[k] = _ordenar_coluna(valores[k])
+    for i in range(p):
+        for j in range(i, p):
+            if i in incompletas or j in incompletas:
+                n_pares[i, j], pearson[i, j], spearman[i, j] = _par_incompleto(
+                    valores[i], valores[j], ordenacoes[i], ordenacoes[j])
+                n_pares[j, i], pearson[j, i], spearman[j, i] = n_pares[i, j], pearson[i, j], spearman[i, j]
+
+    matrizes = {"n": n_pares, "pearson": pearson, "pearson_p": p_valores_correlacao(pearson, n_pares),
+                "spearman": spearman, "spearman_p": p_valores_correlacao(spearman, n_pares)}
+    return {nome: pd.DataFrame(valores, index=colunas, columns=colunas) for nome, valores in matrizes.items()}
+
+
+def salvar_correlacoes(matrizes, caminho):
+    """Grava as matrizes em JSON ({"colunas": [...], nome: [[...], ...]}; NaN vira null)"""
+    conteudo = {"colunas": list(matrizes["pearson"].columns)}
+    for nome in MATRIZES:
+        valores = matrizes[nome].to_numpy()
+        conteudo[nome] = [[None if np.isnan(v) else float(v) for v in linha] for linha in valores]
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(conteudo, f, indent=1)
+
+
+def carregar_correlacoes(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        conteudo = json.load(f)
+    colunas = conteudo["colunas"]
+    return {nome: pd.DataFrame(np.array(conteudo[nome], dtype=np.float64), index=colunas, columns=colunas)
+            for nome in MATRIZES}
+
+
+def obter_correlacoes(df, caminho, cache=None, colunas=None):
+    """
+    Matrizes de correlação de df, gravadas em 'caminho'. Com um CacheArtefatos ativo, só são
+    recalculadas quando os dados (hash das colunas usadas) ou o código mudam.
+    """
+    def produzir():
+        salvar_correlacoes(matrizes_correlacao(df, colunas), caminho)
+
+    if cache is None or not cache.ativo:
+        produzir()
+    else:
+        dados = df if colunas is None else df[list(colunas)]
+        cache.executar("correlacoes", [caminho], produzir, dados=dados,
+                       funcao=[matrizes_correlacao, _padronizar, _produto_correlacao, _par_incompleto,
+                               _ordenar_coluna, _postos_em, p_valores_correlacao, salvar_correlacoes])
+    return carregar_correlacoes(caminho)
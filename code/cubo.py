@@ -0,0 +1,281 @@
+"""
+cubo.py
+Cubo de agregados (linguagem × licença × categoria × mês × nível de documentação) usado
+pelos gráficos e tabelas de 02 e 04 no lugar de um groupby sobre o dataset inteiro por gráfico.
+- construir_cubo: um único groupby sobre as dimensões presentes no df guarda, por célula,
+  contagem, soma e soma dos quadrados dos desvios (m2) de cada métrica; contagens, médias
+  e desvios de qualquer combinação de dimensões saem do roll-up das células (fórmula de
+  Chan para m2), em O(células) e não O(linhas)
+- Quantis (mín, quartis, mediana, máx) e bigodes de boxplot não se combinam entre células:
+  são guardados por dimensão isolada e para o total, o que cobre medianas por linguagem,
+  licença etc. São exatos por padrão; com approx_quantiles=True vêm de sketches KLL
+  (sketches.py) lidos em blocos, com memória constante por grupo em vez de ordenar tudo
+- Matrizes de correlação (Pearson/Spearman e p-valores) entre as métricas vêm junto
+  (correlacoes.py), para o heatmap da RQ1.3
+- salvar_cubo/carregar_cubo persistem o cubo em uma pasta (Parquet + JSON);
+  obter_cubo usa o CacheArtefatos para só reconstruí-lo quando os dados mudam
+- 02 e 04 constroem o cubo com as mesmas colunas (colunas_do_cubo) na mesma pasta
+  (caminhos.CUBO): o que rodar depois reaproveita o cubo do outro
+"""
+
+import json
+import os
+
+from adiado import ModuloAdiado
+from armazenamento import carregar_tabela, colunas_disponiveis, salvar_tabela
+from caminhos import CUBO
+from correlacoes import carregar_correlacoes, matrizes_correlacao, salvar_correlacoes
+from sketches import K_PADRAO, resumo_boxplot, sketches_em_blocos
+
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+
+# dimensões na ordem em que aparecem nas células; as ausentes no df são ignoradas
+DIMENSOES = ["linguagem", "licenca", "categoria", "mes", "nivel_documentacao"]
+METRICAS = ["stars", "forks", "contributors", "commits", "pull_requests", "taxa_resolucao_issues"]
+# colunas brutas de que as dimensões derivadas dependem
+COLUNAS_DIMENSOES = ["linguagem", "licenca", "categoria", "created_at", "tem_readme", "tem_wiki"]
+COLUNAS_CUBO = COLUNAS_DIMENSOES + METRICAS
+NIVEIS_DOCUMENTACAO = ["Nenhuma", "README", "README + Wiki"]
+QUANTIS = {"min": 0.0, "25%": 0.25, "median": 0.5, "75%": 0.75, "max": 1.0}
+# extremos dos bigodes do boxplot: valor mais extremo dentro de 1,5·IQR dos quartis
+BIGODES = ["bigode_inferior", "bigode_superior"]
+WHIS = 1.5
+TOTAL = "_total"
+PASTA_PADRAO = CUBO
+ARQUIVOS = ["celulas.parquet", "quantis.parquet", "metadados.json", "correlacoes.json"]
+
+
+def colunas_do_cubo(caminho):
+    """Colunas de COLUNAS_CUBO presentes na tabela de 'caminho' (lidas só do esquema)"""
+    disponiveis = colunas_disponiveis(caminho)
+    return [c for c in COLUNAS_CUBO if c in disponiveis]
+
+
+def nivel_documentacao(df):
+    """Nível de documentação de cada repositório: Nenhuma, README ou README + Wiki"""
+    nivel = np.where(df["tem_readme"] == True, np.where(df["tem_wiki"] == True, 2, 1), 0)
+    return pd.Series(pd.Categorical.from_codes(nivel, categories=NIVEIS_DOCUMENTACAO), index=df.index)
+
+
+def _dimensoes(df):
+    """DataFrame com as colunas de dimensão (categóricas) que podem ser obtidas de df"""
+    dims = {}
+    for coluna in ["linguagem", "licenca", "categoria"]:
+        if coluna in df.columns:
+            dims[coluna] = df[coluna].astype("category")
+    if "created_at" in df.columns:
+        dims["mes"] = pd.to_datetime(df["created_at"]).dt.to_period("M").astype(str).astype("category")
+    if "tem_readme" in df.columns and "tem_wiki" in df.columns:
+        dims["nivel_documentacao"] = nivel_documentacao(df)
+    return pd.DataFrame(dims, index=df.index)
+
+
+class CuboAgregado:
+    """Células do cubo + quantis por dimensão + correlações; agregações respondem em O(grupos)"""
+
+    def __init__(self, celulas, quantis, metadados, correlacoes):
+        self.celulas = celulas
+        self.quantis = quantis
+        self.metadados = metadados
+        self.correlacoes = correlacoes
+        self.dimensoes = metadados["dimensoes"]
+        self.metricas = metadados["metricas"]
+
+    @property
+    def n(self):
+        return self.metadados["n"]
+
+    def contagem(self, dimensoes):
+        """Número de repositórios por combinação de 'dimensoes' (apenas combinações presentes)"""
+        return self.celulas.groupby(list(dimensoes), observed=True)["n"].sum()
+
+    def momentos(self, dimensoes, metrica):
+        """DataFrame (count, sum, mean, var, std) de 'metrica' por 'dimensoes' ([] = total)"""
+        cnt, soma, m2 = (self.celulas[f"{p}_{metrica}"] for p in ("cnt", "soma", "m2"))
+        if dimensoes:
+            chaves = [self.celulas[d] for d in dimensoes]
+            grupos = pd.DataFrame({"cnt": cnt, "soma": soma}).groupby(chaves, observed=True)
+            media_grupo = grupos["soma"].transform("sum") / grupos["cnt"].transform("sum")
+        else:
+            chaves = np.zeros(len(self.celulas), dtype=np.int8)
+            media_grupo = soma.sum() / cnt.sum()
+        # Chan: m2 do grupo = soma dos m2 das células + n_i (média_i - média do grupo)^2
+        media_celula = soma / cnt.where(cnt > 0)
+        desvio = (cnt * (media_celula - media_grupo) ** 2).fillna(0.0)
+        partes = pd.DataFrame({"count": cnt, "sum": soma, "m2": m2 + desvio}).groupby(chaves, observed=True).sum()
+        partes["mean"] = partes["sum"] / partes["count"].where(partes["count"] > 0)
+        partes["var"] = partes["m2"] / (partes["count"] - 1).where(partes["count"] > 1)
+        partes["std"] = np.sqrt(partes["var"])
+        return partes[["count", "sum", "mean", "var", "std"]]
+
+    def quantil(self, dimensao, metrica, nome="median"):
+        """
+        Quantil ('min', '25%', 'median', '75%', 'max') ou bigode (BIGODES) de 'metrica' por
+        'dimensao' (None = total); aproximado se o cubo foi construído com approx_quantiles
+        """
+        q = self.quantis
+        linhas = q[(q["dimensao"] == (dimensao or TOTAL)) & (q["metrica"] == metrica) & (q["quantil"] == nome)]
+        if dimensao is None:
+            return float(linhas["valor"].iloc[0])
+        valores = linhas.set_index("grupo")["valor"]
+        ordem = self.contagem([dimensao]).index
+        return pd.Series(valores.reindex(ordem.astype(str)).to_numpy(), index=ordem, name=metrica)
+
+    def caixas(self, dimensao, metrica):
+        """DataFrame (grupo x q1, mediana, q3, bigode_inferior, bigode_superior) para desenhar boxplots"""
+        nomes = {"q1": "25%", "mediana": "median", "q3": "75%", "bigode_inferior": "bigode_inferior",
+                 "bigode_superior": "bigode_superior"}
+        return pd.DataFrame({coluna: self.quantil(dimensao, metrica, nome) for coluna, nome in nomes.items()})
+
+    def agregar(self, dimensoes, especificacao):
+        """
+        Equivalente a df.groupby(dimensoes, observed=True).agg(especificacao) para as funções
+        count, sum, mean, var, std (qualquer combinação de dimensões) e min, 25%, median,
+        75%, max (no máximo uma dimensão). Como no pandas, uma lista de funções por métrica
+        gera colunas (métrica, função); uma função isolada gera a coluna 'métrica'.
+        """
+        dimensoes = list(dimensoes)
+        colunas = {}
+        for metrica, funcoes in especificacao.items():
+            lista = [funcoes] if isinstance(funcoes, str) else list(funcoes)
+            momentos = self.momentos(dimensoes, metrica)
+            for funcao in lista:
+                if funcao in QUANTIS:
+                    if len(dimensoes) > 1:
+                        raise ValueError(f"Quantil '{funcao}' só está disponível por uma única dimensão.")
+                    valores = self.quantil(dimensoes[0], metrica, funcao).to_numpy()
+                else:
+                    valores = momentos[funcao].to_numpy()
+                colunas[metrica if isinstance(funcoes, str) else (metrica, funcao)] = valores
+        return pd.DataFrame(colunas, index=momentos.index)
+
+    def descrever(self, metrica):
+        """Equivalente a df[metrica].describe() (count, mean, std, min, 25%, 50%, 75%, max)"""
+        total = self.momentos([], metrica).iloc[0]
+        descricao = {"count": float(total["count"]), "mean": total["mean"], "std": total["std"]}
+        for nome in QUANTIS:
+            descricao["50%" if nome == "median" else nome] = self.quantil(None, metrica, nome)
+        return pd.Series(descricao, name=metrica)[["count", "mean", "std", "min", "25%", "50%", "75%", "max"]]
+
+
+def _longo(tabela, dimensao):
+    """(grupo, quantil) x métrica -> linhas (dimensao, grupo, quantil, metrica, valor)"""
+    longo = tabela.stack().reset_index()
+    longo.columns = ["grupo", "quantil", "metrica", "valor"]
+    longo["grupo"] = longo["grupo"].astype(str)
+    longo.insert(0, "dimensao", dimensao)
+    return longo
+
+
+def _quantis_exatos(valores, chaves, dimensao):
+    """Quantis de QUANTIS e bigodes exatos de cada métrica por grupo de 'chaves'"""
+    niveis = list(QUANTIS.values())
+    grupos = valores.groupby(chaves, observed=True)
+    q = grupos.quantile(niveis)
+    q1, q3 = q.xs(0.25, level=1).to_numpy(), q.xs(0.75, level=1).to_numpy()
+    # cercas de cada linha (pela posição do grupo dela) -> valor mais extremo dentro delas
+    posicao = grupos.ngroup().to_numpy()
+    cerca_inferior = (q1 - WHIS * (q3 - q1))[posicao]
+    cerca_superior = (q3 + WHIS * (q3 - q1))[posicao]
+    bigodes = {
+        "bigode_inferior": valores.where(valores >= cerca_inferior).groupby(chaves, observed=True).min(),
+        "bigode_superior": valores.where(valores <= cerca_superior).groupby(chaves, observed=True).max(),
+    }
+    q = q.rename(index=dict(zip(niveis, QUANTIS)), level=1)
+    return _longo(pd.concat([q, pd.concat(bigodes).swaplevel()]), dimensao)
+
+
+def _quantis_aproximados(valores, chaves, dimensao, k):
+    """Os mesmos quantis e bigodes estimados por um SketchKLL por grupo e métrica, em blocos"""
+    linhas = []
+    for metrica in valores.columns:
+        sketches = sketches_em_blocos(chaves.to_numpy(), valores[metrica].to_numpy(), k)
+        for grupo, sketch in sketches.sketches.items():
+            estimados = dict(zip(QUANTIS, sketch.quantil(list(QUANTIS.values()))))
+            caixa = resumo_boxplot(sketch, WHIS)
+            estimados.update({nome: caixa[nome] for nome in BIGODES})
+            linhas += [(dimensao, str(grupo), nome, metrica, float(v)) for nome, v in estimados.items()]
+    return pd.DataFrame(linhas, columns=["dimensao", "grupo", "quantil", "metrica", "valor"])
+
+
+def construir_cubo(df, approx_quantiles=False, k=K_PADRAO):
+    """
+    Constrói o cubo a partir das dimensões e métricas presentes em df. Com approx_quantiles,
+    quantis e bigodes são estimados por sketches KLL de parâmetro k (erro_posto_kll(k))
+    """
+    dims = _dimensoes(df)
+    metricas = [m for m in METRICAS if m in df.columns]
+    valores = df[metricas].astype(np.float64)
+
+    grupos = valores.groupby([dims[d] for d in dims.columns], observed=True)
+    agregados = grupos.agg(["count", "sum", "var"])
+    celulas = pd.DataFrame({"n": grupos.size()})
+    for metrica in metricas:
+        cnt = agregados[(metrica, "count")]
+        celulas[f"cnt_{metrica}"] = cnt.astype(np.int64)
+        celulas[f"soma_{metrica}"] = agregados[(metrica, "sum")]
+        celulas[f"m2_{metrica}"] = (agregados[(metrica, "var")] * (cnt - 1)).fillna(0.0)
+    celulas = celulas.reset_index()
+
+    # quantis e bigodes por dimensão isolada e para o total
+    partes = []
+    for dimensao in [TOTAL, *dims.columns]:
+        chaves = pd.Series(TOTAL, index=df.index) if dimensao == TOTAL else dims[dimensao]
+        if approx_quantiles:
+            partes.append(_quantis_aproximados(valores, chaves, dimensao, k))
+        else:
+            partes.append(_quantis_exatos(valores, chaves, dimensao))
+    quantis = pd.concat(partes, ignore_index=True)
+
+    datas = pd.to_datetime(df["created_at"]) if "created_at" in df.columns else None
+    metadados = {
+        "n": int(len(df)),
+        "dimensoes": list(dims.columns),
+        "metricas": metricas,
+        "created_at_min": str(datas.min()) if datas is not None else None,
+        "created_at_max": str(datas.max()) if datas is not None else None,
+        # k do sketch KLL usado nos quantis (None = quantis exatos)
+        "quantis_k": k if approx_quantiles else None,
+    }
+    return CuboAgregado(celulas, quantis, metadados, matrizes_correlacao(valores))
+
+
+def salvar_cubo(cubo, pasta=PASTA_PADRAO):
+    """Grava o cubo em 'pasta' (células e quantis em Parquet, metadados e correlações em JSON)"""
+    os.makedirs(pasta, exist_ok=True)
+    salvar_tabela(cubo.celulas, os.path.join(pasta, "celulas.parquet"))
+    salvar_tabela(cubo.quantis, os.path.join(pasta, "quantis.parquet"))
+    salvar_correlacoes(cubo.correlacoes, os.path.join(pasta, "correlacoes.json"))
+    with open(os.path.join(pasta, "metadados.json"), "w", encoding="utf-8") as f:
+        json.dump(cubo.metadados, f, indent=2)
+
+
+def carregar_cubo(pasta=PASTA_PADRAO):
+    with open(os.path.join(pasta, "metadados.json"), encoding="utf-8") as f:
+        metadados = json.load(f)
+    celulas = carregar_tabela(os.path.join(pasta, "celulas.parquet"))
+    quantis = carregar_tabela(os.path.join(pasta, "quantis.parquet"))
+    return CuboAgregado(celulas, quantis, metadados, carregar_correlacoes(os.path.join(pasta, "correlacoes.json")))
+
+
+def obter_cubo(df, pasta=PASTA_PADRAO, cache=None, approx_quantiles=False, k=K_PADRAO):
+    """
+    Retorna o cubo de df. Com um CacheArtefatos ativo, o cubo persistido em 'pasta' é
+    reaproveitado enquanto as colunas de df usadas por ele (e o modo dos quantis) não mudarem.
+    """
+    colunas = [c for c in COLUNAS_CUBO if c in df.columns]
+    if cache is None or not cache.ativo:
+        cubo = construir_cubo(df, approx_quantiles, k)
+        salvar_cubo(cubo, pasta)
+        return cubo
+
+    def produzir():
+        salvar_cubo(construir_cubo(df, approx_quantiles, k), pasta)
+
+    cache.executar("cubo_agregado", [os.path.join(pasta, arquivo) for arquivo in ARQUIVOS], produzir,
+                   dados=df[colunas],
+                   funcao=[_dimensoes, nivel_documentacao, construir_cubo, _quantis_exatos, _quantis_aproximados,
+                           matrizes_correlacao, salvar_cubo],
+                   parametros={"approx_quantiles": approx_quantiles, "k": k if approx_quantiles else None})
+    return carregar_cubo(pasta)
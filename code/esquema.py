@@ -0,0 +1,72 @@
+"""
+esquema.py
+Esquema de tipos compacto para os DataFrames de repositórios usados em 02/03/04.
+- Colunas de baixa cardinalidade (linguagem, licença, categoria) viram categóricas
+- Nomes de repositório (únicos por linha) usam strings Arrow, sem objetos Python
+- Contagens são reduzidas ao menor tipo inteiro que comporta os valores presentes
+- Indicadores de documentação (tem_wiki, tem_readme, tem_docs) ficam como bool
+- Datas (created_at, updated_at) ficam como datetime64 em vez de texto
+- carregar_repositorios: carrega via armazenamento.carregar_tabela e aplica o esquema,
+  informando a memória antes e depois
+"""
+
+from adiado import ModuloAdiado
+from armazenamento import carregar_tabela
+
+pd = ModuloAdiado("pandas")
+
+CATEGORICAS = ["linguagem", "language", "licenca", "categoria"]
+NOMES = ["repositorio", "full_name", "nome"]
+BOOLEANAS = ["tem_wiki", "tem_readme", "tem_docs"]
+DATAS = ["created_at", "updated_at"]
+CONTAGENS = ["id", "stars", "forks", "issues_abertas", "issues_fechadas", "total_issues",
+             "pull_requests", "contributors", "commits", "tamanho_kb", "idade_dias",
+             "dias_desde_update"]
+
+
+def memoria_mb(df):
+    """Memória ocupada pelo DataFrame (incluindo o conteúdo das strings), em MB"""
+    return df.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def _menor_inteiro(serie):
+    """Converte para o menor inteiro (sem sinal, se não houver negativos) que comporta a série"""
+    if serie.isna().any() or not pd.api.types.is_numeric_dtype(serie):
+        return serie
+    if not pd.api.types.is_integer_dtype(serie) and not (serie % 1 == 0).all():
+        return serie
+    tipo = "unsigned" if serie.min() >= 0 else "integer"
+    return pd.to_numeric(serie.astype("int64"), downcast=tipo)
+
+
+def otimizar_tipos(df, relatorio=True):
+    """
+    Aplica o esquema compacto às colunas presentes em df (as demais ficam como estão).
+    Com relatorio=True imprime a memória antes e depois da conversão.
+    """
+    antes = memoria_mb(df) if relatorio else None
+    df = df.copy()
+
+    for coluna in df.columns:
+        if coluna in CATEGORICAS:
+            df[coluna] = df[coluna].astype("category")
+        elif coluna in NOMES:
+            df[coluna] = df[coluna].astype(pd.StringDtype("pyarrow"))
+        elif coluna in BOOLEANAS:
+            df[coluna] = df[coluna].astype("boolean" if df[coluna].isna().any() else bool)
+        elif coluna in DATAS:
+            df[coluna] = pd.to_datetime(df[coluna], format="ISO8601")
+        elif coluna in CONTAGENS:
+            df[coluna] = _menor_inteiro(df[coluna])
+
+    if relatorio:
+        depois = memoria_mb(df)
+        print(f"[INFO] Memória do dataset: {antes:.2f} MB -> {depois:.2f} MB "
+              f"({antes / max(depois, 1e-9):.1f}x menor)")
+    return df
+
+
+def carregar_repositorios(caminho, colunas=None, nao_nulos=None, datas=None, relatorio=True):
+    """Carrega a tabela de 'caminho' (mesmos parâmetros de carregar_tabela) já no esquema compacto"""
+    df = carregar_tabela(caminho, colunas=colunas, nao_nulos=nao_nulos, datas=datas)
+    return otimizar_tipos(df, relatorio=relatorio)
@@ -0,0 +1,117 @@
+"""
+estatistica_online.py
+Estatísticas acumuladas bloco a bloco, sem manter os dados em memória.
+- MomentosBivariados guarda n, médias, somas dos quadrados dos desvios (m2) e co-momento;
+  cada bloco é resumido com numpy e combinado pela fórmula de Chan et al. (a versão em
+  blocos do algoritmo de Welford), numericamente estável mesmo com médias grandes
+- Daí saem Pearson (r e p-valor, como em scipy.stats.pearsonr) e a reta de mínimos
+  quadrados (como np.polyfit(x, y, 1))
+- MomentosPorGrupo: n, média e m2 de uma variável por grupo (ex.: taxa por linguagem),
+  combinados da mesma forma, para médias e desvios exatos de dados lidos em blocos
+"""
+
+from adiado import ModuloAdiado
+
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+stats = ModuloAdiado("scipy.stats")
+
+
+class MomentosBivariados:
+    """Momentos de (x, y) combináveis entre blocos e entre processos"""
+
+    def __init__(self):
+        self.n = 0
+        self.media_x = 0.0
+        self.media_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.co_xy = 0.0
+        self.min_x = np.inf
+        self.max_x = -np.inf
+
+    def atualizar(self, x, y):
+        """Acrescenta um bloco de pares (x, y) (arrays de mesmo tamanho, sem nulos)"""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        if len(x) == 0:
+            return self
+        bloco = MomentosBivariados()
+        bloco.n = len(x)
+        bloco.media_x, bloco.media_y = x.mean(), y.mean()
+        dx, dy = x - bloco.media_x, y - bloco.media_y
+        bloco.m2_x, bloco.m2_y, bloco.co_xy = dx @ dx, dy @ dy, dx @ dy
+        bloco.min_x, bloco.max_x = x.min(), x.max()
+        return self.merge(bloco)
+
+    def merge(self, outro):
+        """Combina os momentos de outro bloco/processo com estes (Chan et al.)"""
+        if outro.n == 0:
+            return self
+        n = self.n + outro.n
+        delta_x = outro.media_x - self.media_x
+        delta_y = outro.media_y - self.media_y
+        peso = self.n * outro.n / n
+        self.m2_x += outro.m2_x + delta_x * delta_x * peso
+        self.m2_y += outro.m2_y + delta_y * delta_y * peso
+        self.co_xy += outro.co_xy + delta_x * delta_y * peso
+        self.media_x += delta_x * outro.n / n
+        self.media_y += delta_y * outro.n / n
+        self.min_x = min(self.min_x, outro.min_x)
+        self.max_x = max(self.max_x, outro.max_x)
+        self.n = n
+        return self
+
+    def correlacao(self):
+        """Coeficiente de correlação de Pearson"""
+        return float(self.co_xy / np.sqrt(self.m2_x * self.m2_y))
+
+    def regressao(self):
+        """(inclinação, intercepto) da reta de mínimos quadrados de y em função de x"""
+        inclinacao = self.co_xy / self.m2_x
+        return float(inclinacao), float(self.media_y - inclinacao * self.media_x)
+
+
+class MomentosPorGrupo:
+    """Momentos de uma variável por grupo (tabela com n, media e m2 indexada pelo grupo)"""
+
+    def __init__(self):
+        self.tabela = pd.DataFrame({"n": [], "media": [], "m2": []})
+
+    def atualizar(self, grupos, valores):
+        """Acrescenta um bloco de valores (sem nulos) com o grupo de cada um"""
+        grupos = np.asarray(grupos)
+        valores = pd.Series(np.asarray(valores, dtype=np.float64))
+        if len(valores) == 0:
+            return self
+        por_grupo = valores.groupby(grupos)
+        desvios = valores - por_grupo.transform("mean")
+        bloco = MomentosPorGrupo()
+        bloco.tabela = pd.DataFrame({"n": por_grupo.size().astype(np.float64), "media": por_grupo.mean(),
+                                     "m2": (desvios * desvios).groupby(grupos).sum()})
+        return self.merge(bloco)
+
+    def merge(self, outro):
+        """Combina os momentos de outro bloco/processo com estes, grupo a grupo (Chan et al.)"""
+        a, b = self.tabela.align(outro.tabela, join="outer", fill_value=0.0)
+        n = a["n"] + b["n"]
+        delta = b["media"] - a["media"]
+        self.tabela = pd.DataFrame({"n": n, "media": a["media"] + delta * b["n"] / n,
+                                    "m2": a["m2"] + b["m2"] + delta * delta * a["n"] * b["n"] / n})
+        return self
+
+    def variancia(self, ddof=1):
+        """Variância por grupo (NaN nos grupos com n <= ddof)"""
+        n = self.tabela["n"]
+        return (self.tabela["m2"] / (n - ddof)).where(n > ddof)
+
+
+def p_valor_correlacao(r, n):
+    """p-valor bilateral de H0: correlação = 0 (t com n-2 g.l., como pearsonr/spearmanr do scipy)"""
+    if n <= 2:
+        return np.nan
+    r = float(np.clip(r, -1.0, 1.0))
+    if abs(r) == 1.0:
+        return 0.0
+    t = r * np.sqrt((n - 2) / (1.0 - r * r))
+    return float(2 * stats.t.sf(abs(t), n - 2))
@@ -0,0 +1,64 @@
+"""
+geracao_paralela.py
+Geração de datasets simulados em paralelo, dividida em shards.
+- Cada shard recebe um fluxo aleatório independente (SeedSequence.spawn), então o
+  resultado depende só de (seed, n_shards) e não da ordem/velocidade dos processos
+- Os shards são devolvidos na ordem original e podem ser gravados direto com
+  armazenamento.salvar_em_blocos, formando um único arquivo
+- contexto_processos: contexto de multiprocessing compartilhado pelos pools de processos
+"""
+
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from adiado import ModuloAdiado
+
+np = ModuloAdiado("numpy")
+
+
+def dividir_em_shards(n_total, n_shards):
+    """Retorna [(inicio, tamanho), ...] dividindo n_total em n_shards partes quase iguais"""
+    base, resto = divmod(n_total, n_shards)
+    shards, inicio = [], 0
+    for i in range(n_shards):
+        tamanho = base + (1 if i < resto else 0)
+        if tamanho > 0:
+            shards.append((inicio, tamanho))
+        inicio += tamanho
+    return shards
+
+
+def contexto_processos():
+    """
+    Contexto de multiprocessing para os pools de processos do projeto (geração, bootstrap,
+    gráficos do dashboard): fork onde existe (Linux/macOS), pois evita reimportar o script
+    principal em cada worker; None (padrão da plataforma) nos demais
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def gerar_em_shards(funcao_shard, n_total, n_shards, processos=None, seed=42, args_extras=()):
+    """
+    Gerador que executa funcao_shard(seed_sequence, inicio, tamanho, *args_extras) para
+    cada shard em um pool de processos e devolve os DataFrames na ordem dos shards.
+
+    funcao_shard precisa ser uma função de nível de módulo (picklable). No máximo
+    2 x processos shards ficam em andamento ao mesmo tempo, o que limita a memória
+    usada pelos resultados que aguardam gravação.
+    """
+    processos = processos or os.cpu_count() or 1
+    shards = dividir_em_shards(n_total, n_shards)
+    seeds = np.random.SeedSequence(seed).spawn(len(shards))
+
+    with ProcessPoolExecutor(max_workers=processos, mp_context=contexto_processos()) as executor:
+        pendentes = deque()
+        for seed_shard, (inicio, tamanho) in zip(seeds, shards):
+            pendentes.append(executor.submit(funcao_shard, seed_shard, inicio, tamanho, *args_extras))
+            if len(pendentes) >= 2 * processos:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
@@ -0,0 +1,183 @@
+"""
+historico.py
+Histórico de coletas (snapshots) para as séries temporais de stars/commits/etc.
+- Cada coleta é acrescentada como uma nova partição, sem reescrever as anteriores:
+  <pasta>/data_coleta=AAAA-MM-DD/linguagem=<linguagem>/parte-<execucao>-<i>.parquet
+  (partições Hive; duas coletas no mesmo dia ficam lado a lado, distinguidas por 'execucao')
+- Só entram na partição os repositórios novos ou com algum valor diferente do último
+  guardado (idade_dias/dias_desde_update, que mudam todo dia, não contam): o histórico
+  cresce com o número de alterações, não com (coletas x repositórios)
+- Parquet com zstd e as colunas de texto repetidas (licença, categoria, datas...) gravadas
+  com codificação de dicionário; a linguagem e a data nem entram nos arquivos (estão no
+  caminho da partição)
+- ler_historico: lê só as partições do intervalo de datas/linguagens pedido (o filtro
+  sobre as colunas de partição descarta diretórios sem abri-los) e só as colunas pedidas
+- ultimo_por_repositorio: visão com a coleta mais recente de cada repositório, mantida em
+  <pasta>/_ultimo.parquet a cada coleta acrescentada (ler o histórico inteiro não é preciso)
+- estado_em: o dataset como estava numa data (último valor de cada repositório até ela)
+"""
+
+import os
+import time
+from datetime import date
+
+from adiado import ModuloAdiado
+from armazenamento import COMPRESSAO
+
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+pa = ModuloAdiado("pyarrow")
+pc = ModuloAdiado("pyarrow.compute")
+ds = ModuloAdiado("pyarrow.dataset")
+pq = ModuloAdiado("pyarrow.parquet")
+
+PASTA_PADRAO = "historico"
+COLUNA_DATA = "data_coleta"
+COLUNA_EXECUCAO = "execucao"
+ARQUIVO_ULTIMO = "_ultimo.parquet"
+# a primeira presente no dataset é usada como partição (dataset simulado / coleta da API)
+COLUNAS_LINGUAGEM = ["linguagem", "language"]
+CHAVES = ["repositorio", "full_name"]
+# derivadas da data da coleta: mudam todo dia sem que o repositório mude
+COLUNAS_RELATIVAS = ["idade_dias", "dias_desde_update"]
+
+
+def _coluna_presente(colunas, candidatas):
+    for coluna in candidatas:
+        if coluna in colunas:
+            return coluna
+    raise ValueError(f"Nenhuma das colunas {candidatas} está no dataset.")
+
+
+def _particionamento(linguagem):
+    esquema = pa.schema([(COLUNA_DATA, pa.date32()), (linguagem, pa.string())])
+    return ds.partitioning(esquema, flavor="hive")
+
+
+def _colunas_dicionario(tabela, chave):
+    """Colunas de texto com valores repetidos (todas menos a chave, única por linha)"""
+    return [campo.name for campo in tabela.schema
+            if campo.name != chave and (pa.types.is_string(campo.type) or pa.types.is_large_string(campo.type))]
+
+
+def _alterados(df, pasta, chave):
+    """Máscara das linhas de df novas ou com valores diferentes dos da visão _ultimo.parquet"""
+    caminho = os.path.join(pasta, ARQUIVO_ULTIMO)
+    if not os.path.exists(caminho):
+        return np.ones(len(df), dtype=bool)
+    comparadas = [c for c in df.columns if c not in COLUNAS_RELATIVAS]
+    anterior = pq.read_table(caminho, columns=[c for c in comparadas if c in pq.read_schema(caminho).names])
+    anterior = anterior.to_pandas()
+    if list(anterior.columns) != comparadas:
+        # esquema mudou: a coleta entra inteira
+        return np.ones(len(df), dtype=bool)
+    posicoes = pd.Index(anterior[chave]).get_indexer(df[chave])
+    alterados = posicoes < 0
+    encontrados = np.flatnonzero(~alterados)
+    # hash de cada linha (todas as colunas comparadas) dos dois lados
+    novo = pd.util.hash_pandas_object(df[comparadas].iloc[encontrados], index=False).to_numpy()
+    guardado = pd.util.hash_pandas_object(anterior.iloc[posicoes[encontrados]], index=False).to_numpy()
+    alterados[encontrados] = novo != guardado
+    return alterados
+
+
+def acrescentar_coleta(df, pasta=PASTA_PADRAO, data_coleta=None):
+    """
+    Acrescenta ao histórico em 'pasta' as linhas novas/alteradas da coleta 'df', particionadas
+    por data da coleta e linguagem, e atualiza a visão do último valor por repositório.
+    Retorna (arquivos gravados, linhas acrescentadas).
+    """
+    data_coleta = data_coleta or date.today()
+    linguagem = _coluna_presente(df.columns, COLUNAS_LINGUAGEM)
+    chave = _coluna_presente(df.columns, CHAVES)
+    execucao = time.time_ns()
+
+    df = df[_alterados(df, pasta, chave)]
+    if df.empty:
+        return [], 0
+    df = df.assign(**{COLUNA_DATA: pd.Timestamp(data_coleta).date(), COLUNA_EXECUCAO: execucao})
+    df[linguagem] = df[linguagem].astype(object)
+    tabela = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata()
+    opcoes = ds.ParquetFileFormat().make_write_options(
+        compression=COMPRESSAO, use_dictionary=_colunas_dicionario(tabela, chave))
+    gravados = []
+    # as colunas de partição ficam no caminho, não dentro dos arquivos
+    ds.write_dataset(tabela, pasta, format="parquet", partitioning=_particionamento(linguagem),
+                     basename_template=f"parte-{execucao}-{{i}}.parquet",
+                     existing_data_behavior="overwrite_or_ignore", file_options=opcoes,
+                     file_visitor=lambda arquivo: gravados.append(arquivo.path))
+    _atualizar_ultimo(tabela, pasta, chave)
+    return gravados, len(df)
+
+
+def _atualizar_ultimo(tabela, pasta, chave):
+    """Substitui na visão _ultimo.parquet as linhas dos repositórios da nova coleta"""
+    caminho = os.path.join(pasta, ARQUIVO_ULTIMO)
+    if os.path.exists(caminho):
+        anterior = pq.read_table(caminho)
+        mantidas = pc.invert(pc.is_in(anterior[chave], value_set=tabela[chave].combine_chunks()))
+        tabela = pa.concat_tables([anterior.filter(mantidas), tabela], promote_options="permissive")
+    temporario = caminho + ".tmp"
+    pq.write_table(tabela, temporario, compression=COMPRESSAO, use_dictionary=_colunas_dicionario(tabela, chave))
+    os.replace(temporario, caminho)
+
+
+def _filtro(linguagem, inicio=None, fim=None, linguagens=None):
+    condicoes = []
+    if inicio is not None:
+        condicoes.append(pc.field(COLUNA_DATA) >= pa.scalar(pd.Timestamp(inicio).date(), pa.date32()))
+    if fim is not None:
+        condicoes.append(pc.field(COLUNA_DATA) <= pa.scalar(pd.Timestamp(fim).date(), pa.date32()))
+    if linguagens is not None:
+        condicoes.append(pc.field(linguagem).isin(list(linguagens)))
+    filtro = None
+    for condicao in condicoes:
+        filtro = condicao if filtro is None else filtro & condicao
+    return filtro
+
+
+def abrir_historico(pasta=PASTA_PADRAO):
+    """Dataset Arrow do histórico (só os metadados; nada é lido até a consulta)"""
+    if not os.path.isdir(pasta):
+        raise FileNotFoundError(f"Histórico {pasta} não encontrado.")
+    # a coluna de linguagem é o segundo nível de diretórios (linguagem=... ou language=...)
+    nivel = next((d for _, dirs, _ in os.walk(pasta) for d in dirs if not d.startswith(COLUNA_DATA)), None)
+    linguagem = nivel.split("=")[0] if nivel else COLUNAS_LINGUAGEM[0]
+    return ds.dataset(pasta, format="parquet", partitioning=_particionamento(linguagem)), linguagem
+
+
+def ler_historico(pasta=PASTA_PADRAO, inicio=None, fim=None, linguagens=None, colunas=None):
+    """
+    Linhas acrescentadas (novas/alteradas) com data_coleta em [inicio, fim] e linguagem em
+    'linguagens' (None = sem restrição). As partições fora do filtro não são abertas; apenas
+    'colunas' (mais data_coleta) são lidas.
+    """
+    dataset, linguagem = abrir_historico(pasta)
+    if colunas is not None:
+        colunas = list(dict.fromkeys([COLUNA_DATA, *colunas]))
+    tabela = dataset.to_table(columns=colunas, filter=_filtro(linguagem, inicio, fim, linguagens))
+    return tabela.to_pandas()
+
+
+def estado_em(pasta=PASTA_PADRAO, data=None, linguagens=None, colunas=None):
+    """Último valor de cada repositório coletado até 'data' (None = visão mais recente)"""
+    if data is None:
+        return ultimo_por_repositorio(pasta, colunas, linguagens)
+    dataset, linguagem = abrir_historico(pasta)
+    chave = _coluna_presente(dataset.schema.names, CHAVES)
+    leitura = None if colunas is None else list(dict.fromkeys([chave, COLUNA_DATA, COLUNA_EXECUCAO, *colunas]))
+    df = dataset.to_table(columns=leitura, filter=_filtro(linguagem, fim=data, linguagens=linguagens)).to_pandas()
+    df = df.sort_values([COLUNA_DATA, COLUNA_EXECUCAO], kind="stable").drop_duplicates(chave, keep="last")
+    return df.reset_index(drop=True) if colunas is None else df[list(colunas)].reset_index(drop=True)
+
+
+def ultimo_por_repositorio(pasta=PASTA_PADRAO, colunas=None, linguagens=None):
+    """Valor mais recente de cada repositório (uma linha por repositório), da visão _ultimo.parquet"""
+    caminho = os.path.join(pasta, ARQUIVO_ULTIMO)
+    if not os.path.exists(caminho):
+        raise FileNotFoundError(f"Visão {caminho} não encontrada; acrescente uma coleta ao histórico.")
+    filtro = None
+    if linguagens is not None:
+        linguagem = _coluna_presente(pq.read_schema(caminho).names, COLUNAS_LINGUAGEM)
+        filtro = pc.field(linguagem).isin(list(linguagens))
+    return pq.read_table(caminho, columns=colunas, filters=filtro).to_pandas()
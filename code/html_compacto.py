@@ -0,0 +1,182 @@
+"""
+html_compacto.py
+Trechos de HTML/JS para os modos compacto (--compact) e sob demanda (--lazy) do dashboard.
+- Cada fig.to_html embute sua própria cópia das colunas que desenha (e o template de
+  layout inteiro); aqui as figuras vão em JSON e toda subárvore grande (arrays tipados
+  {dtype, bdata} do plotly, listas de textos, templates) entra uma única vez em uma tabela
+  compartilhada, referenciada pelas figuras como {"$ref": i}
+- A tabela é escrita em blocos, logo antes da primeira figura que usa cada entrada, para que
+  a página possa ser gravada gráfico a gráfico (sem manter todas as figuras em memória)
+- O JSON das figuras e da tabela fica em <script type="application/json">: o navegador não o
+  interpreta ao abrir a página; cada gráfico é lido, resolvido e desenhado só quando é
+  necessário (imediatamente, ou ao entrar na tela com IntersectionObserver no modo sob demanda)
+- No modo compacto o plotly.js é embutido uma vez na página (sem CDN, funciona sem internet)
+- gravar_gzip grava uma cópia .gz pré-comprimida e determinística ao lado do HTML
+"""
+
+import gzip
+import hashlib
+import json
+import shutil
+
+from adiado import ModuloAdiado
+
+offline = ModuloAdiado("plotly.offline")
+
+# subárvores com JSON menor que isto ficam inline (a referência não compensaria)
+TAMANHO_MINIMO_REF = 256
+# altura reservada para gráficos sem layout.height (padrão do plotly.js)
+ALTURA_PADRAO = 450
+
+PLOTLY_CDN = '<script src="https://cdn.plot.ly/plotly-2.27.0.min.js" charset="utf-8"></script>'
+
+RUNTIME_JS = """
+const TABELA_DADOS = {};
+function entradaTabela(i) {
+    if (!(i in TABELA_DADOS)) {
+        for (const bloco of document.querySelectorAll('script.tabela-dados')) {
+            const inicio = +bloco.dataset.inicio, fim = +bloco.dataset.fim;
+            if (i < inicio || i >= fim) continue;
+            JSON.parse(bloco.textContent).forEach((entrada, j) => { TABELA_DADOS[inicio + j] = entrada; });
+            break;
+        }
+    }
+    return TABELA_DADOS[i];
+}
+function resolverDados(valor) {
+    if (Array.isArray(valor)) return valor.map(resolverDados);
+    if (valor === null || typeof valor !== 'object') return valor;
+    if (Object.prototype.hasOwnProperty.call(valor, '$ref')) {
+        const item = entradaTabela(valor.$ref);
+        // arrays tipados ({dtype, bdata}) são compartilhados; o resto é copiado a cada uso
+        if (item !== null && typeof item === 'object' && typeof item.bdata === 'string') return item;
+        return resolverDados(item);
+    }
+    const saida = {};
+    for (const chave in valor) saida[chave] = resolverDados(valor[chave]);
+    return saida;
+}
+function desenharGrafico(id) {
+    const div = document.getElementById(id);
+    const figura = JSON.parse(document.getElementById('figura-' + id).textContent);
+    Plotly.newPlot(div, resolverDados(figura.data), resolverDados(figura.layout), {"responsive": true});
+}
+"""
+
+SOB_DEMANDA_JS = """
+document.addEventListener('DOMContentLoaded', function () {
+    const pendentes = document.querySelectorAll('.grafico-sob-demanda');
+    if (!('IntersectionObserver' in window)) {
+        pendentes.forEach(div => desenharGrafico(div.id));
+        return;
+    }
+    const observador = new IntersectionObserver(function (entradas) {
+        for (const entrada of entradas) {
+            if (!entrada.isIntersecting) continue;
+            observador.unobserve(entrada.target);
+            desenharGrafico(entrada.target.id);
+        }
+    }, {rootMargin: '300px 0px'});
+    pendentes.forEach(div => observador.observe(div));
+});
+"""
+
+
+def _json_compacto(valor):
+    return json.dumps(valor, separators=(",", ":"), ensure_ascii=False)
+
+
+def _json_para_script(texto):
+    # mesmo escape do plotly: '<', '>' e '&' só aparecem dentro de strings JSON
+    return texto.replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+
+
+class TabelaDados:
+    """
+    Tabela de subárvores JSON compartilhadas entre figuras, preenchida figura a figura.
+    Só os hashes das entradas já emitidas ficam em memória; com minimo=None nada é
+    compartilhado e as figuras passam inalteradas.
+    """
+
+    def __init__(self, minimo=TAMANHO_MINIMO_REF):
+        self.minimo = minimo
+        self.indices = {}
+        self.novas = []
+
+    def internar(self, texto_figura):
+        """
+        Recebe o JSON de fig.to_json() e retorna a figura (dict) com referências à tabela.
+        O dict do layout em si nunca vira referência (só o que está dentro dele): height e
+        width continuam legíveis para reservar o tamanho do div do gráfico.
+        """
+        figura = json.loads(texto_figura)
+        layout = figura.get("layout", {})
+        return {"data": self._internar(figura.get("data", [])),
+                "layout": {chave: self._internar(valor) for chave, valor in layout.items()}}
+
+    def _internar(self, valor):
+        """Substitui, de baixo para cima, subárvores com JSON >= minimo por {"$ref": i}"""
+        if self.minimo is None:
+            return valor
+        if isinstance(valor, dict):
+            valor = {k: self._internar(v) for k, v in valor.items()}
+        elif isinstance(valor, list):
+            valor = [self._internar(v) for v in valor]
+        else:
+            return valor
+        texto = _json_compacto(valor)
+        if len(texto) < self.minimo:
+            return valor
+        chave = hashlib.sha1(texto.encode("utf-8")).digest()
+        if chave not in self.indices:
+            self.indices[chave] = len(self.indices)
+            self.novas.append(texto)
+        return {"$ref": self.indices[chave]}
+
+    def bloco_novas_entradas(self):
+        """<script> com as entradas criadas desde a última chamada ('' se não houver)"""
+        if not self.novas:
+            return ""
+        fim = len(self.indices)
+        inicio = fim - len(self.novas)
+        corpo = _json_para_script("[" + ",".join(self.novas) + "]")
+        self.novas = []
+        return (f'<script type="application/json" class="tabela-dados" data-inicio="{inicio}" '
+                f'data-fim="{fim}">{corpo}</script>')
+
+
+def trecho_grafico(id_div, figura, sob_demanda=False):
+    """
+    Trecho HTML do gráfico: JSON da figura + div com o tamanho do layout. Sob demanda o div
+    é desenhado ao entrar na tela; senão, logo em seguida, por um <script> inline.
+    'figura' vem de TabelaDados.internar, que mantém height/width do layout fora da tabela.
+    """
+    layout = figura["layout"]
+    altura = f"{layout.get('height', ALTURA_PADRAO)}px"
+    largura = f"{layout['width']}px" if "width" in layout else "100%"
+    classe = "plotly-graph-div grafico-sob-demanda" if sob_demanda else "plotly-graph-div"
+    trecho = (f'<script type="application/json" id="figura-{id_div}">'
+              f'{_json_para_script(_json_compacto(figura))}</script>'
+              f'<div id="{id_div}" class="{classe}" style="height:{altura}; width:{largura};"></div>')
+    if not sob_demanda:
+        trecho += f'<script type="text/javascript">desenharGrafico("{id_div}");</script>'
+    return trecho
+
+
+def scripts_cabecalho(embutir_plotly=False, sob_demanda=False):
+    """Scripts do <head>: plotly.js (embutido ou do CDN) e o runtime que lê/desenha as figuras"""
+    if embutir_plotly:
+        plotly_js = f'<script type="text/javascript">{offline.get_plotlyjs()}</script>'
+    else:
+        plotly_js = PLOTLY_CDN
+    runtime = RUNTIME_JS + (SOB_DEMANDA_JS if sob_demanda else "")
+    return f'{plotly_js}\n    <script type="text/javascript">{runtime}</script>'
+
+
+def gravar_gzip(caminho, nivel=9):
+    """Grava caminho + '.gz' (sem nome/data no cabeçalho, para o conteúdo ser reprodutível)"""
+    destino = caminho + ".gz"
+    with open(caminho, "rb") as origem, open(destino, "wb") as bruto:
+        with gzip.GzipFile(filename="", mode="wb", compresslevel=nivel, fileobj=bruto, mtime=0) as saida:
+            shutil.copyfileobj(origem, saida)
+    return destino
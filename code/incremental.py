@@ -0,0 +1,89 @@
+"""
+incremental.py
+Atualização incremental do dataset de repositórios (01_coleta_dados.py --incremental).
+- linhas_alteradas: quais candidatos (repositório + updated_at, ex.: vindos da busca do
+  GitHub) são novos ou têm updated_at mais recente que o guardado; só esses são coletados
+  ou regerados. updated_at pode ser uma data (AAAA-MM-DD, dataset simulado) ou um instante
+  (AAAA-MM-DDTHH:MM:SS, UTC, coleta da API): as duas formas são comparadas como instantes
+- mesclar_atualizacoes: upsert das linhas novas/alteradas no dataset existente, localizadas
+  por um índice hash (pd.Index) sobre a chave (repositorio/full_name), sem ordenar nem juntar
+  o dataset inteiro
+- recalcular_derivadas: colunas derivadas (total_issues, idades e métricas de metricas.py)
+  apenas das linhas alteradas; as demais linhas ficam como foram coletadas (idade_dias e
+  dias_desde_update se referem à data da última coleta de cada linha)
+"""
+
+from datetime import date
+
+from adiado import ModuloAdiado
+from metricas import calcular_metricas
+
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+
+CHAVE_PADRAO = "repositorio"
+COLUNA_DATA = "updated_at"
+# updated_at com resolução de segundo: duas alterações no mesmo dia continuam distinguíveis
+FORMATO_INSTANTE = "%Y-%m-%dT%H:%M:%S"
+
+
+def instantes(valores):
+    """Datas/instantes ISO 8601 (com ou sem hora, com ou sem 'Z') como datetime64 em UTC"""
+    return pd.to_datetime(valores, format="ISO8601", utc=True)
+
+
+def indice_hash(df, chave=CHAVE_PADRAO):
+    """Índice hash da chave do dataset (erro se houver chaves repetidas)"""
+    indice = pd.Index(df[chave])
+    if not indice.is_unique:
+        raise ValueError(f"A coluna '{chave}' tem valores repetidos; não serve como chave do upsert.")
+    return indice
+
+
+def linhas_alteradas(existente, candidatos, chave=CHAVE_PADRAO, coluna_data=COLUNA_DATA, indice=None):
+    """Máscara (array bool) dos candidatos que não existem em 'existente' ou têm coluna_data mais recente"""
+    indice = indice_hash(existente, chave) if indice is None else indice
+    posicoes = indice.get_indexer(candidatos[chave])
+    alterados = posicoes < 0
+    encontrados = np.flatnonzero(~alterados)
+    # só as datas dos candidatos encontrados são convertidas, não a coluna inteira
+    guardadas = instantes(existente[coluna_data].iloc[posicoes[encontrados]]).to_numpy()
+    recebidas = instantes(candidatos[coluna_data].iloc[encontrados]).to_numpy()
+    alterados[encontrados] = recebidas > guardadas
+    return alterados
+
+
+def recalcular_derivadas(linhas, data_referencia=None):
+    """total_issues, idade_dias, dias_desde_update, taxa_resolucao_issues e commits_por_mes das linhas dadas"""
+    hoje = pd.Timestamp(data_referencia or date.today())
+    linhas = linhas.copy()
+    linhas["total_issues"] = linhas["issues_abertas"] + linhas["issues_fechadas"]
+    linhas["idade_dias"] = (hoje - pd.to_datetime(linhas["created_at"], format="ISO8601").dt.normalize()).dt.days
+    atualizacao = pd.to_datetime(linhas["updated_at"], format="ISO8601").dt.normalize()
+    linhas["dias_desde_update"] = (hoje - atualizacao).dt.days.clip(lower=0)
+    return calcular_metricas(linhas, ["taxa_resolucao_issues", "commits_por_mes"])
+
+
+def mesclar_atualizacoes(existente, novos, chave=CHAVE_PADRAO, coluna_data=COLUNA_DATA):
+    """
+    Upsert de 'novos' em 'existente': linhas com chave nova são acrescentadas no fim, linhas
+    com updated_at mais recente substituem as guardadas (nas colunas presentes nas duas) e as
+    demais são ignoradas. Retorna (dataset, {"novos", "atualizados", "sem_alteracao"}).
+    """
+    novos = novos.drop_duplicates(chave, keep="last")
+    indice = indice_hash(existente, chave)
+    alterados = linhas_alteradas(existente, novos, chave, coluna_data, indice)
+    posicoes = indice.get_indexer(novos[chave])
+    substituir = alterados & (posicoes >= 0)
+    acrescentar = posicoes < 0
+
+    resultado = existente.copy()
+    linhas = posicoes[substituir]
+    for coluna in [c for c in existente.columns if c in novos.columns]:
+        valores = novos[coluna].to_numpy()[substituir]
+        resultado.iloc[linhas, resultado.columns.get_loc(coluna)] = valores
+    if acrescentar.any():
+        resultado = pd.concat([resultado, novos[acrescentar].reindex(columns=existente.columns)], ignore_index=True)
+    estatisticas = {"novos": int(acrescentar.sum()), "atualizados": int(substituir.sum()),
+                    "sem_alteracao": int((~alterados).sum())}
+    return resultado, estatisticas
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+lab.py
+Ponto de entrada único dos scripts do laboratório, um subcomando por etapa:
+    python lab.py coleta [opções de 01_coleta_dados.py]
+    python lab.py caracterizacao [opções de 02_caracterizacao_dataset.py]
+    python lab.py analise [opções de 03_analise_rqs.py]
+    python lab.py dashboard [opções de 04_dashboard_completo_v2.py]
+    python lab.py pipeline [opções de pipeline.py]
+    python lab.py benchmark-inicio [opções de benchmark_inicio.py]
+    python lab.py benchmark-escala [opções de benchmark_escala.py]
+As opções depois do subcomando vão para o main() do script correspondente, que só é
+importado depois da escolha; como os scripts adiam numpy/pandas/matplotlib/plotly
+(adiado.py), `lab.py --help` e `lab.py <subcomando> --help` respondem sem carregá-los.
+"""
+
+import argparse
+import importlib
+
+# subcomando: (módulo com main(argv), descrição)
+SUBCOMANDOS = {
+    "coleta": ("01_coleta_dados", "gera o dataset simulado ou coleta da API do GitHub"),
+    "caracterizacao": ("02_caracterizacao_dataset", "estatísticas e gráficos de caracterização do dataset"),
+    "analise": ("03_analise_rqs", "análise das questões de pesquisa RQ1 e RQ2"),
+    "dashboard": ("04_dashboard_completo_v2", "dashboard HTML completo (sem iframes)"),
+    "pipeline": ("pipeline", "etapas 01-04 como um DAG, pulando as que não mudaram"),
+    "benchmark-inicio": ("benchmark_inicio", "tempo de import e --help de cada ponto de entrada"),
+    "benchmark-escala": ("benchmark_escala", "tempo, memória e saída das etapas de 1k a 1M linhas"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="lab.py", description="Laboratório 04 - coleta, caracterização, "
+                                                                "análise e dashboard de repositórios do GitHub")
+    subcomandos = parser.add_subparsers(dest="subcomando", required=True, metavar="subcomando")
+    for nome, (_, ajuda) in SUBCOMANDOS.items():
+        # as opções (inclusive --help) de cada subcomando são lidas pelo main() do próprio script
+        subcomandos.add_parser(nome, help=ajuda, add_help=False)
+    args, resto = parser.parse_known_args(argv)
+    modulo = importlib.import_module(SUBCOMANDOS[args.subcomando][0])
+    return modulo.main(resto)
+
+
+if __name__ == "__main__":
+    main()
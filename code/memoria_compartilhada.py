@@ -0,0 +1,116 @@
+"""
+memoria_compartilhada.py
+Publica as colunas de um DataFrame em um bloco de memória compartilhada para que
+processos de um pool o reconstruam sem receber o DataFrame serializado a cada tarefa.
+- Colunas numéricas, booleanas e de data vão como arrays brutos
+- Colunas anuláveis do pandas (boolean, Int*, UInt*, Float*; ex.: tem_wiki com nulos em
+  esquema.otimizar_tipos) vão como dois arrays: os valores e a máscara de nulos
+- Colunas categóricas e de texto vão como códigos inteiros; os valores distintos de texto
+  são gravados como buffers de string Arrow (offsets + bytes UTF-8) no mesmo bloco
+- Qualquer outro tipo (datas com fuso, períodos, objetos que não são texto...) gera TypeError
+- O descritor (pequeno) é o único objeto serializado, uma vez por processo
+"""
+
+from multiprocessing import shared_memory
+
+from adiado import ModuloAdiado
+
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+pa = ModuloAdiado("pyarrow")
+
+ALINHAMENTO = 8
+
+
+def _alinhar(posicao):
+    return (posicao + ALINHAMENTO - 1) // ALINHAMENTO * ALINHAMENTO
+
+
+def _partes_coluna(nome, serie):
+    """Decompõe a série em (tipo, metadados, [arrays numpy]) para cópia no bloco compartilhado"""
+    dtype = serie.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "categoria", {"dtype": dtype}, [serie.cat.codes.to_numpy()]
+    if isinstance(dtype, np.dtype) and dtype.kind in "mM":
+        return "data", {"dtype": dtype}, [serie.to_numpy().view("int64")]
+    if isinstance(dtype, np.dtype) and (np.issubdtype(dtype, np.number) or dtype == np.bool_):
+        return "numero", {"dtype": dtype}, [serie.to_numpy()]
+    if isinstance(serie.array, (pd.arrays.BooleanArray, pd.arrays.IntegerArray, pd.arrays.FloatingArray)):
+        # nulos viram 0 nos valores; a máscara diz quais posições são nulas
+        mascara = serie.isna().to_numpy()
+        return "anulavel", {"dtype": dtype}, [serie.to_numpy(dtype=dtype.numpy_dtype, na_value=0), mascara]
+    if not (dtype == object or isinstance(dtype, pd.StringDtype)):
+        raise TypeError(f"Coluna '{nome}': tipo {dtype} não é suportado na memória compartilhada.")
+    # texto (object ou string): códigos + valores distintos em formato Arrow
+    codigos, distintos = pd.factorize(serie, use_na_sentinel=True)
+    try:
+        arrow = pa.array(np.asarray(distintos, dtype=object), type=pa.large_string())
+    except (pa.ArrowTypeError, pa.ArrowInvalid) as erro:
+        raise TypeError(f"Coluna '{nome}' ({dtype}) tem valores que não são texto: {erro}") from erro
+    _, offsets, dados = arrow.buffers()
+    return "texto", {"dtype": dtype, "n_distintos": len(distintos)}, [
+        codigos.astype(np.int64),
+        np.frombuffer(offsets, dtype=np.int64, count=len(distintos) + 1),
+        np.frombuffer(dados, dtype=np.uint8) if dados is not None else np.zeros(0, np.uint8),
+    ]
+
+
+def publicar_dataframe(df):
+    """
+    Copia df para um novo bloco de memória compartilhada.
+    Retorna (shm, descritor); quem publica deve chamar shm.close() e shm.unlink() ao final.
+    """
+    colunas, blocos, posicao = [], [], 0
+    for nome, serie in df.items():
+        tipo, meta, arrays = _partes_coluna(nome, serie)
+        partes = []
+        for arr in arrays:
+            arr = np.ascontiguousarray(arr)
+            partes.append((posicao, arr.dtype.str, arr.shape[0]))
+            blocos.append((posicao, arr))
+            posicao = _alinhar(posicao + arr.nbytes)
+        colunas.append((nome, tipo, meta, partes))
+
+    shm = shared_memory.SharedMemory(create=True, size=max(posicao, 1))
+    for inicio, arr in blocos:
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf, offset=inicio)[...] = arr
+    descritor = {"nome_shm": shm.name, "n_linhas": len(df), "indice": df.index, "colunas": colunas}
+    return shm, descritor
+
+
+def _abrir_bloco(nome):
+    try:
+        return shared_memory.SharedMemory(name=nome, track=False)  # Python >= 3.13
+    except TypeError:
+        # workers do pool herdam o resource_tracker de quem publicou: o registro repetido
+        # é inofensivo e o unlink() do processo dono remove a única entrada
+        return shared_memory.SharedMemory(name=nome)
+
+
+def anexar_dataframe(descritor):
+    """Reconstrói, em outro processo, o DataFrame publicado. Retorna (shm, df)"""
+    shm = _abrir_bloco(descritor["nome_shm"])
+
+    def ler(parte):
+        inicio, dtype, tamanho = parte
+        return np.ndarray((tamanho,), dtype=np.dtype(dtype), buffer=shm.buf, offset=inicio)
+
+    dados = {}
+    for nome, tipo, meta, partes in descritor["colunas"]:
+        if tipo == "categoria":
+            dados[nome] = pd.Categorical.from_codes(ler(partes[0]), dtype=meta["dtype"])
+        elif tipo == "data":
+            dados[nome] = ler(partes[0]).view(meta["dtype"])
+        elif tipo == "numero":
+            dados[nome] = ler(partes[0])
+        elif tipo == "anulavel":
+            valores, mascara = (ler(p) for p in partes)
+            dados[nome] = meta["dtype"].construct_array_type()(valores, mascara)
+        else:
+            codigos, offsets, bytes_texto = (ler(p) for p in partes)
+            distintos = pa.Array.from_buffers(pa.large_string(), meta["n_distintos"],
+                                              [None, pa.py_buffer(offsets), pa.py_buffer(bytes_texto)])
+            valores = pd.Categorical.from_codes(codigos, categories=distintos.to_pandas())
+            dados[nome] = pd.Series(valores).astype(meta["dtype"]).array
+    df = pd.DataFrame(dados, index=descritor["indice"])
+    return shm, df
@@ -0,0 +1,112 @@
+"""
+metricas.py
+Métricas derivadas (colunas de data/metricas_engajamento.csv e do dataset simulado)
+calculadas a partir das contagens brutas, de forma vetorizada.
+- Cada métrica é declarada como uma razão: soma das colunas do numerador dividida pela
+  soma das colunas do denominador, com escala, arredondamento e valor padrão para
+  denominadores zero/nulos
+- registrar_metrica acrescenta novas métricas sem alterar o motor
+- calcular_metricas aplica as métricas cujas colunas de entrada estão presentes no df,
+  uma operação de array por métrica (sem apply linha a linha)
+"""
+
+from adiado import ModuloAdiado
+
+np = ModuloAdiado("numpy")
+
+METRICAS = {}
+
+
+def registrar_metrica(nome, numerador, denominador, escala=1.0, padrao=float("nan"),
+                      divisor_denominador=1.0, denominador_minimo=None, casas=None):
+    """
+    Declara a métrica
+        'nome' = escala * soma(numerador) / max(soma(denominador) / divisor_denominador, denominador_minimo)
+
+    - numerador/denominador: listas de colunas somadas antes da divisão
+    - padrao: valor usado quando o denominador é zero ou nulo
+    - casas: arredondamento do resultado (None = sem arredondar)
+    """
+    METRICAS[nome] = {
+        "numerador": list(numerador),
+        "denominador": list(denominador),
+        "escala": escala,
+        "padrao": padrao,
+        "divisor_denominador": divisor_denominador,
+        "denominador_minimo": denominador_minimo,
+        "casas": casas,
+    }
+
+
+def razao_segura(numerador, denominador, padrao=float("nan")):
+    """Divide elemento a elemento (em float64); onde o denominador é zero ou nulo retorna 'padrao'"""
+    num = np.asarray(numerador, dtype=np.float64)
+    den = np.asarray(denominador, dtype=np.float64)
+    resultado = np.full(np.broadcast(num, den).shape, padrao, dtype=np.float64)
+    np.divide(num, den, out=resultado, where=(den != 0) & ~np.isnan(den))
+    return resultado
+
+
+def _soma_colunas(df, colunas):
+    # soma em float64 para não estourar colunas inteiras compactas (ver esquema.py)
+    total = df[colunas[0]].to_numpy(dtype=np.float64, na_value=np.nan)
+    for coluna in colunas[1:]:
+        total = total + df[coluna].to_numpy(dtype=np.float64, na_value=np.nan)
+    return total
+
+
+def entradas_metrica(nome):
+    """Colunas brutas necessárias para calcular a métrica 'nome'"""
+    spec = METRICAS[nome]
+    return list(dict.fromkeys(spec["numerador"] + spec["denominador"]))
+
+
+def metricas_disponiveis(df, nomes=None):
+    """Nomes das métricas (todas, ou apenas 'nomes') cujas colunas de entrada existem em df"""
+    nomes = list(METRICAS) if nomes is None else nomes
+    return [n for n in nomes if all(c in df.columns for c in entradas_metrica(n))]
+
+
+def calcular_metrica(df, nome):
+    """Calcula a métrica 'nome' para todas as linhas de df e retorna um array float64"""
+    spec = METRICAS[nome]
+    denominador = _soma_colunas(df, spec["denominador"]) / spec["divisor_denominador"]
+    if spec["denominador_minimo"] is not None:
+        denominador = np.maximum(denominador, spec["denominador_minimo"])
+    valores = razao_segura(_soma_colunas(df, spec["numerador"]) * spec["escala"], denominador, spec["padrao"])
+    if spec["casas"] is not None:
+        valores = np.round(valores, spec["casas"])
+    return valores
+
+
+def calcular_metricas(df, nomes=None, somente_ausentes=False):
+    """
+    Retorna uma cópia de df com as colunas de métricas (todas, ou apenas 'nomes') adicionadas.
+    Métricas sem as colunas de entrada em df são ignoradas; com somente_ausentes=True,
+    métricas que já existem como coluna também são mantidas como estão.
+    """
+    df = df.copy()
+    for nome in metricas_disponiveis(df, nomes):
+        if somente_ausentes and nome in df.columns:
+            continue
+        df[nome] = calcular_metrica(df, nome)
+    return df
+
+
+# ----- Métricas de engajamento (data/metricas_engajamento.csv) -----
+METRICAS_ENGAJAMENTO = ["engagement_rate", "issue_resolution_rate", "commits_per_contributor",
+                        "engagement_per_star", "popularity_vs_activity", "commits_per_day", "issues_per_day"]
+# watchers == stars na API do GitHub, então engagement_rate = (watchers + forks) / stars
+registrar_metrica("engagement_rate", ["stars", "forks"], ["stars"])
+registrar_metrica("issue_resolution_rate", ["issues_fechadas"], ["issues_abertas", "issues_fechadas"])
+registrar_metrica("commits_per_contributor", ["commits"], ["contributors"])
+registrar_metrica("engagement_per_star", ["contributors"], ["stars"])
+registrar_metrica("popularity_vs_activity", ["stars"], ["contributors"])
+registrar_metrica("commits_per_day", ["commits"], ["idade_dias"])
+registrar_metrica("issues_per_day", ["issues_abertas", "issues_fechadas"], ["idade_dias"])
+
+# ----- Métricas do dataset de repositórios (01_coleta_dados.py e a simulação de 02) -----
+# taxa em % (= 100 * issue_resolution_rate), 0 quando não há issues; commits por mês com no mínimo 1 mês de existência
+registrar_metrica("taxa_resolucao_issues", ["issues_fechadas"], ["issues_abertas", "issues_fechadas"],
+                  escala=100.0, padrao=0.0, casas=2)
+registrar_metrica("commits_por_mes", ["commits"], ["idade_dias"], divisor_denominador=30, denominador_minimo=1, casas=2)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+pipeline.py
+Executa as etapas 01-04 como um DAG, com os caminhos canônicos de caminhos.py.
+- Cada etapa declara o script, os argumentos, os arquivos de entrada e os de saída; as
+  dependências vêm de qual etapa produz cada entrada
+- Etapas independentes (ex.: caracterização 02 e análise 03) rodam ao mesmo tempo, cada
+  uma em seu próprio processo Python (no máximo --jobs de uma vez)
+- Uma etapa é pulada quando a assinatura (conteúdo das entradas, código do script e dos
+  módulos locais que ele importa, argumentos) é a da última execução bem-sucedida e as
+  saídas existem; o estado fica em outputs/.pipeline/estado.json
+- A saída de cada etapa vai para outputs/.pipeline/<etapa>.log; ao fim, relatório com o
+  tempo de cada etapa e o caminho crítico (a cadeia de dependências mais demorada)
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from caminhos import DASHBOARD, DATASET_ENGAJAMENTO, DATASET_REPOSITORIOS, OUTPUT_DIR, RAIZ
+
+PASTA_CODIGO = os.path.dirname(os.path.abspath(__file__))
+PASTA_ESTADO = os.path.join(OUTPUT_DIR, ".pipeline")
+LINHAS_LOG_ERRO = 20
+
+
+class Etapa:
+    """Um script do pipeline com seus argumentos, entradas e saídas"""
+
+    def __init__(self, nome, script, argumentos=(), entradas=(), saidas=(), sempre=False):
+        self.nome = nome
+        self.script = os.path.join(PASTA_CODIGO, script)
+        self.argumentos = [str(a) for a in argumentos]
+        self.entradas = list(entradas)
+        self.saidas = list(saidas)
+        # etapas com entrada externa (ex.: API do GitHub) não podem ser puladas
+        self.sempre = sempre
+
+
+def etapas_padrao(linhas=500, data_referencia=None, github=False):
+    """As etapas 01-04 ligadas pelos caminhos canônicos"""
+    saida = lambda *nomes: [os.path.join(OUTPUT_DIR, n) for n in nomes]
+    coleta = ["--output", DATASET_REPOSITORIOS, "--rows", linhas]
+    if data_referencia:
+        coleta += ["--reference-date", data_referencia]
+    if github:
+        coleta.append("--github")
+    return [
+        Etapa("coleta", "01_coleta_dados.py", coleta, saidas=[DATASET_REPOSITORIOS], sempre=github),
+        Etapa("caracterizacao", "02_caracterizacao_dataset.py", entradas=[DATASET_REPOSITORIOS],
+              saidas=saida("estatisticas_gerais.json", "repos_por_linguagem_bar.png", "distribuicao_stars_hist.png",
+                           "boxplot_stars_por_linguagem.png", "repos_por_mes_line.png", "resumo_por_linguagem.csv")),
+        Etapa("analise", "03_analise_rqs.py", entradas=[DATASET_ENGAJAMENTO],
+              saidas=saida("resumo_rqs.json", "rq1_stars_x_commits_scatter.png", "rq1_stars_x_contributors_scatter.png",
+                           "rq1_stars_x_commits_interactive.html", "rq2_taxa_resolucao_boxplot.png",
+                           "rq2_resumo_taxa_resolucao_por_linguagem.csv", "correlacoes_metricas.json")),
+        Etapa("dashboard", "04_dashboard_completo_v2.py", ["--input", DATASET_REPOSITORIOS, "--output", DASHBOARD],
+              entradas=[DATASET_REPOSITORIOS], saidas=[DASHBOARD]),
+    ]
+
+
+def dependencias(etapas):
+    """{etapa: [etapas que produzem alguma de suas entradas]}; erro se houver ciclo"""
+    produtor = {os.path.abspath(s): e.nome for e in etapas for s in e.saidas}
+    grafo = {e.nome: sorted({produtor[os.path.abspath(x)] for x in e.entradas if os.path.abspath(x) in produtor})
+             for e in etapas}
+    visitadas, em_curso = set(), set()
+
+    def visitar(nome):
+        if nome in em_curso:
+            raise ValueError(f"Ciclo de dependências no pipeline envolvendo '{nome}'.")
+        if nome not in visitadas:
+            em_curso.add(nome)
+            for anterior in grafo[nome]:
+                visitar(anterior)
+            em_curso.discard(nome)
+            visitadas.add(nome)
+
+    for nome in grafo:
+        visitar(nome)
+    return grafo
+
+
+def modulos_locais(script):
+    """O script e os módulos da pasta code/ que ele importa, direta ou indiretamente"""
+    encontrados, pendentes = set(), [os.path.abspath(script)]
+    while pendentes:
+        arquivo = pendentes.pop()
+        if arquivo in encontrados:
+            continue
+        encontrados.add(arquivo)
+        with open(arquivo, encoding="utf-8") as f:
+            arvore = ast.parse(f.read(), arquivo)
+        for no in ast.walk(arvore):
+            nomes = [a.name for a in no.names] if isinstance(no, ast.Import) else \
+                [no.module] if isinstance(no, ast.ImportFrom) and no.module and not no.level else []
+            for nome in nomes:
+                candidato = os.path.join(PASTA_CODIGO, nome.split(".")[0] + ".py")
+                if os.path.exists(candidato):
+                    pendentes.append(candidato)
+    return sorted(encontrados)
+
+
+class Estado:
+    """Assinaturas das últimas execuções bem-sucedidas e hashes de arquivos (por tamanho/mtime)"""
+
+    def __init__(self, pasta=PASTA_ESTADO):
+        self.caminho = os.path.join(pasta, "estado.json")
+        os.makedirs(pasta, exist_ok=True)
+        self.assinaturas, self.hashes = {}, {}
+        if os.path.exists(self.caminho):
+            with open(self.caminho, encoding="utf-8") as f:
+                conteudo = json.load(f)
+            self.assinaturas, self.hashes = conteudo["assinaturas"], conteudo["hashes"]
+
+    def hash_arquivo(self, caminho):
+        """sha256 do conteúdo, recalculado só quando tamanho ou mtime mudam"""
+        caminho = os.path.abspath(caminho)
+        if not os.path.exists(caminho):
+            return None
+        info = os.stat(caminho)
+        guardado = self.hashes.get(caminho)
+        if guardado and guardado["tamanho"] == info.st_size and guardado["mtime_ns"] == info.st_mtime_ns:
+            return guardado["sha256"]
+        h = hashlib.sha256()
+        with open(caminho, "rb") as f:
+            for parte in iter(lambda: f.read(1 << 20), b""):
+                h.update(parte)
+        self.hashes[caminho] = {"tamanho": info.st_size, "mtime_ns": info.st_mtime_ns, "sha256": h.hexdigest()}
+        return h.hexdigest()
+
+    def assinatura(self, etapa):
+        h = hashlib.sha256(json.dumps(etapa.argumentos).encode())
+        for arquivo in modulos_locais(etapa.script) + [os.path.abspath(e) for e in etapa.entradas]:
+            h.update(f"{os.path.relpath(arquivo, RAIZ)}:{self.hash_arquivo(arquivo)}".encode())
+        return h.hexdigest()
+
+    def atualizada(self, etapa, assinatura):
+        return (not etapa.sempre and self.assinaturas.get(etapa.nome) == assinatura
+                and all(os.path.exists(s) for s in etapa.saidas))
+
+    def salvar(self):
+        temporario = self.caminho + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            json.dump({"assinaturas": self.assinaturas, "hashes": self.hashes}, f, indent=1)
+        os.replace(temporario, self.caminho)
+
+
+def executar_etapa(etapa, referencia):
+    """
+    Roda o script da etapa em um processo Python separado; retorna (código de saída, início em
+    segundos desde 'referencia', segundos). O início é medido aqui, quando a etapa sai da fila
+    do executor, e não quando foi submetida.
+    """
+    inicio = time.perf_counter()
+    print(f"[INFO] {etapa.nome}: iniciando {os.path.basename(etapa.script)}")
+    with open(os.path.join(PASTA_ESTADO, f"{etapa.nome}.log"), "w", encoding="utf-8") as log:
+        processo = subprocess.run([sys.executable, etapa.script, *etapa.argumentos], cwd=PASTA_CODIGO,
+                                  stdout=log, stderr=subprocess.STDOUT)
+    return processo.returncode, inicio - referencia, time.perf_counter() - inicio
+
+
+def executar_pipeline(etapas, jobs=None, forcar=False):
+    """
+    Executa as etapas na ordem do DAG, com até 'jobs' etapas em paralelo.
+    Retorna {etapa: {"status", "segundos", "inicio"}}; status é "executada", "pulada",
+    "falhou" ou "bloqueada" (alguma dependência falhou).
+    """
+    grafo = dependencias(etapas)
+    por_nome = {e.nome: e for e in etapas}
+    estado = Estado()
+    resultados = {}
+    pendentes = list(grafo)
+    em_execucao = {}
+    inicio_pipeline = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        while pendentes or em_execucao:
+            for nome in list(pendentes):
+                anteriores = grafo[nome]
+                if any(resultados.get(a, {}).get("status") in ("falhou", "bloqueada") for a in anteriores):
+                    resultados[nome] = {"status": "bloqueada", "segundos": 0.0, "inicio": 0.0}
+                    pendentes.remove(nome)
+                    print(f"[WARN] {nome}: não executada (dependência falhou)")
+                    continue
+                if not all(a in resultados for a in anteriores):
+                    continue
+                pendentes.remove(nome)
+                # entradas só são lidas depois que as etapas anteriores terminaram
+                assinatura = estado.assinatura(por_nome[nome])
+                if not forcar and estado.atualizada(por_nome[nome], assinatura):
+                    resultados[nome] = {"status": "pulada", "segundos": 0.0,
+                                        "inicio": time.perf_counter() - inicio_pipeline}
+                    print(f"[CACHE] {nome}: entradas e código sem alterações; etapa pulada.")
+                    continue
+                futuro = executor.submit(executar_etapa, por_nome[nome], inicio_pipeline)
+                em_execucao[futuro] = (nome, assinatura)
+            if not em_execucao:
+                continue
+
+            prontas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in prontas:
+                nome, assinatura = em_execucao.pop(futuro)
+                codigo, inicio, segundos = futuro.result()
+                if codigo == 0:
+                    estado.assinaturas[nome] = assinatura
+                    resultados[nome] = {"status": "executada", "segundos": segundos, "inicio": inicio}
+                    print(f"[OK] {nome}: concluída em {segundos:.1f}s")
+                else:
+                    estado.assinaturas.pop(nome, None)
+                    resultados[nome] = {"status": "falhou", "segundos": segundos, "inicio": inicio}
+                    log = os.path.join(PASTA_ESTADO, f"{nome}.log")
+                    with open(log, encoding="utf-8", errors="replace") as f:
+                        cauda = f.readlines()[-LINHAS_LOG_ERRO:]
+                    print(f"[ERRO] {nome}: saiu com código {codigo} ({log}):\n" + "".join(cauda).rstrip())
+                estado.salvar()
+    estado.salvar()
+    return resultados
+
+
+def caminho_critico(grafo, resultados):
+    """(etapas da cadeia de dependências mais demorada, soma dos tempos dela)"""
+    fim, anterior = {}, {}
+
+    def calcular(nome):
+        if nome not in fim:
+            melhor = max(grafo[nome], key=calcular, default=None)
+            anterior[nome] = melhor
+            fim[nome] = resultados[nome]["segundos"] + (fim[melhor] if melhor else 0.0)
+        return fim[nome]
+
+    ultimo = max(grafo, key=calcular)
+    cadeia = [ultimo]
+    while anterior[cadeia[-1]]:
+        cadeia.append(anterior[cadeia[-1]])
+    return cadeia[::-1], fim[ultimo]
+
+
+def relatorio(etapas, resultados, total):
+    grafo = dependencias(etapas)
+    print("\nRelatório do pipeline:")
+    print("-" * 70)
+    print(f"{'etapa':<16}{'status':<12}{'início (s)':>12}{'duração (s)':>14}  depende de")
+    for etapa in etapas:
+        r = resultados[etapa.nome]
+        print(f"{etapa.nome:<16}{r['status']:<12}{r['inicio']:>12.1f}{r['segundos']:>14.1f}  "
+              f"{', '.join(grafo[etapa.nome]) or '-'}")
+    cadeia, critico = caminho_critico(grafo, resultados)
+    soma = sum(r["segundos"] for r in resultados.values())
+    print("-" * 70)
+    print(f"Tempo total: {total:.1f}s (soma das etapas: {soma:.1f}s, paralelismo {soma / max(total, 1e-9):.2f}x)")
+    print(f"Caminho crítico: {' -> '.join(cadeia)} ({critico:.1f}s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa as etapas 01-04 como um DAG (pula as que não mudaram)")
+    parser.add_argument("--rows", type=int, default=500, help="repositórios gerados/coletados pela etapa 01 (padrão: 500)")
+    parser.add_argument("--reference-date", default=None, help="data de referência da etapa 01 (AAAA-MM-DD)")
+    parser.add_argument("--github", action="store_true",
+                        help="etapa 01 coleta da API do GitHub (sempre executada) em vez de simular")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="máximo de etapas executadas ao mesmo tempo (padrão: número de CPUs)")
+    parser.add_argument("--force", action="store_true", help="executa todas as etapas, mesmo as sem alterações")
+    args = parser.parse_args(argv)
+
+    etapas = etapas_padrao(args.rows, args.reference_date, args.github)
+    inicio = time.perf_counter()
+    resultados = executar_pipeline(etapas, args.jobs, args.force)
+    relatorio(etapas, resultados, time.perf_counter() - inicio)
+    if any(r["status"] in ("falhou", "bloqueada") for r in resultados.values()):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+posthoc.py
+Comparações entre grupos (ex.: taxa de resolução por linguagem) a partir de uma única
+ordenação da amostra conjunta.
+- PostosAgrupados ordena todos os valores uma vez (postos médios nos empates) e guarda, por
+  grupo, o tamanho e a soma dos postos, além da correção de empates Σ(t³ - t)
+- kruskal(): estatística H e p-valor, iguais aos de scipy.stats.kruskal
+- dunn(): teste de Dunn para todos os pares de grupos, vetorizado sobre os pares, com
+  correção de comparações múltiplas (holm, bonferroni ou fdr_bh) e tamanho de efeito
+  r = z / sqrt(n_i + n_j); nenhum par reordena os dados
+"""
+
+from adiado import ModuloAdiado
+
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+stats = ModuloAdiado("scipy.stats")
+
+CORRECOES = ["holm", "bonferroni", "fdr_bh"]
+
+
+def ajustar_p_valores(p, metodo="holm"):
+    """p-valores ajustados para comparações múltiplas (mesmas definições do multipletests do statsmodels)"""
+    p = np.asarray(p, dtype=np.float64)
+    m = len(p)
+    if m == 0:
+        return p
+    if metodo == "bonferroni":
+        return np.minimum(p * m, 1.0)
+    ordem = np.argsort(p, kind="stable")
+    ordenados = p[ordem]
+    if metodo == "holm":
+        ajustados = np.maximum.accumulate(ordenados * (m - np.arange(m)))
+    elif metodo == "fdr_bh":
+        ajustados = np.minimum.accumulate((ordenados * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        raise ValueError(f"Correção desconhecida: {metodo} (use {', '.join(CORRECOES)}).")
+    saida = np.empty(m)
+    saida[ordem] = np.minimum(ajustados, 1.0)
+    return saida
+
+
+class PostosAgrupados:
+    """Postos da amostra conjunta, resumidos por grupo (tamanho e posto médio)"""
+
+    def __init__(self, valores, grupos, ordem_grupos=None):
+        valores = np.asarray(valores, dtype=np.float64)
+        validos = ~np.isnan(valores)
+        valores, grupos = valores[validos], np.asarray(grupos)[validos]
+        self.n = len(valores)
+        postos = stats.rankdata(valores)
+        _, contagens_empate = np.unique(valores, return_counts=True)
+        self.empates = float(np.sum(contagens_empate.astype(np.float64) ** 3 - contagens_empate))
+
+        codigos, nomes = pd.factorize(grupos)
+        tamanhos = np.bincount(codigos, minlength=len(nomes))
+        somas = np.bincount(codigos, weights=postos, minlength=len(nomes))
+        por_grupo = pd.DataFrame({"n": tamanhos, "soma_postos": somas}, index=pd.Index(nomes, name="grupo"))
+        if ordem_grupos is not None:
+            por_grupo = por_grupo.loc[list(ordem_grupos)]
+        por_grupo["posto_medio"] = por_grupo["soma_postos"] / por_grupo["n"]
+        self.por_grupo = por_grupo
+
+    def kruskal(self):
+        """(H, p-valor) do teste de Kruskal-Wallis, com correção de empates"""
+        n, g = self.n, self.por_grupo
+        h = 12 / (n * (n + 1)) * np.sum(g["soma_postos"] ** 2 / g["n"]) - 3 * (n + 1)
+        h /= 1 - self.empates / (n ** 3 - n)
+        return float(h), float(stats.chi2.sf(h, len(g) - 1))
+
+    def dunn(self, correcao="holm"):
+        """
+        Teste de Dunn para todos os pares. Retorna (pares, matriz): 'pares' tem uma linha por
+        par (grupo_a, grupo_b, diferença de postos médios, z, p, p ajustado, efeito r) e
+        'matriz' é a tabela grupo x grupo de p-valores ajustados (diagonal = 1)
+        """
+        g = self.por_grupo
+        n = self.n
+        i, j = np.triu_indices(len(g), k=1)
+        tamanhos, medias = g["n"].to_numpy(np.float64), g["posto_medio"].to_numpy()
+        variancia = (n * (n + 1) / 12 - self.empates / (12 * (n - 1))) * (1 / tamanhos[i] + 1 / tamanhos[j])
+        diferenca = medias[i] - medias[j]
+        z = diferenca / np.sqrt(variancia)
+        p = 2 * stats.norm.sf(np.abs(z))
+        p_ajustado = ajustar_p_valores(p, correcao)
+        nomes = g.index.astype(str)
+        pares = pd.DataFrame({
+            "grupo_a": nomes[i], "grupo_b": nomes[j], "diferenca_posto_medio": diferenca,
+            "z": z, "p": p, "p_ajustado": p_ajustado, "efeito_r": z / np.sqrt(tamanhos[i] + tamanhos[j]),
+        })
+        matriz = np.ones((len(g), len(g)))
+        matriz[i, j] = matriz[j, i] = p_ajustado
+        return pares, pd.DataFrame(matriz, index=nomes, columns=nomes)
@@ -0,0 +1,272 @@
+"""
+servidor_mock_github.py
+Servidor HTTP local (biblioteca padrão) que imita os endpoints da API do GitHub usados por
+coleta_github.py, com respostas geradas de forma determinística a partir de uma seed, para
+testar a coleta (resultado e vazão) sem rede.
+- /search/repositories: paginada, ordem decrescente de stars, com total_count e cabeçalho
+  Link (no máximo 1000 resultados, como no GitHub)
+- /repos/{dono}/{nome}/contributors|commits|pulls: listas com Link rel="last";
+  /search/issues: total_count de issues abertas/fechadas; /repos/{dono}/{nome}/readme: 200 ou 404
+- X-RateLimit-* em todas as respostas; com limite_taxa, a cota por janela se esgota e o
+  servidor responde 403 até o reset
+- ETag e Last-Modified em toda resposta 200; 304 quando If-None-Match coincide (ou, sem
+  ele, If-Modified-Since não é anterior à última atualização dos dados). Como no GitHub, o
+  304 não consome a cota; atualizar() troca os dados servidos (muda ETags e Last-Modified)
+- falhas: fração de respostas 502 sorteadas; latencia: atraso por resposta (segundos)
+- repositorios: o "gabarito" das contagens, para conferir o dataset coletado
+
+Uso: python servidor_mock_github.py --repos 1000 --port 8765
+     python 01_coleta_dados.py --github --api-url http://127.0.0.1:8765 --rows 1000
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from datetime import date
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+LINGUAGENS = ["Python", "JavaScript", "Java", "TypeScript", "Go", "Rust", "C++", "Ruby", None]
+LICENCAS = ["MIT", "Apache-2.0", "GPL-3.0", "BSD-3-Clause", None]
+TOPICOS = [[], ["machine-learning", "python"], ["react", "frontend"], ["cli"], ["kubernetes", "devops"],
+           ["android"], ["game-engine"], ["data-science"], ["library"]]
+MAXIMO_BUSCA = 1000
+
+
+def repositorios_mock(n=1000, seed=42, data_referencia=date(2025, 1, 1)):
+    """DataFrame com os repositórios servidos (um por linha), em ordem decrescente de stars"""
+    rng = np.random.default_rng(seed)
+    stars = np.sort(rng.lognormal(8, 1.5, n).astype(np.int64))[::-1]
+    criacao = np.datetime64(data_referencia) - rng.integers(30, 3650, n).astype("timedelta64[D]")
+    atualizacao = np.datetime64(data_referencia) - rng.integers(0, 30, n).astype("timedelta64[D]")
+    return pd.DataFrame({
+        "full_name": [f"org-{i % 97}/repo-{i:06d}" for i in range(n)],
+        "language": [LINGUAGENS[i] for i in rng.integers(0, len(LINGUAGENS), n)],
+        "stargazers_count": stars,
+        "forks_count": (stars * rng.uniform(0.05, 0.3, n)).astype(np.int64),
+        "size": rng.lognormal(8, 2, n).astype(np.int64),
+        "created_at": pd.to_datetime(criacao).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "updated_at": pd.to_datetime(atualizacao).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "has_wiki": rng.random(n) < 0.3,
+        "license": [LICENCAS[i] for i in rng.integers(0, len(LICENCAS), n)],
+        "topics": [TOPICOS[i] for i in rng.integers(0, len(TOPICOS), n)],
+        "contributors": rng.lognormal(2, 1.5, n).astype(np.int64),
+        "commits": rng.lognormal(6, 2, n).astype(np.int64),
+        "pulls": rng.lognormal(4, 2, n).astype(np.int64),
+        "issues_abertas": rng.poisson(30, n),
+        "issues_fechadas": rng.lognormal(4, 2, n).astype(np.int64),
+        "tem_readme": rng.random(n) < 0.9,
+    })
+
+
+def _item_busca(linha):
+    return {
+        "full_name": linha.full_name, "language": linha.language if isinstance(linha.language, str) else None,
+        "stargazers_count": int(linha.stargazers_count), "forks_count": int(linha.forks_count),
+        "size": int(linha.size), "created_at": linha.created_at, "updated_at": linha.updated_at,
+        "has_wiki": bool(linha.has_wiki), "topics": linha.topics,
+        "license": {"spdx_id": linha.license} if isinstance(linha.license, str) else None,
+    }
+
+
+class ManipuladorGitHub(BaseHTTPRequestHandler):
+    # HTTP/1.1: conexões keep-alive, como na API real
+    protocol_version = "HTTP/1.1"
+    # cabeçalhos e corpo num só envio (escritas separadas esbarram no ACK atrasado do TCP)
+    wbufsize = 1 << 16
+
+    def log_message(self, formato, *args):
+        pass
+
+    def _enviar(self, status, conteudo=None, cabecalhos=None):
+        servidor = self.server
+        corpo = b"" if conteudo is None else json.dumps(conteudo).encode("utf-8")
+        cabecalhos = {**servidor.cabecalhos_limite(), **(cabecalhos or {})}
+        if status == 200:
+            # o Link entra no ETag: com per_page=1 a contagem muda só nele (no GitHub muda o 1º item)
+            etag = '"' + hashlib.sha1(corpo + cabecalhos.get("Link", "").encode()).hexdigest() + '"'
+            cabecalhos["ETag"] = etag
+            cabecalhos["Last-Modified"] = formatdate(servidor.modificado_em, usegmt=True)
+            if self._nao_modificado(etag):
+                status, corpo = 304, b""
+                servidor.devolver_cota()
+        servidor.contar(status)
+        self.send_response(status)
+        for nome, valor in cabecalhos.items():
+            self.send_header(nome, valor)
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _nao_modificado(self, etag):
+        if "If-None-Match" in self.headers:
+            return self.headers["If-None-Match"] == etag
+        if "If-Modified-Since" in self.headers:
+            return parsedate_to_datetime(self.headers["If-Modified-Since"]).timestamp() >= int(self.server.modificado_em)
+        return False
+
+    def _link(self, caminho, parametros, pagina, ultima):
+        """Cabeçalho Link no formato do GitHub (next/last/prev/first)"""
+        base = f"http://{self.headers.get('Host')}{caminho}"
+        url = lambda p: base + "?" + "&".join(f"{k}={v}" for k, v in {**parametros, "page": p}.items())
+        rels = []
+        if pagina < ultima:
+            rels += [f'<{url(pagina + 1)}>; rel="next"', f'<{url(ultima)}>; rel="last"']
+        if pagina > 1:
+            rels += [f'<{url(1)}>; rel="first"', f'<{url(pagina - 1)}>; rel="prev"']
+        return {"Link": ", ".join(rels)} if rels else {}
+
+    def do_GET(self):
+        servidor = self.server
+        if servidor.latencia:
+            time.sleep(servidor.latencia)
+        if not servidor.consumir_cota():
+            return self._enviar(403, {"message": "API rate limit exceeded"})
+        if servidor.falhas and servidor.sortear_falha():
+            return self._enviar(502, {"message": "Server Error"})
+
+        partes = urlsplit(self.path)
+        parametros = {k: v[-1] for k, v in parse_qs(partes.query).items()}
+        trechos = [t for t in partes.path.split("/") if t]
+        por_pagina = max(1, min(int(parametros.get("per_page", 30)), 100))
+        pagina = max(1, int(parametros.get("page", 1)))
+        repos = servidor.repositorios
+
+        if trechos == ["search", "repositories"]:
+            total = min(len(repos), MAXIMO_BUSCA)
+            inicio = (pagina - 1) * por_pagina
+            itens = [_item_busca(linha) for linha in repos.iloc[inicio:min(inicio + por_pagina, total)].itertuples()]
+            ultima = max(1, math.ceil(total / por_pagina))
+            return self._enviar(200, {"total_count": len(repos), "incomplete_results": False, "items": itens},
+                                self._link(partes.path, parametros, pagina, ultima))
+        if trechos == ["search", "issues"]:
+            termos = dict(t.split(":", 1) for t in parametros.get("q", "").split() if ":" in t)
+            linha = servidor.por_nome.get(termos.get("repo"))
+            if linha is None:
+                return self._enviar(422, {"message": "Validation Failed"})
+            total = int(repos.at[linha, "issues_fechadas" if termos.get("state") == "closed" else "issues_abertas"])
+            return self._enviar(200, {"total_count": total, "incomplete_results": False, "items": []})
+        if len(trechos) == 4 and trechos[0] == "repos":
+            linha = servidor.por_nome.get(f"{trechos[1]}/{trechos[2]}")
+            if linha is None:
+                return self._enviar(404, {"message": "Not Found"})
+            recurso = trechos[3]
+            if recurso == "readme":
+                if not repos.at[linha, "tem_readme"]:
+                    return self._enviar(404, {"message": "Not Found"})
+                return self._enviar(200, {"name": "README.md", "path": "README.md"})
+            if recurso in ("contributors", "commits", "pulls"):
+                total = int(repos.at[linha, recurso])
+                if total == 0:
+                    return self._enviar(204 if recurso == "contributors" else 409 if recurso == "commits" else 200,
+                                        [] if recurso == "pulls" else None)
+                inicio = (pagina - 1) * por_pagina
+                itens = [{"id": i} for i in range(inicio, min(inicio + por_pagina, total))]
+                return self._enviar(200, itens, self._link(partes.path, parametros, pagina,
+                                                           math.ceil(total / por_pagina)))
+        return self._enviar(404, {"message": "Not Found"})
+
+
+class ServidorMockGitHub(ThreadingHTTPServer):
+    """ThreadingHTTPServer com os dados servidos, a cota de requisições e contadores por status"""
+    daemon_threads = True
+
+    def __init__(self, repositorios, porta=0, latencia=0.0, falhas=0.0, limite_taxa=None, janela=60.0, seed=42):
+        super().__init__(("127.0.0.1", porta), ManipuladorGitHub)
+        self.atualizar(repositorios)
+        self.latencia = latencia
+        self.falhas = falhas
+        self.limite_taxa = limite_taxa
+        self.janela = janela
+        self._trava = threading.Lock()
+        self._rng = random.Random(seed)
+        self._inicio_janela = time.time()
+        self._usadas = 0
+        self.respostas = {}
+        self._thread = None
+
+    def atualizar(self, repositorios):
+        """Passa a servir 'repositorios' (ex.: com contagens alteradas para testar revalidação)"""
+        self.repositorios = repositorios
+        self.por_nome = {nome: i for i, nome in enumerate(repositorios["full_name"])}
+        self.modificado_em = time.time()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def _reset(self):
+        return int(math.ceil(self._inicio_janela + self.janela))
+
+    def consumir_cota(self):
+        with self._trava:
+            if time.time() >= self._reset():
+                self._inicio_janela, self._usadas = time.time(), 0
+            if self.limite_taxa is not None and self._usadas >= self.limite_taxa:
+                return False
+            self._usadas += 1
+            return True
+
+    def devolver_cota(self):
+        with self._trava:
+            self._usadas = max(self._usadas - 1, 0)
+
+    def cabecalhos_limite(self):
+        with self._trava:
+            limite = self.limite_taxa if self.limite_taxa is not None else 5000
+            return {"X-RateLimit-Limit": str(limite), "X-RateLimit-Remaining": str(max(limite - self._usadas, 0)),
+                    "X-RateLimit-Reset": str(self._reset())}
+
+    def sortear_falha(self):
+        with self._trava:
+            return self._rng.random() < self.falhas
+
+    def contar(self, status):
+        with self._trava:
+            self.respostas[status] = self.respostas.get(status, 0) + 1
+
+    def iniciar(self):
+        """Atende em uma thread de fundo (para uso dentro de outro processo/script)"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def encerrar(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API do GitHub usada pela coleta")
+    parser.add_argument("--repos", type=int, default=1000, help="número de repositórios servidos (padrão: 1000)")
+    parser.add_argument("--port", type=int, default=8765, help="porta (padrão: 8765)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency", type=float, default=0.0, help="atraso por resposta, em segundos")
+    parser.add_argument("--failures", type=float, default=0.0, help="fração de respostas 502 (0 a 1)")
+    parser.add_argument("--rate-limit", type=int, default=None, help="requisições por janela antes de responder 403")
+    parser.add_argument("--window", type=float, default=60.0, help="duração da janela do limite de taxa, em segundos")
+    args = parser.parse_args()
+
+    servidor = ServidorMockGitHub(repositorios_mock(args.repos, args.seed), args.port, args.latency,
+                                  args.failures, args.rate_limit, args.window, args.seed)
+    print(f"[INFO] API simulada do GitHub em {servidor.url} ({args.repos} repositórios). Ctrl+C encerra.")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+sketches.py
+Sketches de quantis mescláveis para estatísticas sobre dados que não cabem em memória.
+- SketchKLL (Karnin, Lang & Liberty, 2016): guarda O(k) valores em níveis; cada nível h
+  tem peso 2^h e, quando passa da capacidade, é ordenado e metade dos itens (pares ou
+  ímpares, ao acaso) sobe para o nível seguinte. O peso total continua exatamente n
+- Sketches de blocos/processos diferentes podem ser mesclados (merge) sem perda adicional
+- Garantia: o posto normalizado estimado de qualquer valor erra em no máximo ε com alta
+  probabilidade, com ε ≈ erro_posto_kll(k) (k=1000 -> ε ≈ 0,3%); o erro típico é bem menor
+- SketchesPorGrupo: um SketchKLL por grupo (ex.: por linguagem), memória constante por grupo;
+  resumo_boxplot dá quartis, mediana e extremos dos bigodes estimados de um sketch
+"""
+
+from adiado import ModuloAdiado
+
+np = ModuloAdiado("numpy")
+pd = ModuloAdiado("pandas")
+
+K_PADRAO = 1000
+# razão entre capacidades de níveis consecutivos (a capacidade do nível do topo é k)
+FATOR_CAPACIDADE = 2 / 3
+
+
+def erro_posto_kll(k):
+    """
+    Limite aproximado (99% de confiança) do erro de posto normalizado de um SketchKLL,
+    pela fórmula empírica ε ≈ 2.296 / k^0.9723 publicada para o KLL do Apache DataSketches,
+    que usa o mesmo esquema de capacidades (c = 2/3)
+    """
+    return 2.296 / k ** 0.9723
+
+
+class SketchKLL:
+    """Sketch KLL de quantis para valores float (NaN são ignorados)"""
+
+    def __init__(self, k=K_PADRAO, seed=None):
+        self.k = k
+        self.n = 0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+        self.niveis = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+        self._ordenados = None
+
+    def _capacidade(self, h):
+        altura = len(self.niveis)
+        return max(2, int(np.ceil(self.k * FATOR_CAPACIDADE ** (altura - 1 - h))))
+
+    def atualizar(self, valores):
+        """Acrescenta um bloco de valores ao sketch"""
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        valores = valores[~np.isnan(valores)]
+        if len(valores) == 0:
+            return self
+        self.niveis[0] = np.concatenate([self.niveis[0], valores])
+        self.n += len(valores)
+        self.minimo = min(self.minimo, valores.min())
+        self.maximo = max(self.maximo, valores.max())
+        self._compactar()
+        return self
+
+    def merge(self, outro):
+        """Incorpora outro sketch (de um bloco ou processo diferente) a este"""
+        while len(self.niveis) < len(outro.niveis):
+            self.niveis.append(np.empty(0))
+        for h, nivel in enumerate(outro.niveis):
+            self.niveis[h] = np.concatenate([self.niveis[h], nivel])
+        self.n += outro.n
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+        self._compactar()
+        return self
+
+    def _compactar(self):
+        """Compacta níveis acima da capacidade até que todos caibam"""
+        self._ordenados = None
+        h = 0
+        while h < len(self.niveis):
+            nivel = self.niveis[h]
+            if len(nivel) <= self._capacidade(h):
+                h += 1
+                continue
+            if h + 1 == len(self.niveis):
+                self.niveis.append(np.empty(0))
+            nivel = np.sort(nivel)
+            # com número ímpar de itens, o menor fica no nível; os demais viram metade com peso dobrado
+            impar = len(nivel) % 2
+            promovidos = nivel[impar + self._rng.integers(2)::2]
+            self.niveis[h] = nivel[:impar]
+            self.niveis[h + 1] = np.concatenate([self.niveis[h + 1], promovidos])
+            # um nível novo reduz a capacidade dos de baixo: recomeça do início
+            h = 0
+
+    def _itens_ordenados(self):
+        if self._ordenados is None:
+            self._ordenados = [np.sort(nivel) for nivel in self.niveis]
+        return self._ordenados
+
+    def posto(self, valores, inclusivo=True):
+        """
+        Posto normalizado estimado de cada valor: fração dos itens <= valor (inclusivo)
+        ou < valor (inclusivo=False)
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        lado = "right" if inclusivo else "left"
+        contagem = np.zeros(valores.shape, dtype=np.float64)
+        for h, nivel in enumerate(self._itens_ordenados()):
+            if len(nivel):
+                contagem += np.searchsorted(nivel, valores, side=lado) * float(2 ** h)
+        return contagem / max(self.n, 1)
+
+    def posto_medio(self, valores):
+        """Posto médio normalizado (empates recebem a média dos postos, como em scipy.stats.rankdata)"""
+        return (self.posto(valores, inclusivo=False) + self.posto(valores, inclusivo=True)) / 2
+
+    def valor_no_posto(self, posicao):
+        """Valor estimado na(s) posição(ões) 0-based da ordenação dos n valores"""
+        posicao = np.asarray(posicao, dtype=np.float64)
+        itens = np.concatenate(self.niveis)
+        if len(itens) == 0:
+            return np.full(posicao.shape, np.nan)
+        pesos = np.concatenate([np.full(len(nivel), float(2 ** h)) for h, nivel in enumerate(self.niveis)])
+        ordem = np.argsort(itens, kind="stable")
+        itens, acumulado = itens[ordem], np.cumsum(pesos[ordem])
+        # o item da posição p é o primeiro cujo peso acumulado passa de p
+        indice = np.minimum(np.searchsorted(acumulado, posicao + 1, side="left"), len(itens) - 1)
+        valores = itens[indice]
+        return np.where(posicao <= 0, self.minimo, np.where(posicao >= self.n - 1, self.maximo, valores))
+
+    def quantil(self, q):
+        """
+        Valor estimado do(s) quantil(is) q em [0, 1], com a interpolação linear do numpy/pandas
+        (resultado exato enquanto o sketch não compactou; q=0 e q=1 dão o mínimo e o máximo)
+        """
+        posicao = np.asarray(q, dtype=np.float64) * max(self.n - 1, 0)
+        abaixo, acima = np.floor(posicao), np.ceil(posicao)
+        inferior, superior = self.valor_no_posto(abaixo), self.valor_no_posto(acima)
+        return inferior + (posicao - abaixo) * (superior - inferior)
+
+    def tamanho(self):
+        """Número de itens guardados (memória usada pelo sketch ~ 8 bytes por item)"""
+        return sum(len(nivel) for nivel in self.niveis)
+
+
+def resumo_boxplot(sketch, whis=1.5):
+    """
+    Estatísticas de um boxplot estimadas pelo sketch: quartis, mediana e bigodes no valor
+    mais extremo dentro de [q1 - whis·IQR, q3 + whis·IQR] (mesma regra do matplotlib/plotly).
+    Os pontos fora dos bigodes não são guardados no sketch e por isso não são retornados.
+    """
+    q1, mediana, q3 = sketch.quantil([0.25, 0.5, 0.75])
+    cerca_inferior, cerca_superior = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+    # menor valor >= cerca inferior e maior valor <= cerca superior entre os guardados (valores
+    # reais, a no máximo ε de posto do bigode verdadeiro); o mínimo/máximo exatos têm prioridade
+    itens = np.concatenate(sketch.niveis)
+    dentro = itens[(itens >= cerca_inferior) & (itens <= cerca_superior)]
+    inferior = sketch.minimo if sketch.minimo >= cerca_inferior else dentro.min(initial=q1)
+    superior = sketch.maximo if sketch.maximo <= cerca_superior else dentro.max(initial=q3)
+    return {"n": sketch.n, "q1": float(q1), "mediana": float(mediana), "q3": float(q3),
+            "bigode_inferior": float(np.clip(inferior, sketch.minimo, q1)),
+            "bigode_superior": float(np.clip(superior, q3, sketch.maximo)),
+            "minimo": float(sketch.minimo), "maximo": float(sketch.maximo)}
+
+
+class SketchesPorGrupo:
+    """Um SketchKLL por grupo, atualizável por blocos e mesclável entre blocos/processos"""
+
+    def __init__(self, k=K_PADRAO, seed=0):
+        self.k = k
+        self.seed = seed
+        self.sketches = {}
+
+    def _sketch(self, grupo):
+        if grupo not in self.sketches:
+            self.sketches[grupo] = SketchKLL(self.k, seed=self.seed + len(self.sketches))
+        return self.sketches[grupo]
+
+    def atualizar(self, grupos, valores):
+        """Acrescenta um bloco: grupos[i] é o grupo de valores[i]"""
+        codigos, nomes = pd.factorize(pd.Series(grupos), use_na_sentinel=True)
+        valores = np.asarray(valores, dtype=np.float64)
+        ordem = np.argsort(codigos, kind="stable")
+        limites = np.searchsorted(codigos[ordem], np.arange(len(nomes) + 1))
+        for i, nome in enumerate(nomes):
+            self._sketch(nome).atualizar(valores[ordem[limites[i]:limites[i + 1]]])
+        return self
+
+    def merge(self, outro):
+        for grupo, sketch in outro.sketches.items():
+            self._sketch(grupo).merge(sketch)
+        return self
+
+    def quantis(self, qs, grupos=None):
+        """DataFrame (grupo x q) com os quantis estimados; 'grupos' fixa a ordem das linhas"""
+        grupos = list(self.sketches) if grupos is None else list(grupos)
+        return pd.DataFrame([self.sketches[g].quantil(qs) for g in grupos], index=grupos, columns=list(qs))
+
+    def resumos_boxplot(self, grupos=None, whis=1.5):
+        """{grupo: resumo_boxplot(...)} na ordem de 'grupos' (padrão: ordem de chegada)"""
+        grupos = list(self.sketches) if grupos is None else list(grupos)
+        return {g: resumo_boxplot(self.sketches[g], whis) for g in grupos}
+
+
+def sketches_em_blocos(grupos, valores, k=K_PADRAO, tamanho_bloco=100_000):
+    """SketchesPorGrupo de 'valores' por 'grupos' (arrays/séries alinhados), lidos em blocos (nulos ignorados)"""
+    grupos, valores = np.asarray(grupos), np.asarray(valores, dtype=np.float64)
+    sketches = SketchesPorGrupo(k)
+    for inicio in range(0, len(valores), tamanho_bloco):
+        sketches.atualizar(grupos[inicio:inicio + tamanho_bloco], valores[inicio:inicio + tamanho_bloco])
+    return sketches
+
+
+def estatisticas_bxp(resumos):
+    """Converte {grupo: resumo_boxplot} no formato de matplotlib Axes.bxp (sem pontos atípicos)"""
+    return [{"label": str(grupo), "q1": r["q1"], "med": r["mediana"], "q3": r["q3"],
+             "whislo": r["bigode_inferior"], "whishi": r["bigode_superior"], "fliers": []}
+            for grupo, r in resumos.items()]
@@ -0,0 +1,27 @@
+"""Os scripts ficam em code/ e se importam pelo nome (como ao rodar `python code/<script>.py`)"""
+
+import importlib
+import os
+import sys
+
+import pytest
+
+PASTA_CODIGO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "code")
+if PASTA_CODIGO not in sys.path:
+    sys.path.insert(0, PASTA_CODIGO)
+
+
+@pytest.fixture(scope="session")
+def coleta():
+    """Módulo 01_coleta_dados (o nome começa com dígito, então não dá para usar `import`)"""
+    return importlib.import_module("01_coleta_dados")
+
+
+@pytest.fixture
+def servidor():
+    """servidor_mock_github com 50 repositórios, atendendo em 127.0.0.1 numa porta livre"""
+    from servidor_mock_github import ServidorMockGitHub, repositorios_mock
+
+    servidor = ServidorMockGitHub(repositorios_mock(50)).iniciar()
+    yield servidor
+    servidor.encerrar()
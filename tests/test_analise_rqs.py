@@ -0,0 +1,83 @@
+"""Análises de 03_analise_rqs.py: chaves de cache e a RQ2 em streaming"""
+
+import importlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cache_artefatos import dependencias_codigo
+from estatistica_online import MomentosPorGrupo
+
+analise = importlib.import_module("03_analise_rqs")
+
+
+def _nomes(funcao):
+    return {f.__qualname__ for f in dependencias_codigo(funcao)}
+
+
+@pytest.mark.parametrize("auxiliar", ["PostosAgrupados", "ajustar_p_valores", "sketches_em_blocos",
+                                      "estatisticas_bxp", "SketchKLL", "SketchesPorGrupo"])
+def test_chave_rq2_cobre_auxiliares(auxiliar):
+    assert auxiliar in _nomes(analise.analisar_rq2)
+
+
+def test_chave_rq1_cobre_graficos():
+    assert {"graficos_rq1", "bordas_densidade", "histograma_rq1", "_desenhar_densidade"} <= _nomes(analise.analisar_rq1)
+
+
+def test_chave_rq2_streaming_cobre_leitura_e_metricas():
+    assert {"ler_blocos_rq2", "calcular_metricas", "SketchesPorGrupo", "MomentosPorGrupo", "estatisticas_bxp"} <= \
+        _nomes(analise.analisar_rq2_streaming)
+
+
+def _csv_metricas(tmp_path, monkeypatch, df):
+    csv = tmp_path / "metricas.csv"
+    df.to_csv(csv, index=False)
+    monkeypatch.setattr(analise, "csv_path", str(csv))
+    monkeypatch.setattr(analise, "OUTPUT_DIR", str(tmp_path))
+
+
+def test_rq2_streaming_calcula_taxa_por_bloco(tmp_path, monkeypatch):
+    rng = np.random.default_rng(0)
+    n = 3000
+    df = pd.DataFrame({"full_name": [f"r/{i}" for i in range(n)],
+                       "language": rng.choice(["Python", "Go", "Rust", "Raro"], n, p=[0.5, 0.3, 0.198, 0.002]),
+                       "issues_abertas": rng.integers(0, 50, n), "issues_fechadas": rng.integers(0, 200, n)})
+    df.loc[::97, "language"] = None
+    _csv_metricas(tmp_path, monkeypatch, df)
+
+    resultado = analise.analisar_rq2_streaming(tamanho_bloco=257)
+
+    taxa = df["issues_fechadas"] / (df["issues_abertas"] + df["issues_fechadas"])
+    esperado = taxa.groupby(df["language"]).agg(["count", "mean", "median", "std"])
+    esperado = esperado[esperado["count"] >= analise.MINIMO_REPOSITORIOS_RQ2]
+    resumo = pd.read_csv(resultado["resumo_csv"], index_col="linguagem")
+    assert sorted(resumo.index) == sorted(esperado.index)
+    assert resultado["kruskal_p"] is None and resultado["streaming"]["n"] == esperado["count"].sum()
+    resumo = resumo.loc[esperado.index]
+    assert (resumo["count"] == esperado["count"]).all()
+    np.testing.assert_allclose(resumo[["mean", "std"]], esperado[["mean", "std"]], rtol=1e-9)
+    np.testing.assert_allclose(resumo["median"], esperado["median"], atol=0.02)
+
+
+def test_rq2_streaming_sem_linguagens_validas_falha_com_mensagem(tmp_path, monkeypatch):
+    _csv_metricas(tmp_path, monkeypatch, pd.DataFrame({"full_name": ["r/0"], "language": [None],
+                                                       "issues_abertas": [1], "issues_fechadas": [1]}))
+    with pytest.raises(ValueError, match="Nenhuma linguagem"):
+        analise.analisar_rq2_streaming(tamanho_bloco=10)
+
+
+def test_momentos_por_grupo_em_blocos_igual_ao_total_com_media_grande():
+    rng = np.random.default_rng(1)
+    grupos = rng.choice(["a", "b", "c"], 5000)
+    # média 1e9 e desvio 1: Σx² − n·μ² perde todos os dígitos aqui
+    valores = 1e9 + rng.standard_normal(5000)
+    momentos = MomentosPorGrupo()
+    for inicio in range(0, 5000, 333):
+        momentos.atualizar(grupos[inicio:inicio + 333], valores[inicio:inicio + 333])
+
+    esperado = pd.Series(valores).groupby(grupos).agg(["count", "mean", "var"])
+    assert (momentos.tabela["n"] == esperado["count"]).all()
+    np.testing.assert_allclose(momentos.tabela["media"], esperado["mean"], rtol=1e-12)
+    np.testing.assert_allclose(momentos.variancia(), esperado["var"], rtol=1e-6)
@@ -0,0 +1,28 @@
+"""Contagens e tamanhos de bloco < 1 são recusados já na linha de comando de 01-04"""
+
+import importlib
+
+import pytest
+
+
+@pytest.mark.parametrize("opcao", ["--rows", "--chunk-size", "--shards", "--workers"])
+@pytest.mark.parametrize("valor", ["0", "-3"])
+def test_caracterizacao_recusa_contagens_nao_positivas(opcao, valor, capsys):
+    caracterizacao = importlib.import_module("02_caracterizacao_dataset")
+    with pytest.raises(SystemExit):
+        caracterizacao.criar_parser().parse_args([opcao, valor])
+    assert "inteiro >= 1" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("modulo, opcao", [("01_coleta_dados", "--chunk-size"), ("03_analise_rqs", "--chunk-size"),
+                                           ("03_analise_rqs", "--workers"), ("04_dashboard_completo_v2", "--workers")])
+def test_scripts_recusam_zero(modulo, opcao, capsys):
+    with pytest.raises(SystemExit):
+        importlib.import_module(modulo).main([opcao, "0"])
+    assert "inteiro >= 1" in capsys.readouterr().err
+
+
+def test_caracterizacao_aceita_inteiros_positivos():
+    args = importlib.import_module("02_caracterizacao_dataset").criar_parser().parse_args(
+        ["--rows", "10", "--chunk-size", "3", "--shards", "2", "--workers", "1"])
+    assert (args.rows, args.chunk_size, args.shards, args.workers) == (10, 3, 2, 1)
@@ -0,0 +1,35 @@
+"""salvar_em_blocos recusa um iterável vazio sem tocar no arquivo anterior"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from armazenamento import carregar_tabela, salvar_em_blocos
+
+
+@pytest.mark.parametrize("extensao", [".parquet", ".csv"])
+def test_salvar_em_blocos_grava_todos_os_blocos(tmp_path, extensao):
+    caminho = str(tmp_path / f"dados{extensao}")
+    blocos = (pd.DataFrame({"x": range(i, i + 3)}) for i in (0, 3, 6))
+    assert salvar_em_blocos(blocos, caminho) == 9
+    assert carregar_tabela(caminho)["x"].tolist() == list(range(9))
+
+
+@pytest.mark.parametrize("extensao", [".parquet", ".csv"])
+def test_salvar_em_blocos_sem_blocos_mantem_arquivo_anterior(tmp_path, extensao):
+    caminho = str(tmp_path / f"dados{extensao}")
+    salvar_em_blocos([pd.DataFrame({"x": [1, 2]})], caminho)
+    conteudo, instante = open(caminho, "rb").read(), os.path.getmtime(caminho)
+
+    with pytest.raises(ValueError, match="Nenhum bloco"):
+        salvar_em_blocos(iter([]), caminho)
+    assert open(caminho, "rb").read() == conteudo
+    assert os.path.getmtime(caminho) == instante
+
+
+def test_salvar_em_blocos_sem_blocos_nao_cria_arquivo(tmp_path):
+    caminho = str(tmp_path / "novo" / "dados.parquet")
+    with pytest.raises(ValueError):
+        salvar_em_blocos([], caminho)
+    assert not os.path.exists(caminho)
@@ -0,0 +1,86 @@
+"""CacheArtefatos compartilhado por vários processos (etapas do pipeline.py em paralelo)"""
+
+import json
+import multiprocessing
+import os
+
+from cache_artefatos import CacheArtefatos
+
+PROCESSOS = 8
+ENTRADAS_POR_PROCESSO = 60
+
+
+def _gravar_entradas(pasta, processo):
+    cache = CacheArtefatos(pasta)
+    for i in range(ENTRADAS_POR_PROCESSO):
+        nome = f"p{processo}-{i}"
+        saida = os.path.join(pasta, f"{nome}.txt")
+
+        def produzir():
+            with open(saida, "w", encoding="utf-8") as f:
+                f.write(nome)
+            return nome
+        cache.executar(nome, [saida], produzir, parametros={"i": i})
+
+
+def test_processos_em_paralelo_nao_perdem_entradas(tmp_path):
+    pasta = str(tmp_path / "cache")
+    contexto = multiprocessing.get_context("spawn")
+    processos = [contexto.Process(target=_gravar_entradas, args=(pasta, p)) for p in range(PROCESSOS)]
+    for processo in processos:
+        processo.start()
+    for processo in processos:
+        processo.join()
+        assert processo.exitcode == 0
+    with open(os.path.join(pasta, "manifesto.json"), encoding="utf-8") as f:
+        manifesto = json.load(f)
+    assert len(manifesto) == PROCESSOS * ENTRADAS_POR_PROCESSO
+
+
+def test_entrada_em_cache_pula_a_etapa(tmp_path):
+    pasta, saida = str(tmp_path / "cache"), str(tmp_path / "saida.txt")
+    chamadas = []
+
+    def produzir():
+        chamadas.append(1)
+        with open(saida, "w", encoding="utf-8") as f:
+            f.write("conteúdo")
+        return {"linhas": 1}
+    assert CacheArtefatos(pasta).executar("etapa", [saida], produzir) == {"linhas": 1}
+    os.remove(saida)
+    # outra instância (outro processo): a etapa é pulada e a saída restaurada da cópia guardada
+    assert CacheArtefatos(pasta).executar("etapa", [saida], produzir) == {"linhas": 1}
+    assert len(chamadas) == 1 and open(saida, encoding="utf-8").read() == "conteúdo"
+
+
+def _importar_modulos(pasta, fontes, monkeypatch):
+    import importlib
+    import sys
+
+    import cache_artefatos
+
+    for nome, fonte in fontes.items():
+        (pasta / f"{nome}.py").write_text(fonte, encoding="utf-8")
+        sys.modules.pop(nome, None)
+    monkeypatch.setattr(cache_artefatos, "PASTA_CODIGO", str(pasta))
+    monkeypatch.syspath_prepend(str(pasta))
+    importlib.invalidate_caches()
+    return importlib.import_module("etapa_teste")
+
+
+def test_chave_muda_quando_um_auxiliar_muda(tmp_path, monkeypatch):
+    etapa = ("from auxiliar_teste import Ajuste\n"
+             "def analisar(x):\n"
+             "    from auxiliar_teste import formatar\n"
+             "    return formatar(Ajuste().aplicar(x))\n")
+    auxiliar = ("def corrigir(x):\n    return x * {fator}\n"
+                "def formatar(x):\n    return str(x)\n"
+                "class Ajuste:\n    def aplicar(self, x):\n        return corrigir(x)\n")
+    chaves = []
+    for fator, formato in [(2, "str(x)"), (2, "str(x)"), (3, "str(x)"), (3, "repr(x)")]:
+        modulo = _importar_modulos(tmp_path, {"auxiliar_teste": auxiliar.format(fator=fator).replace("str(x)", formato),
+                                              "etapa_teste": etapa}, monkeypatch)
+        chaves.append(CacheArtefatos(str(tmp_path / "cache"), ativo=False).chave("etapa", funcao=modulo.analisar))
+    # mesmo código: mesma chave; auxiliar via método de classe ou via import local mudou: chave nova
+    assert chaves[0] == chaves[1]
+    assert len({chaves[1], chaves[2], chaves[3]}) == 3
@@ -0,0 +1,79 @@
+"""CacheHTTP contra o servidor_mock_github: TTL, revalidação por ETag (304) e conferência do disco"""
+
+import asyncio
+import os
+
+from cache_http import CacheHTTP
+from cliente_http import RespostaHTTP
+from coleta_github import ColetorGitHub
+
+BUSCA = ("/search/repositories", {"q": "stars:>1", "per_page": 5})
+
+
+def _get(servidor, cache, vezes=1):
+    async def executar():
+        async with ColetorGitHub(servidor.url, concorrencia=2, backoff=0.01, cache=cache) as coletor:
+            return [await coletor.get(*BUSCA) for _ in range(vezes)]
+    return asyncio.run(executar())
+
+
+def test_dentro_do_ttl_nao_vai_a_rede(servidor, tmp_path):
+    cache = CacheHTTP(str(tmp_path), ttl=3600)
+    primeira, segunda = _get(servidor, cache, vezes=2)
+    assert servidor.respostas == {200: 1}
+    assert (cache.baixadas, cache.acertos) == (1, 1)
+    assert segunda.corpo == primeira.corpo and segunda.cabecalhos["link"] == primeira.cabecalhos["link"]
+
+
+def test_etag_revalida_com_304_e_troca_quando_os_dados_mudam(servidor, tmp_path):
+    cache = CacheHTTP(str(tmp_path), ttl=0)
+    primeira, segunda = _get(servidor, cache, vezes=2)
+    assert servidor.respostas == {200: 1, 304: 1}
+    assert (cache.baixadas, cache.revalidadas) == (1, 1)
+    assert segunda.status == 200 and segunda.corpo == primeira.corpo
+    assert "x-ratelimit-remaining" in segunda.cabecalhos
+
+    # o manifesto salvo ao fim da coleta guarda o ETag: outra coleta revalida em vez de baixar
+    repos = servidor.repositorios.copy()
+    repos["stargazers_count"] += 1
+    servidor.atualizar(repos)
+    cache = CacheHTTP(str(tmp_path), ttl=0)
+    [terceira] = _get(servidor, cache)
+    assert servidor.respostas == {200: 2, 304: 1}
+    assert cache.baixadas == 1 and terceira.corpo != primeira.corpo
+
+
+class CacheQuePerdeCorpo(CacheHTTP):
+    """Remove o corpo entre consultar e o 304, como o LRU faria com outra resposta sendo guardada"""
+
+    def validadores(self, entrada):
+        if entrada is not None:
+            os.remove(self._arquivo(self.chave(entrada["url"])))
+        return super().validadores(entrada)
+
+
+def test_304_sem_corpo_refaz_o_get_completo(servidor, tmp_path):
+    [primeira] = _get(servidor, CacheHTTP(str(tmp_path), ttl=0))
+    cache = CacheQuePerdeCorpo(str(tmp_path), ttl=0)
+    [segunda] = _get(servidor, cache)
+    assert servidor.respostas == {200: 2, 304: 1}
+    assert (cache.revalidadas, cache.baixadas) == (0, 1)
+    assert segunda.corpo == primeira.corpo
+    # o corpo baixado de novo volta ao cache
+    assert len(cache.manifesto) == 1 and cache.total_bytes == len(segunda.corpo)
+
+
+def test_abertura_apaga_orfaos_e_descarta_entradas_sem_corpo(tmp_path):
+    cache = CacheHTTP(str(tmp_path))
+    for i in range(3):
+        cache.guardar(f"http://x/{i}", RespostaHTTP(200, {"etag": f'"{i}"'}, b"a" * 100))
+    cache.salvar()
+    # coleta interrompida: corpo gravado sem salvar o manifesto, temporário e corpo apagado à mão
+    cache.guardar("http://x/orfao", RespostaHTTP(200, {}, b"b" * 50))
+    open(cache._arquivo("abc") + ".tmp", "wb").close()
+    os.remove(cache._arquivo(cache.chave("http://x/0")))
+
+    reaberto = CacheHTTP(str(tmp_path))
+    assert sorted(e["url"] for e in reaberto.manifesto.values()) == ["http://x/1", "http://x/2"]
+    assert reaberto.total_bytes == 200 and reaberto.orfaos == 2
+    assert sorted(os.listdir(tmp_path / "respostas")) == sorted(reaberto.manifesto)
@@ -0,0 +1,71 @@
+"""ClienteHTTP e ColetorGitHub (asyncio) contra o servidor_mock_github local: pool de conexões,
+repetição de falhas 5xx e espera pelo limite de taxa, sem acesso à rede"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+
+from cliente_http import ClienteHTTP
+from coleta_github import ColetorGitHub
+from servidor_mock_github import ServidorMockGitHub, repositorios_mock
+
+BUSCA = ("/search/repositories", {"q": "stars:>1", "per_page": 5})
+
+
+@contextmanager
+def servidor_mock(**opcoes):
+    servidor = ServidorMockGitHub(repositorios_mock(50), **opcoes).iniciar()
+    try:
+        yield servidor
+    finally:
+        servidor.encerrar()
+
+
+def test_pool_reaproveita_conexoes(servidor):
+    async def executar():
+        async with ClienteHTTP(servidor.url, conexoes=4) as cliente:
+            sequenciais = [await cliente.get("/search/repositories", {"q": "stars:>1", "page": p}) for p in range(1, 6)]
+            abertas_em_sequencia = cliente.conexoes_abertas
+            simultaneas = await asyncio.gather(*(cliente.get(*BUSCA) for _ in range(40)))
+            return sequenciais + simultaneas, abertas_em_sequencia, cliente
+
+    respostas, abertas_em_sequencia, cliente = asyncio.run(executar())
+    assert [r.status for r in respostas] == [200] * 45
+    assert [len(r.json()["items"]) for r in respostas[:5]] == [30, 20, 0, 0, 0]
+    assert abertas_em_sequencia == 1
+    # no máximo 'conexoes' requisições em andamento, então no máximo 4 conexões para 40 requisições
+    assert cliente.requisicoes == 45 and cliente.conexoes_abertas <= 4
+    assert not cliente._ociosas
+
+
+def test_falhas_5xx_sao_repetidas():
+    with servidor_mock(falhas=0.3, seed=1) as servidor:
+        async def executar():
+            async with ColetorGitHub(servidor.url, concorrencia=4, tentativas=20, backoff=0.001) as coletor:
+                respostas = await asyncio.gather(*(coletor.get(*BUSCA) for _ in range(30)))
+                return respostas, coletor.repeticoes
+
+        respostas, repeticoes = asyncio.run(executar())
+        assert all(r.status == 200 for r in respostas) and len({r.corpo for r in respostas}) == 1
+        assert repeticoes == servidor.respostas[502] > 0
+        assert servidor.respostas[200] == 30
+
+
+def test_limite_de_taxa_espera_o_reset():
+    with servidor_mock(limite_taxa=3, janela=1.0) as servidor:
+        # cota já esgotada por outro cliente: a 1ª resposta é 403 com X-RateLimit-Remaining: 0
+        while servidor.consumir_cota():
+            pass
+        reset = servidor._reset()
+
+        async def executar():
+            async with ColetorGitHub(servidor.url, concorrencia=2, backoff=0.001) as coletor:
+                respostas = [await coletor.get(*BUSCA) for _ in range(5)]
+                return respostas, coletor
+
+        respostas, coletor = asyncio.run(executar())
+        assert all(r.status == 200 for r in respostas)
+        assert coletor.esperas_limite == 1 and coletor.repeticoes == 0
+        assert servidor.respostas[403] == 1
+        # nenhuma requisição passou da cota: a 3ª zerou o saldo e a 4ª esperou o reset seguinte
+        assert servidor.respostas[200] == 5 and time.time() >= reset + 1
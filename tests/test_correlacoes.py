@@ -0,0 +1,46 @@
+"""matrizes_correlacao com colunas incompletas: mesmos valores de DataFrame.corr, uma ordenação por coluna"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+import correlacoes
+
+
+def _dataset(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"inteiros": rng.integers(0, 20, n).astype(float), "normal": rng.normal(size=n),
+                       "poucos_valores": rng.integers(0, 5, n), "lognormal": rng.lognormal(size=n),
+                       "quase_vazia": np.r_[np.full(n - 1, np.nan), 1.0], "metade": rng.integers(0, 3, n).astype(float)})
+    for coluna, fracao in [("inteiros", 0.2), ("lognormal", 0.1), ("metade", 0.5)]:
+        df.loc[rng.random(n) < fracao, coluna] = np.nan
+    # sem nenhuma linha em comum com quase_vazia
+    df.loc[n - 1, "metade"] = np.nan
+    return df
+
+
+def test_igual_a_dataframe_corr():
+    df = _dataset()
+    matrizes = correlacoes.matrizes_correlacao(df)
+    pd.testing.assert_frame_equal(matrizes["pearson"], df.corr(), atol=1e-12)
+    pd.testing.assert_frame_equal(matrizes["spearman"], df.corr(method="spearman"), atol=1e-12)
+    assert matrizes["n"].loc["quase_vazia", "metade"] == 0
+    assert matrizes["n"].loc["inteiros", "lognormal"] == df[["inteiros", "lognormal"]].dropna().shape[0]
+
+
+def test_postos_em_subconjunto_sao_os_do_rankdata():
+    x = _dataset()["inteiros"].to_numpy()
+    ordenacao = correlacoes._ordenar_coluna(x)
+    linhas = ordenacao[0] & (np.random.default_rng(1).random(len(x)) < 0.5)
+    np.testing.assert_array_equal(correlacoes._postos_em(ordenacao, linhas), stats.rankdata(x[linhas]))
+
+
+def test_uma_ordenacao_por_coluna(monkeypatch):
+    df = _dataset()
+    chamadas = []
+    original = correlacoes._ordenar_coluna
+    monkeypatch.setattr(correlacoes, "_ordenar_coluna", lambda x: chamadas.append(1) or original(x))
+    monkeypatch.setattr(correlacoes.stats, "rankdata", lambda *a, **k: chamadas.append("rankdata") or stats.rankdata(*a, **k))
+    correlacoes.matrizes_correlacao(df)
+    # rankdata só nas colunas completas (normal, poucos_valores); nenhuma reordenação por par
+    assert chamadas.count(1) == df.shape[1] and chamadas.count("rankdata") == 2
@@ -0,0 +1,71 @@
+"""gerar_dataset_vetorizado segue as mesmas distribuições do laço original de gerar_dataset_repositorios"""
+
+import random
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+N = 20_000
+# nível dos testes: com as sementes fixas o resultado é determinístico, então um nível baixo
+# só deixa de fora diferenças de amostragem, não de distribuição
+ALFA = 0.001
+NUMERICAS = ["stars", "forks", "issues_abertas", "issues_fechadas", "total_issues", "taxa_resolucao_issues",
+             "pull_requests", "contributors", "commits", "commits_por_mes", "tamanho_kb", "idade_dias",
+             "dias_desde_update"]
+CATEGORICAS = ["linguagem", "licenca", "categoria", "tem_wiki", "tem_readme"]
+
+
+@pytest.fixture(scope="module")
+def datasets(coleta):
+    original = coleta.gerar_dataset_repositorios(N, seed=42)
+    vetorizado = coleta.gerar_dataset_repositorios(N, vetorizado=True, seed=42)
+    return original, vetorizado
+
+
+def test_mesmas_colunas_e_tipos(datasets):
+    original, vetorizado = datasets
+    assert list(vetorizado.columns) == list(original.columns)
+    for coluna in original.columns:
+        assert vetorizado[coluna].dtype.kind == original[coluna].dtype.kind, coluna
+
+
+@pytest.mark.parametrize("coluna", NUMERICAS)
+def test_distribuicao_numerica(datasets, coluna):
+    original, vetorizado = datasets
+    resultado = stats.ks_2samp(original[coluna], vetorizado[coluna])
+    assert resultado.pvalue > ALFA, f"{coluna}: KS={resultado.statistic:.4f}, p={resultado.pvalue:.2e}"
+
+
+@pytest.mark.parametrize("coluna", CATEGORICAS)
+def test_frequencias_categoricas(datasets, coluna):
+    original, vetorizado = datasets
+    categorias = sorted(set(original[coluna]) | set(vetorizado[coluna]), key=str)
+    tabela = [[(df[coluna] == c).sum() for c in categorias] for df in (original, vetorizado)]
+    _, p, _, _ = stats.chi2_contingency(tabela)
+    assert p > ALFA, f"{coluna}: p={p:.2e}"
+
+
+def test_relacoes_entre_colunas(datasets):
+    _, vetorizado = datasets
+    assert (vetorizado["total_issues"] == vetorizado["issues_abertas"] + vetorizado["issues_fechadas"]).all()
+    assert (vetorizado["dias_desde_update"] <= np.minimum(vetorizado["idade_dias"], 365)).all()
+    assert vetorizado["taxa_resolucao_issues"].between(0, 100).all()
+
+
+def test_laco_reprodutivel_sem_semente_global(coleta):
+    """O seed fixa o laço original sozinho, sem ler nem avançar random/np.random globais"""
+    random.seed(1)
+    np.random.seed(1)
+    primeiro = coleta.gerar_dataset_repositorios(200, seed=7, data_referencia=date(2026, 1, 1))
+    seguintes = (random.random(), np.random.random())
+    random.seed(1)
+    np.random.seed(1)
+    assert seguintes == (random.random(), np.random.random())
+
+    random.seed(2)
+    np.random.seed(2)
+    segundo = coleta.gerar_dataset_repositorios(200, seed=7, data_referencia=date(2026, 1, 1))
+    pd.testing.assert_frame_equal(primeiro, segundo)
@@ -0,0 +1,33 @@
+"""Divs dos modos compacto/sob demanda reservam o tamanho declarado no layout da figura"""
+
+import plotly.graph_objects as go
+import pytest
+
+from html_compacto import ALTURA_PADRAO, TabelaDados, trecho_grafico
+
+
+def _figura_json(**layout):
+    # template padrão do plotly: layout grande o bastante para ser internado na tabela
+    figura = go.Figure(go.Scatter(x=list(range(200)), y=list(range(200))))
+    figura.update_layout(**layout)
+    return figura.to_json()
+
+
+@pytest.mark.parametrize("sob_demanda", [False, True])
+@pytest.mark.parametrize("tabela", [TabelaDados(), TabelaDados(minimo=None)], ids=["compacto", "sem-tabela"])
+def test_div_com_tamanho_do_layout(tabela, sob_demanda):
+    figura = tabela.internar(_figura_json(height=800, width=1200))
+    trecho = trecho_grafico("grafico-x", figura, sob_demanda)
+    assert 'style="height:800px; width:1200px;"' in trecho
+
+
+def test_div_sem_tamanho_usa_padrao():
+    figura = TabelaDados().internar(_figura_json())
+    assert f'style="height:{ALTURA_PADRAO}px; width:100%;"' in trecho_grafico("grafico-x", figura, True)
+
+
+def test_layout_internado_continua_completo():
+    figura = TabelaDados().internar(_figura_json(height=600))
+    # as partes grandes do layout (o template) vão para a tabela; height fica na figura
+    assert figura["layout"]["height"] == 600
+    assert set(figura["layout"]["template"]["layout"]) == {"$ref"}
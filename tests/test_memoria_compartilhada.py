@@ -0,0 +1,49 @@
+"""publicar_dataframe/anexar_dataframe reconstroem o DataFrame com os mesmos tipos e valores"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from esquema import otimizar_tipos
+from memoria_compartilhada import anexar_dataframe, publicar_dataframe
+
+
+def _ida_e_volta(df):
+    shm, descritor = publicar_dataframe(df)
+    try:
+        anexo, copia = anexar_dataframe(descritor)
+        copia = copia.copy()
+        anexo.close()
+    finally:
+        shm.close()
+        shm.unlink()
+    return copia
+
+
+def test_esquema_otimizado_com_nulos():
+    df = otimizar_tipos(pd.DataFrame({
+        "repositorio": ["a/x", "b/y", "c/z", None],
+        "linguagem": ["Python", "Go", None, "Python"],
+        "stars": [10, 2000, 3, 70000],
+        "tem_wiki": [True, None, False, True],
+        "created_at": ["2024-01-01", "2024-02-01", "2024-03-01", "2024-04-01"],
+        "taxa_resolucao_issues": [50.0, np.nan, 12.5, 100.0],
+    }), relatorio=False)
+    assert str(df["tem_wiki"].dtype) == "boolean"
+    pd.testing.assert_frame_equal(_ida_e_volta(df), df)
+
+
+@pytest.mark.parametrize("dtype", ["boolean", "Int64", "UInt16", "Float32"])
+def test_tipos_anulaveis(dtype):
+    valores = [True, None, False] if dtype == "boolean" else [1, None, 3]
+    df = pd.DataFrame({"coluna": pd.array(valores, dtype=dtype)})
+    pd.testing.assert_frame_equal(_ida_e_volta(df), df)
+
+
+@pytest.mark.parametrize("coluna", [
+    pd.Series(pd.date_range("2024-01-01", periods=3, tz="UTC")),
+    pd.Series([1, "texto", 2.5], dtype=object),
+])
+def test_tipo_nao_suportado_gera_erro_claro(coluna):
+    with pytest.raises(TypeError, match="Coluna 'coluna'"):
+        publicar_dataframe(pd.DataFrame({"coluna": coluna}))
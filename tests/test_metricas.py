@@ -0,0 +1,30 @@
+"""A taxa de resolução de issues tem uma só definição (metricas.py) em 01, 02 e 03"""
+
+import importlib
+from datetime import datetime
+
+import numpy as np
+
+from metricas import calcular_metrica
+
+
+def _verificar_taxa(df):
+    np.testing.assert_allclose(df["taxa_resolucao_issues"], calcular_metrica(df, "taxa_resolucao_issues"))
+
+
+def test_geradores_de_01_seguem_o_registro(coleta):
+    _verificar_taxa(coleta.gerar_dataset_repositorios(300))
+    _verificar_taxa(coleta.gerar_dataset_vetorizado(300))
+
+
+def test_simulacao_de_02_segue_o_registro():
+    caracterizacao = importlib.import_module("02_caracterizacao_dataset")
+    df = caracterizacao._gerar_bloco_simulado(np.random.RandomState(0), 0, 300, datetime(2026, 1, 1))
+    _verificar_taxa(df)
+    assert df["taxa_resolucao_issues"].between(0, 100).all()
+
+
+def test_taxa_do_engajamento_e_a_mesma_em_fracao(coleta):
+    df = coleta.gerar_dataset_vetorizado(300)
+    np.testing.assert_allclose(calcular_metrica(df, "issue_resolution_rate") * 100,
+                               df["taxa_resolucao_issues"], atol=0.005)